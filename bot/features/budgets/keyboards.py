@@ -1,8 +1,32 @@
+import uuid
+
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from bot.utils.callback_data import encode_uuid
+from bot.utils.callback_data import CallbackAction
+from bot.utils.keyboards import keyboard_registry
+
+BUDGET_OPEN = CallbackAction(1, "uuid")
+BUDGET_SET_DEFAULT = CallbackAction(2, "uuid")
+BUDGET_PARTICIPANTS = CallbackAction(3, "uuid")
+BUDGET_INVITE = CallbackAction(4, "uuid")
+BUDGET_ARCHIVE = CallbackAction(5, "uuid")
+BUDGET_ARCHIVE_CONFIRM = CallbackAction(6, "uuid")
+BUDGET_ARCHIVE_CANCEL = CallbackAction(7, "uuid")
+BUDGET_BACK_TO_DETAIL = CallbackAction(8, "uuid")
+# participant
+PARTICIPANT_REMOVE = CallbackAction(9, "uuid")
+PARTICIPANT_CONFIRM = CallbackAction(10, "uuid")
+# participant, budget
+BUDGET_PARTICIPANT_REMOVE = CallbackAction(11, "uuid", "uuid")
+BUDGET_PARTICIPANT_CONFIRM = CallbackAction(12, "uuid", "uuid")
+# keyset cursor; NO_CURSOR opens the first page
+PARTICIPANTS_PAGE = CallbackAction(13, "uuid")
+# budget, keyset cursor
+BUDGET_PARTICIPANTS_PAGE = CallbackAction(14, "uuid", "uuid")
+NO_CURSOR = uuid.UUID(int=0)
 
 
+@keyboard_registry.static
 def build_budgets_menu_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -14,6 +38,7 @@ def build_budgets_menu_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_budgets_join_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -32,7 +57,7 @@ def build_active_budget_keyboard(items: list[dict[str, str]]) -> InlineKeyboardM
             [
                 InlineKeyboardButton(
                     text=item["name"],
-                    callback_data=f"budgets:open:{item['budget_id']}",
+                    callback_data=BUDGET_OPEN.pack(item["budget_id"]),
                 )
             ]
         )
@@ -47,15 +72,15 @@ def build_active_budget_keyboard(items: list[dict[str, str]]) -> InlineKeyboardM
 
 def build_budget_detail_keyboard(budget_id: str, can_set_default: bool) -> InlineKeyboardMarkup:
     rows: list[list[InlineKeyboardButton]] = [
-        [InlineKeyboardButton(text="👥 Участники", callback_data=f"budget:participants:{budget_id}")],
-        [InlineKeyboardButton(text="🔗 Пригласить участника", callback_data=f"budget:invite:{budget_id}")],
+        [InlineKeyboardButton(text="👥 Участники", callback_data=BUDGET_PARTICIPANTS.pack(budget_id))],
+        [InlineKeyboardButton(text="🔗 Пригласить участника", callback_data=BUDGET_INVITE.pack(budget_id))],
     ]
     if can_set_default:
         rows.append(
             [
                 InlineKeyboardButton(
                     text="⭐ Сделать по умолчанию",
-                    callback_data=f"budget:set_default:{budget_id}",
+                    callback_data=BUDGET_SET_DEFAULT.pack(budget_id),
                 )
             ]
         )
@@ -63,7 +88,7 @@ def build_budget_detail_keyboard(budget_id: str, can_set_default: bool) -> Inlin
         [
             InlineKeyboardButton(
                 text="📦 Архивировать бюджет",
-                callback_data=f"budget:archive:{budget_id}",
+                callback_data=BUDGET_ARCHIVE.pack(budget_id),
             )
         ]
     )
@@ -81,12 +106,12 @@ def build_archive_confirm_keyboard(budget_id: str) -> InlineKeyboardMarkup:
         inline_keyboard=[
             [
                 InlineKeyboardButton(
-                    text="✅ Архивировать", callback_data=f"budget:archive_confirm:{budget_id}"
+                    text="✅ Архивировать", callback_data=BUDGET_ARCHIVE_CONFIRM.pack(budget_id)
                 )
             ],
             [
                 InlineKeyboardButton(
-                    text="❌ Отмена", callback_data=f"budget:archive_cancel:{budget_id}"
+                    text="❌ Отмена", callback_data=BUDGET_ARCHIVE_CANCEL.pack(budget_id)
                 ),
                 InlineKeyboardButton(text="Закрыть", callback_data="budget:close"),
             ],
@@ -95,21 +120,33 @@ def build_archive_confirm_keyboard(budget_id: str) -> InlineKeyboardMarkup:
 
 
 def build_participants_keyboard(
-    items: list[dict[str, str]], back_callback: str | None, budget_id: str | None
+    items: list[dict[str, str]],
+    back_callback: str | None,
+    budget_id: str | None,
+    next_callback: str | None = None,
+    first_callback: str | None = None,
 ) -> InlineKeyboardMarkup:
     rows: list[list[InlineKeyboardButton]] = []
     for item in items:
-        payload = encode_uuid(item["user_id"])
         if budget_id:
-            payload = f"{encode_uuid(item['user_id'])}:{encode_uuid(budget_id)}"
+            callback_data = BUDGET_PARTICIPANT_REMOVE.pack(item["user_id"], budget_id)
+        else:
+            callback_data = PARTICIPANT_REMOVE.pack(item["user_id"])
         rows.append(
             [
                 InlineKeyboardButton(
                     text=f"Удалить {item['username']}",
-                    callback_data=f"p:rm:{payload}",
+                    callback_data=callback_data,
                 )
             ]
         )
+    paging: list[InlineKeyboardButton] = []
+    if first_callback:
+        paging.append(InlineKeyboardButton(text="⏮ В начало", callback_data=first_callback))
+    if next_callback:
+        paging.append(InlineKeyboardButton(text="Далее ▶️", callback_data=next_callback))
+    if paging:
+        rows.append(paging)
     if back_callback:
         rows.append(
             [
@@ -125,15 +162,16 @@ def build_participants_keyboard(
 def build_confirm_remove_keyboard(
     participant_id: str, back_callback: str | None, budget_id: str | None
 ) -> InlineKeyboardMarkup:
-    payload = encode_uuid(participant_id)
     if budget_id:
-        payload = f"{encode_uuid(participant_id)}:{encode_uuid(budget_id)}"
+        confirm_callback = BUDGET_PARTICIPANT_CONFIRM.pack(participant_id, budget_id)
+    else:
+        confirm_callback = PARTICIPANT_CONFIRM.pack(participant_id)
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
                 InlineKeyboardButton(
                     text="✅ Подтвердить",
-                    callback_data=f"p:cf:{payload}",
+                    callback_data=confirm_callback,
                 )
             ],
             [
@@ -0,0 +1,26 @@
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.features.main_menu.home import render_root_for_callback
+from bot.middlewares.callback_answer import MANUAL_ANSWER
+from bot.utils.callback_answer import safe_callback_answer
+from bot.utils.callback_dispatch import IndexedRouter
+from services.dto.user import CurrentUserDTO
+
+router = IndexedRouter()
+
+
+# Included last: buttons left in old messages (earlier payload formats,
+# flows that have moved on) would otherwise match nothing and never be answered.
+@router.callback_query(flags={"callback_answer": MANUAL_ANSWER})
+async def stale_button(
+    callback: CallbackQuery, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
+    await safe_callback_answer(callback, "Кнопка устарела.")
+    if user is None or not isinstance(callback.message, Message):
+        return
+    try:
+        await render_root_for_callback(callback, session, str(user.id))
+    except TelegramBadRequest:
+        return
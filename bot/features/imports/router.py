@@ -0,0 +1,63 @@
+import io
+import logging
+import tempfile
+
+from aiogram import F
+from aiogram.filters import StateFilter
+from aiogram.types import Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.utils.callback_dispatch import IndexedRouter
+from services.active_budget_service import get_active_budget_context
+from services.dto.user import CurrentUserDTO
+from services.import_service import ImportServiceError, import_transactions
+
+# Bot API getFile refuses larger files.
+IMPORT_MAX_FILE_SIZE = 20 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+router = IndexedRouter()
+
+
+@router.message(StateFilter(None), F.document.file_name.lower().endswith(".csv"))
+async def import_csv(message: Message, session: AsyncSession, user: CurrentUserDTO | None) -> None:
+    if user is None:
+        return
+    document = message.document
+    if document.file_size and document.file_size > IMPORT_MAX_FILE_SIZE:
+        await message.answer("Файл слишком большой: максимум 20 МБ.")
+        return
+    context = await get_active_budget_context(session, user.id)
+    if context is None:
+        await message.answer("Сначала выбери активный бюджет.")
+        return
+    if context.role != "owner":
+        await message.answer("Импортировать операции может только владелец бюджета.")
+        return
+
+    progress = await message.answer("Импортирую операции…")
+    # Spooled to disk rather than memory: the file can be up to 20 MB.
+    with tempfile.TemporaryFile() as buffer:
+        try:
+            await message.bot.download(document, destination=buffer)
+            lines = io.TextIOWrapper(buffer, encoding="utf-8-sig", errors="replace", newline="")
+            result = await import_transactions(session, user.id, context.budget_id, lines)
+        except ImportServiceError as exc:
+            await progress.edit_text(f"Не удалось импортировать: {exc}")
+            return
+        except Exception:
+            logger.exception("CSV import failed", extra={"user_id": user.id, "budget_id": context.budget_id})
+            await progress.edit_text("Не удалось импортировать: что-то пошло не так, попробуй позже.")
+            return
+
+    lines_out = [
+        f"✅ Импорт в «{context.name}» завершён",
+        f"Добавлено: {result.imported}",
+    ]
+    if result.duplicates:
+        lines_out.append(f"Уже были: {result.duplicates}")
+    if result.skipped:
+        lines_out.append(f"Пропущено: {result.skipped}")
+        lines_out.extend(result.errors)
+    await progress.edit_text("\n".join(lines_out))
@@ -1,5 +1,7 @@
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from bot.utils.keyboards import keyboard_registry
+
 INCOME_SOURCES: list[tuple[str, str]] = [
     ("raketaclin", "Ракетаклин"),
     ("sveta", "Света"),
@@ -49,6 +51,7 @@ REPORTS_OPERATIONS = "reports:operations"
 REPORTS_GOALS = "reports:goals"
 
 
+@keyboard_registry.static
 def build_main_menu_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -64,12 +67,14 @@ def build_main_menu_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.cached
 def build_back_keyboard(callback_data: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[[InlineKeyboardButton(text="Назад", callback_data=callback_data)]]
     )
 
 
+@keyboard_registry.cached
 def build_currency_keyboard(
     currencies: list[str],
     prefix: str,
@@ -103,6 +108,7 @@ def build_income_currency_keyboard(currencies: list[str]) -> InlineKeyboardMarku
     return build_currency_keyboard(currencies, INCOME_CURRENCY_PREFIX, BACK_TO_INCOME_AMOUNT)
 
 
+@keyboard_registry.static
 def build_expense_categories_keyboard() -> InlineKeyboardMarkup:
     rows = [
         [InlineKeyboardButton(text=label, callback_data=f"{EXPENSE_CATEGORY_PREFIX}{key}")]
@@ -112,6 +118,7 @@ def build_expense_categories_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+@keyboard_registry.static
 def build_income_sources_keyboard() -> InlineKeyboardMarkup:
     rows = [
         [InlineKeyboardButton(text=label, callback_data=f"{INCOME_SOURCE_PREFIX}{key}")]
@@ -121,6 +128,7 @@ def build_income_sources_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+@keyboard_registry.cached
 def build_confirm_keyboard(confirm_cb: str, edit_cb: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -130,6 +138,7 @@ def build_confirm_keyboard(confirm_cb: str, edit_cb: str) -> InlineKeyboardMarku
     )
 
 
+@keyboard_registry.cached
 def build_done_keyboard(
     more_label: str,
     more_cb: str,
@@ -145,6 +154,7 @@ def build_done_keyboard(
     )
 
 
+@keyboard_registry.static
 def build_goals_root_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -157,6 +167,7 @@ def build_goals_root_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_reports_root_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -1,7 +1,11 @@
-from aiogram import F, Router
+import uuid
+
+from aiogram import F
 from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.features.main_menu.home import render_root_for_callback, render_root_for_message
@@ -49,43 +53,63 @@ from bot.features.main_menu.keyboards import (
 from bot.features.main_menu.states import ExpenseStates, IncomeStates
 from bot.features.main_menu.texts import build_breadcrumbs, build_section_text
 from bot.features.onboarding.keyboards import BASE_CURRENCIES
-from db.models.budget import Budget
-from services.active_budget_service import get_active_budget_id
-from services.user_service import ensure_user
-
-router = Router()
+from bot.middlewares.callback_answer import MANUAL_ANSWER
+from bot.utils.callback_answer import safe_callback_answer
+from bot.utils.callback_dispatch import IndexedRouter
+from services.active_budget_service import get_active_budget_context
+from services.amount_parser import AmountParseError, ParsedAmount, parse_amount
+from services.dto.transaction import CreateTransactionDTO, CreatedTransactionDTO, QuickEntryDTO
+from services.dto.user import CurrentUserDTO
+from services.quick_entry_service import parse_quick_entry
+from services.transaction_service import TransactionServiceError, create_transaction
+
+# Text that starts with an amount outside any flow is a quick entry.
+QUICK_ENTRY_PATTERN = r"^\s*[+\-−]?\s*\d"
+QUICK_ENTRY_CATEGORIES = {
+    "expense": [label for _, label in EXPENSE_CATEGORIES],
+    "income": [label for _, label in INCOME_SOURCES],
+}
+# FSM data of a flow driven by buttons; a quick entry stores "text" instead.
+_MENU_INPUT = {"input_type": "menu", "raw_text": None}
+# Telegram may deliver the same message twice; both map to one operation.
+_QUICK_ENTRY_NAMESPACE = uuid.UUID("5d0c7b52-3f4e-4a53-9c1e-2f0a8c6b7e19")
+
+router = IndexedRouter()
 
 
 @router.message(F.text.startswith("/main_menu") | F.text.startswith("/main-menu"))
-async def main_menu_command(message: Message, session: AsyncSession) -> None:
-    if message.from_user is None:
+async def main_menu_command(message: Message, session: AsyncSession, user: CurrentUserDTO | None) -> None:
+    if user is None:
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=message.from_user.id,
-        telegram_username=message.from_user.username,
-        first_name=message.from_user.first_name,
-        last_name=message.from_user.last_name,
-    )
     await render_root_for_message(message, session, str(user.id))
 
 
 @router.callback_query(F.data == "main:income")
 async def menu_income(callback: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(IncomeStates.amount)
-    await state.update_data(flow_message_id=callback.message.message_id)
+    await state.update_data(
+        flow_message_id=callback.message.message_id,
+        income_comment=None,
+        op_key=_new_op_key(),
+        **_MENU_INPUT,
+    )
     text = build_section_text("💰 ПРИХОД", "Введите сумму")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(BACK_TO_HOME), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == "main:expense")
 async def menu_expense(callback: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(ExpenseStates.amount)
-    await state.update_data(flow_message_id=callback.message.message_id)
+    await state.update_data(
+        flow_message_id=callback.message.message_id,
+        expense_comment=None,
+        op_key=_new_op_key(),
+        **_MENU_INPUT,
+    )
     text = build_section_text("💸 РАСХОД", "Введите сумму")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(BACK_TO_HOME), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == "main:goals")
@@ -112,64 +136,59 @@ async def reports_root(callback: CallbackQuery) -> None:
 async def goals_create(callback: CallbackQuery) -> None:
     text = build_section_text("🎯 ЦЕЛИ", "Сценарий создания цели скоро появится.")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(GOALS_ROOT), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == GOALS_ADD)
 async def goals_add(callback: CallbackQuery) -> None:
     text = build_section_text("🎯 ЦЕЛИ", "Сценарий пополнения скоро появится.")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(GOALS_ROOT), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == GOALS_WITHDRAW)
 async def goals_withdraw(callback: CallbackQuery) -> None:
     text = build_section_text("🎯 ЦЕЛИ", "Сценарий снятия скоро появится.")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(GOALS_ROOT), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == GOALS_LIST)
 async def goals_list(callback: CallbackQuery) -> None:
     text = build_section_text("🎯 ЦЕЛИ", "Список целей скоро появится.")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(GOALS_ROOT), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == REPORTS_SUMMARY)
 async def reports_summary(callback: CallbackQuery) -> None:
     text = build_section_text("📊 ОТЧЕТЫ", "Сценарий сводки скоро появится.")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(REPORTS_ROOT), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == REPORTS_OPERATIONS)
 async def reports_operations(callback: CallbackQuery) -> None:
     text = build_section_text("📊 ОТЧЕТЫ", "Сценарий операций скоро появится.")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(REPORTS_ROOT), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == REPORTS_GOALS)
 async def reports_goals(callback: CallbackQuery) -> None:
     text = build_section_text("📊 ОТЧЕТЫ", "Сценарий целей скоро появится.")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(REPORTS_ROOT), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == BACK_TO_HOME)
-async def nav_back_home(callback: CallbackQuery, session: AsyncSession, state: FSMContext) -> None:
+async def nav_back_home(
+    callback: CallbackQuery, session: AsyncSession, state: FSMContext, user: CurrentUserDTO | None
+) -> None:
     await state.clear()
-    if callback.from_user is None:
-        await _safe_callback_answer(callback)
+    if user is None:
+        await safe_callback_answer(callback)
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=callback.from_user.id,
-        telegram_username=callback.from_user.username,
-        first_name=callback.from_user.first_name,
-        last_name=callback.from_user.last_name,
-    )
     await render_root_for_callback(callback, session, str(user.id))
 
 
@@ -178,13 +197,15 @@ async def nav_back_expense_amount(callback: CallbackQuery, state: FSMContext) ->
     await state.set_state(ExpenseStates.amount)
     text = build_section_text("💸 РАСХОД", "Введите сумму")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(BACK_TO_HOME), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == BACK_TO_EXPENSE_CURRENCY)
-async def nav_back_expense_currency(callback: CallbackQuery, state: FSMContext, session: AsyncSession) -> None:
+async def nav_back_expense_currency(
+    callback: CallbackQuery, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     await state.set_state(ExpenseStates.currency)
-    currencies = await _get_budget_currencies(callback.from_user, session)
+    currencies = await _get_budget_currencies(user, session)
     breadcrumb = build_breadcrumbs("расход", "ВАЛЮТА")
     text = f"{breadcrumb}\nВыберите валюту"
     await callback.message.edit_text(
@@ -192,7 +213,7 @@ async def nav_back_expense_currency(callback: CallbackQuery, state: FSMContext,
         reply_markup=build_expense_currency_keyboard(currencies),
         parse_mode="HTML",
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == BACK_TO_INCOME_AMOUNT)
@@ -200,13 +221,15 @@ async def nav_back_income_amount(callback: CallbackQuery, state: FSMContext) ->
     await state.set_state(IncomeStates.amount)
     text = build_section_text("💰 ПРИХОД", "Введите сумму")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(BACK_TO_HOME), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == BACK_TO_INCOME_CURRENCY)
-async def nav_back_income_currency(callback: CallbackQuery, state: FSMContext, session: AsyncSession) -> None:
+async def nav_back_income_currency(
+    callback: CallbackQuery, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     await state.set_state(IncomeStates.currency)
-    currencies = await _get_budget_currencies(callback.from_user, session)
+    currencies = await _get_budget_currencies(user, session)
     breadcrumb = build_breadcrumbs("приход", "ВАЛЮТА")
     text = f"{breadcrumb}\nВыберите валюту"
     await callback.message.edit_text(
@@ -214,22 +237,29 @@ async def nav_back_income_currency(callback: CallbackQuery, state: FSMContext, s
         reply_markup=build_income_currency_keyboard(currencies),
         parse_mode="HTML",
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.message(ExpenseStates.amount)
-async def expense_amount_step(message: Message, state: FSMContext, session: AsyncSession) -> None:
-    text_raw = (message.text or "").strip()
-    if not text_raw:
-        await message.answer("Не понял сумму. Попробуй ещё раз.")
+async def expense_amount_step(
+    message: Message, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
+    currencies = await _get_budget_currencies(user, session)
+    parsed = await _read_amount(message, currencies)
+    if parsed is None:
+        return
+    data = await state.get_data()
+    msg_id = data.get("flow_message_id")
+    if parsed.currency is not None:
+        await state.update_data(expense_amount=str(parsed.amount), expense_currency=parsed.currency)
+        await state.set_state(ExpenseStates.category)
+        text, reply_markup = _expense_category_view()
+        await _edit_flow_message(message, msg_id, text, reply_markup=reply_markup, parse_mode="HTML")
         return
-    await state.update_data(expense_amount=text_raw)
+    await state.update_data(expense_amount=str(parsed.amount))
     await state.set_state(ExpenseStates.currency)
-    currencies = await _get_budget_currencies(message.from_user, session)
     breadcrumb = build_breadcrumbs("расход", "ВАЛЮТА")
     text = f"{breadcrumb}\nВыберите валюту"
-    data = await state.get_data()
-    msg_id = data.get("flow_message_id")
     await _edit_flow_message(
         message,
         msg_id,
@@ -240,18 +270,25 @@ async def expense_amount_step(message: Message, state: FSMContext, session: Asyn
 
 
 @router.message(IncomeStates.amount)
-async def income_amount_step(message: Message, state: FSMContext, session: AsyncSession) -> None:
-    text_raw = (message.text or "").strip()
-    if not text_raw:
-        await message.answer("Не понял сумму. Попробуй ещё раз.")
+async def income_amount_step(
+    message: Message, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
+    currencies = await _get_budget_currencies(user, session)
+    parsed = await _read_amount(message, currencies)
+    if parsed is None:
         return
-    await state.update_data(income_amount=text_raw)
+    data = await state.get_data()
+    msg_id = data.get("flow_message_id")
+    if parsed.currency is not None:
+        await state.update_data(income_amount=str(parsed.amount), income_currency=parsed.currency)
+        await state.set_state(IncomeStates.source)
+        text, reply_markup = _income_source_view()
+        await _edit_flow_message(message, msg_id, text, reply_markup=reply_markup, parse_mode="HTML")
+        return
+    await state.update_data(income_amount=str(parsed.amount))
     await state.set_state(IncomeStates.currency)
-    currencies = await _get_budget_currencies(message.from_user, session)
     breadcrumb = build_breadcrumbs("приход", "ВАЛЮТА")
     text = f"{breadcrumb}\nВыберите валюту"
-    data = await state.get_data()
-    msg_id = data.get("flow_message_id")
     await _edit_flow_message(
         message,
         msg_id,
@@ -261,28 +298,74 @@ async def income_amount_step(message: Message, state: FSMContext, session: Async
     )
 
 
+@router.message(StateFilter(None), F.text.regexp(QUICK_ENTRY_PATTERN))
+async def quick_entry(
+    message: Message, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
+    if user is None:
+        return
+    context = await get_active_budget_context(session, user.id)
+    if context is None:
+        await message.answer("Сначала выбери активный бюджет.")
+        return
+    try:
+        entry = await parse_quick_entry(session, context, message.text, QUICK_ENTRY_CATEGORIES)
+    except AmountParseError as exc:
+        await message.answer(f"{exc} Например: 350 еда кофе или +50000 rsd аренда")
+        return
+
+    op_key = str(uuid.uuid5(_QUICK_ENTRY_NAMESPACE, f"{message.chat.id}:{message.message_id}"))
+    data = _quick_entry_data(entry, op_key, message.text)
+    if entry.category_name is None:
+        if entry.type == "expense":
+            await state.set_state(ExpenseStates.category)
+            text, reply_markup = _expense_category_view()
+        else:
+            await state.set_state(IncomeStates.source)
+            text, reply_markup = _income_source_view()
+        sent = await message.answer(text, reply_markup=reply_markup, parse_mode="HTML")
+        await state.update_data(flow_message_id=sent.message_id, **data)
+        return
+
+    try:
+        created = await create_transaction(
+            session,
+            user.id,
+            CreateTransactionDTO(
+                type=entry.type,
+                amount=entry.amount,
+                currency=entry.currency,
+                category_name=entry.category_name,
+                create_category=entry.category_name in QUICK_ENTRY_CATEGORIES[entry.type],
+                comment=entry.comment,
+                input_type="text",
+                raw_text=message.text,
+                idempotency_key=op_key,
+            ),
+        )
+    except TransactionServiceError as exc:
+        await message.answer(f"Не удалось сохранить: {exc}")
+        return
+    if entry.type == "expense":
+        text = _build_expense_done_text(data, created.seq_no)
+        reply_markup = build_done_keyboard("Еще расход", EXPENSE_MORE, EXPENSE_REPEAT, EXPENSE_DONE)
+    else:
+        text = _build_income_done_text(data, created.seq_no)
+        reply_markup = build_done_keyboard("Еще приход", INCOME_MORE, INCOME_REPEAT, INCOME_DONE)
+    sent = await message.answer(text, reply_markup=reply_markup)
+    # No state is set, so the next quick entry works right away; the data
+    # lets "repeat" and "more" on this message continue as a normal flow.
+    await state.update_data(flow_message_id=sent.message_id, **data)
+
+
 @router.callback_query(F.data.startswith(EXPENSE_CURRENCY_PREFIX), ExpenseStates.currency)
 async def expense_currency_pick(callback: CallbackQuery, state: FSMContext) -> None:
     currency = callback.data.split(EXPENSE_CURRENCY_PREFIX, 1)[1]
     await state.update_data(expense_currency=currency)
     await state.set_state(ExpenseStates.category)
-    breadcrumb = build_breadcrumbs("расход", "КАТЕГОРИЯ")
-    if not EXPENSE_CATEGORIES:
-        text = f"{breadcrumb}\nКатегории еще не настроены"
-        await callback.message.edit_text(
-            text,
-            reply_markup=build_back_keyboard(BACK_TO_EXPENSE_CURRENCY),
-            parse_mode="HTML",
-        )
-        await _safe_callback_answer(callback)
-        return
-    text = f"{breadcrumb}\nВыберите категорию"
-    await callback.message.edit_text(
-        text,
-        reply_markup=build_expense_categories_keyboard(),
-        parse_mode="HTML",
-    )
-    await _safe_callback_answer(callback)
+    text, reply_markup = _expense_category_view()
+    await callback.message.edit_text(text, reply_markup=reply_markup, parse_mode="HTML")
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data.startswith(INCOME_CURRENCY_PREFIX), IncomeStates.currency)
@@ -290,23 +373,9 @@ async def income_currency_pick(callback: CallbackQuery, state: FSMContext) -> No
     currency = callback.data.split(INCOME_CURRENCY_PREFIX, 1)[1]
     await state.update_data(income_currency=currency)
     await state.set_state(IncomeStates.source)
-    breadcrumb = build_breadcrumbs("приход", "ИСТОЧНИК")
-    if not INCOME_SOURCES:
-        text = f"{breadcrumb}\nИсточники еще не настроены"
-        await callback.message.edit_text(
-            text,
-            reply_markup=build_back_keyboard(BACK_TO_INCOME_CURRENCY),
-            parse_mode="HTML",
-        )
-        await _safe_callback_answer(callback)
-        return
-    text = f"{breadcrumb}\nВыберите источник"
-    await callback.message.edit_text(
-        text,
-        reply_markup=build_income_sources_keyboard(),
-        parse_mode="HTML",
-    )
-    await _safe_callback_answer(callback)
+    text, reply_markup = _income_source_view()
+    await callback.message.edit_text(text, reply_markup=reply_markup, parse_mode="HTML")
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data.startswith(EXPENSE_CATEGORY_PREFIX), ExpenseStates.category)
@@ -321,7 +390,7 @@ async def expense_category_pick(callback: CallbackQuery, state: FSMContext) -> N
         text,
         reply_markup=build_confirm_keyboard(EXPENSE_CONFIRM, EXPENSE_EDIT),
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data.startswith(INCOME_SOURCE_PREFIX), IncomeStates.source)
@@ -336,146 +405,164 @@ async def income_source_pick(callback: CallbackQuery, state: FSMContext) -> None
         text,
         reply_markup=build_confirm_keyboard(INCOME_CONFIRM, INCOME_EDIT),
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == EXPENSE_EDIT)
 async def expense_edit(callback: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(ExpenseStates.category)
-    breadcrumb = build_breadcrumbs("расход", "КАТЕГОРИЯ")
-    if not EXPENSE_CATEGORIES:
-        text = f"{breadcrumb}\nКатегории еще не настроены"
-        await callback.message.edit_text(
-            text,
-            reply_markup=build_back_keyboard(BACK_TO_EXPENSE_CURRENCY),
-            parse_mode="HTML",
-        )
-        await _safe_callback_answer(callback)
-        return
-    text = f"{breadcrumb}\nВыберите категорию"
-    await callback.message.edit_text(
-        text,
-        reply_markup=build_expense_categories_keyboard(),
-        parse_mode="HTML",
-    )
-    await _safe_callback_answer(callback)
+    text, reply_markup = _expense_category_view()
+    await callback.message.edit_text(text, reply_markup=reply_markup, parse_mode="HTML")
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == INCOME_EDIT)
 async def income_edit(callback: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(IncomeStates.source)
-    breadcrumb = build_breadcrumbs("приход", "ИСТОЧНИК")
-    if not INCOME_SOURCES:
-        text = f"{breadcrumb}\nИсточники еще не настроены"
-        await callback.message.edit_text(
-            text,
-            reply_markup=build_back_keyboard(BACK_TO_INCOME_CURRENCY),
-            parse_mode="HTML",
-        )
-        await _safe_callback_answer(callback)
-        return
-    text = f"{breadcrumb}\nВыберите источник"
-    await callback.message.edit_text(
-        text,
-        reply_markup=build_income_sources_keyboard(),
-        parse_mode="HTML",
-    )
-    await _safe_callback_answer(callback)
+    text, reply_markup = _income_source_view()
+    await callback.message.edit_text(text, reply_markup=reply_markup, parse_mode="HTML")
+    await safe_callback_answer(callback)
 
 
-@router.callback_query(F.data == EXPENSE_CONFIRM, ExpenseStates.confirm)
-async def expense_confirm(callback: CallbackQuery, state: FSMContext) -> None:
+@router.callback_query(
+    F.data == EXPENSE_CONFIRM, ExpenseStates.confirm, flags={"callback_answer": MANUAL_ANSWER}
+)
+async def expense_confirm(
+    callback: CallbackQuery, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     data = await state.get_data()
-    text = _build_expense_done_text(data)
+    created = await _save_operation(
+        callback,
+        session,
+        user,
+        type="expense",
+        amount=data.get("expense_amount"),
+        currency=data.get("expense_currency"),
+        category_name=data.get("expense_category"),
+        create_category=True,
+        comment=data.get("expense_comment"),
+        input_type=data.get("input_type") or "menu",
+        raw_text=data.get("raw_text"),
+        idempotency_key=data.get("op_key"),
+    )
+    if created is None:
+        return
+    text = _build_expense_done_text(data, created.seq_no)
     await callback.message.edit_text(
         text,
         reply_markup=build_done_keyboard("Еще расход", EXPENSE_MORE, EXPENSE_REPEAT, EXPENSE_DONE),
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
-@router.callback_query(F.data == INCOME_CONFIRM, IncomeStates.confirm)
-async def income_confirm(callback: CallbackQuery, state: FSMContext) -> None:
+@router.callback_query(
+    F.data == INCOME_CONFIRM, IncomeStates.confirm, flags={"callback_answer": MANUAL_ANSWER}
+)
+async def income_confirm(
+    callback: CallbackQuery, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     data = await state.get_data()
-    text = _build_income_done_text(data)
+    created = await _save_operation(
+        callback,
+        session,
+        user,
+        type="income",
+        amount=data.get("income_amount"),
+        currency=data.get("income_currency"),
+        category_name=data.get("income_source"),
+        create_category=True,
+        comment=data.get("income_comment"),
+        input_type=data.get("input_type") or "menu",
+        raw_text=data.get("raw_text"),
+        idempotency_key=data.get("op_key"),
+    )
+    if created is None:
+        return
+    text = _build_income_done_text(data, created.seq_no)
     await callback.message.edit_text(
         text,
         reply_markup=build_done_keyboard("Еще приход", INCOME_MORE, INCOME_REPEAT, INCOME_DONE),
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == EXPENSE_MORE)
 async def expense_more(callback: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(ExpenseStates.amount)
-    await state.update_data(expense_amount=None, expense_currency=None, expense_category=None)
+    await state.update_data(
+        expense_amount=None,
+        expense_currency=None,
+        expense_category=None,
+        expense_comment=None,
+        op_key=_new_op_key(),
+        **_MENU_INPUT,
+    )
     text = build_section_text("💸 РАСХОД", "Введите сумму")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(BACK_TO_HOME), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == INCOME_MORE)
 async def income_more(callback: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(IncomeStates.amount)
-    await state.update_data(income_amount=None, income_currency=None, income_source=None)
+    await state.update_data(
+        income_amount=None,
+        income_currency=None,
+        income_source=None,
+        income_comment=None,
+        op_key=_new_op_key(),
+        **_MENU_INPUT,
+    )
     text = build_section_text("💰 ПРИХОД", "Введите сумму")
     await callback.message.edit_text(text, reply_markup=build_back_keyboard(BACK_TO_HOME), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == EXPENSE_REPEAT)
 async def expense_repeat(callback: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(ExpenseStates.confirm)
+    await state.update_data(op_key=_new_op_key(), **_MENU_INPUT)
     data = await state.get_data()
     text = _build_expense_confirm_text(data)
     await callback.message.edit_text(
         text,
         reply_markup=build_confirm_keyboard(EXPENSE_CONFIRM, EXPENSE_EDIT),
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == INCOME_REPEAT)
 async def income_repeat(callback: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(IncomeStates.confirm)
+    await state.update_data(op_key=_new_op_key(), **_MENU_INPUT)
     data = await state.get_data()
     text = _build_income_confirm_text(data)
     await callback.message.edit_text(
         text,
         reply_markup=build_confirm_keyboard(INCOME_CONFIRM, INCOME_EDIT),
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == EXPENSE_DONE)
-async def expense_done(callback: CallbackQuery, state: FSMContext, session: AsyncSession) -> None:
+async def expense_done(
+    callback: CallbackQuery, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     await state.clear()
-    if callback.from_user is None:
-        await _safe_callback_answer(callback)
+    if user is None:
+        await safe_callback_answer(callback)
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=callback.from_user.id,
-        telegram_username=callback.from_user.username,
-        first_name=callback.from_user.first_name,
-        last_name=callback.from_user.last_name,
-    )
     await render_root_for_callback(callback, session, str(user.id))
 
 
 @router.callback_query(F.data == INCOME_DONE)
-async def income_done(callback: CallbackQuery, state: FSMContext, session: AsyncSession) -> None:
+async def income_done(
+    callback: CallbackQuery, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     await state.clear()
-    if callback.from_user is None:
-        await _safe_callback_answer(callback)
+    if user is None:
+        await safe_callback_answer(callback)
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=callback.from_user.id,
-        telegram_username=callback.from_user.username,
-        first_name=callback.from_user.first_name,
-        last_name=callback.from_user.last_name,
-    )
     await render_root_for_callback(callback, session, str(user.id))
 
 
@@ -486,7 +573,7 @@ async def _render_goals_root(callback: CallbackQuery) -> None:
         reply_markup=build_goals_root_keyboard(),
         parse_mode="HTML",
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 async def _render_reports_root(callback: CallbackQuery) -> None:
@@ -496,27 +583,84 @@ async def _render_reports_root(callback: CallbackQuery) -> None:
         reply_markup=build_reports_root_keyboard(),
         parse_mode="HTML",
     )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
-async def _get_budget_currencies(user, session: AsyncSession) -> list[str]:
+async def _save_operation(
+    callback: CallbackQuery,
+    session: AsyncSession,
+    user: CurrentUserDTO | None,
+    **fields: object,
+) -> CreatedTransactionDTO | None:
+    if user is None:
+        await safe_callback_answer(callback)
+        return None
+    try:
+        payload = CreateTransactionDTO(**fields)
+    except ValidationError:
+        await safe_callback_answer(callback, "Не понял сумму. Начни операцию заново.", show_alert=True)
+        return None
+    try:
+        return await create_transaction(session, user.id, payload)
+    except TransactionServiceError as exc:
+        await safe_callback_answer(callback, f"Не удалось сохранить: {exc}", show_alert=True)
+        return None
+
+
+async def _get_budget_currencies(user: CurrentUserDTO | None, session: AsyncSession) -> list[str]:
+    # Same source as create_transaction, so the keyboard never offers a
+    # currency the save would refuse.
     if user is None:
         return list(BASE_CURRENCIES)
-    user_row = await ensure_user(
-        session=session,
-        telegram_user_id=user.id,
-        telegram_username=user.username,
-        first_name=user.first_name,
-        last_name=user.last_name,
-    )
-    active_budget_id = await get_active_budget_id(session, user_row.id)
-    if active_budget_id is None:
-        return list(BASE_CURRENCIES)
-    budget = await session.get(Budget, active_budget_id)
-    if budget is None:
+    context = await get_active_budget_context(session, user.id)
+    if context is None:
         return list(BASE_CURRENCIES)
-    currencies = [budget.base_currency, budget.aux_currency_1, budget.aux_currency_2]
-    return [currency for currency in currencies if currency]
+    return context.currencies
+
+
+async def _read_amount(message: Message, currencies: list[str]) -> ParsedAmount | None:
+    try:
+        parsed = parse_amount(message.text or "")
+    except AmountParseError as exc:
+        await message.answer(f"{exc} Попробуй ещё раз.")
+        return None
+    if parsed.currency is not None and parsed.currency not in currencies:
+        await message.answer(f"Валюта {parsed.currency} не подключена к бюджету. Попробуй ещё раз.")
+        return None
+    return parsed
+
+
+def _expense_category_view() -> tuple[str, InlineKeyboardMarkup]:
+    breadcrumb = build_breadcrumbs("расход", "КАТЕГОРИЯ")
+    if not EXPENSE_CATEGORIES:
+        return f"{breadcrumb}\nКатегории еще не настроены", build_back_keyboard(BACK_TO_EXPENSE_CURRENCY)
+    return f"{breadcrumb}\nВыберите категорию", build_expense_categories_keyboard()
+
+
+def _income_source_view() -> tuple[str, InlineKeyboardMarkup]:
+    breadcrumb = build_breadcrumbs("приход", "ИСТОЧНИК")
+    if not INCOME_SOURCES:
+        return f"{breadcrumb}\nИсточники еще не настроены", build_back_keyboard(BACK_TO_INCOME_CURRENCY)
+    return f"{breadcrumb}\nВыберите источник", build_income_sources_keyboard()
+
+
+def _quick_entry_data(entry: QuickEntryDTO, op_key: str, raw_text: str) -> dict[str, str | None]:
+    category_key = "expense_category" if entry.type == "expense" else "income_source"
+    return {
+        f"{entry.type}_amount": str(entry.amount),
+        f"{entry.type}_currency": entry.currency,
+        category_key: entry.category_name,
+        f"{entry.type}_comment": entry.comment,
+        "op_key": op_key,
+        "input_type": "text",
+        "raw_text": raw_text,
+    }
+
+
+def _new_op_key() -> str:
+    # Generated when a flow starts; a repeated confirm of the same flow reuses
+    # it and gets the already saved operation back.
+    return str(uuid.uuid4())
 
 
 def _find_label(items: list[tuple[str, str]], key: str) -> str:
@@ -534,6 +678,7 @@ def _build_expense_confirm_text(data: dict) -> str:
         "Проверьте\n\n"
         f"💸 -{amount} {currency}\n"
         f"Категория: {category}"
+        f"{_comment_line(data.get('expense_comment'))}"
     )
 
 
@@ -545,33 +690,40 @@ def _build_income_confirm_text(data: dict) -> str:
         "Проверьте\n\n"
         f"💰 +{amount} {currency}\n"
         f"Источник: {source}"
+        f"{_comment_line(data.get('income_comment'))}"
     )
 
 
-def _build_expense_done_text(data: dict) -> str:
+def _build_expense_done_text(data: dict, seq_no: int) -> str:
     amount = data.get("expense_amount", "—")
     currency = data.get("expense_currency", "—")
     category = data.get("expense_category", "—")
     return (
         "✅ Расход сохранен\n\n"
         f"💸 -{amount} {currency}\n"
-        f"Категория: {category}\n"
-        "№—"
+        f"Категория: {category}"
+        f"{_comment_line(data.get('expense_comment'))}\n"
+        f"№{seq_no}"
     )
 
 
-def _build_income_done_text(data: dict) -> str:
+def _build_income_done_text(data: dict, seq_no: int) -> str:
     amount = data.get("income_amount", "—")
     currency = data.get("income_currency", "—")
     source = data.get("income_source", "—")
     return (
         "✅ Приход сохранен\n\n"
         f"💰 +{amount} {currency}\n"
-        f"Источник: {source}\n"
-        "№—"
+        f"Источник: {source}"
+        f"{_comment_line(data.get('income_comment'))}\n"
+        f"№{seq_no}"
     )
 
 
+def _comment_line(comment: str | None) -> str:
+    return f"\nКомментарий: {comment}" if comment else ""
+
+
 async def _edit_flow_message(
     message: Message,
     msg_id: int | None,
@@ -594,8 +746,3 @@ async def _edit_flow_message(
         await message.answer(text, reply_markup=reply_markup, parse_mode=parse_mode)
 
 
-async def _safe_callback_answer(callback: CallbackQuery) -> None:
-    try:
-        await callback.answer()
-    except TelegramBadRequest:
-        return
@@ -1,5 +1,7 @@
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
 
+from bot.utils.keyboards import keyboard_registry
+
 CANCEL_CALLBACK = "common:cancel"
 HOME_REPLY_TEXT = "🏠 Home"
 FIRST_RUN_BACK = "onboarding:back:first_run"
@@ -21,6 +23,7 @@ SKIP_AUX_CURRENCY = "onboarding:skip_aux"
 USE_DEFAULT_TIMEZONE = "onboarding:default_tz"
 
 
+@keyboard_registry.static
 def build_start_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -43,6 +46,7 @@ def build_start_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_skip_aux_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -51,6 +55,7 @@ def build_skip_aux_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.cached
 def build_default_timezone_keyboard(default_tz: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -64,6 +69,7 @@ def build_default_timezone_keyboard(default_tz: str) -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_aux_currency_reply_keyboard() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(
         keyboard=[[KeyboardButton(text="Пропустить"), KeyboardButton(text="Назад"), KeyboardButton(text="Отмена")]],
@@ -72,6 +78,7 @@ def build_aux_currency_reply_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
+@keyboard_registry.cached
 def build_timezone_reply_keyboard(default_tz: str) -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(
         keyboard=[
@@ -83,6 +90,7 @@ def build_timezone_reply_keyboard(default_tz: str) -> ReplyKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_cancel_reply_keyboard() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(
         keyboard=[[KeyboardButton(text="Отмена")]],
@@ -92,6 +100,7 @@ def build_cancel_reply_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_cancel_back_reply_keyboard() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(
         keyboard=[[KeyboardButton(text="Назад"), KeyboardButton(text="Отмена")]],
@@ -101,6 +110,7 @@ def build_cancel_back_reply_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_home_reply_keyboard() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(
         keyboard=[[KeyboardButton(text=HOME_REPLY_TEXT)]],
@@ -110,6 +120,7 @@ def build_home_reply_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_confirm_inline_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -126,6 +137,7 @@ def build_confirm_inline_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_invite_confirm_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -139,6 +151,7 @@ def build_invite_confirm_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_first_run_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -148,12 +161,14 @@ def build_first_run_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_first_run_back_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[[InlineKeyboardButton(text="Назад", callback_data=FIRST_RUN_BACK)]]
     )
 
 
+@keyboard_registry.static
 def build_base_currency_keyboard() -> InlineKeyboardMarkup:
     rows: list[list[InlineKeyboardButton]] = []
     for idx in range(0, len(BASE_CURRENCIES), 2):
@@ -176,6 +191,7 @@ def build_base_currency_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.cached
 def build_aux_currency_keyboard(
     available: list[str],
     allow_skip: bool,
@@ -194,6 +210,7 @@ def build_aux_currency_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+@keyboard_registry.static
 def build_timezone_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
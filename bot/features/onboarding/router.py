@@ -1,7 +1,7 @@
 import logging
 import uuid
 
-from aiogram import F, Router
+from aiogram import F
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import CommandStart
 from aiogram.fsm.context import FSMContext
@@ -31,34 +31,28 @@ from bot.features.onboarding.keyboards import (
     HOME_REPLY_TEXT,
 )
 from bot.features.onboarding.states import CreateBudgetStates, JoinBudgetStates
+from bot.utils.callback_answer import safe_callback_answer
+from bot.utils.callback_dispatch import IndexedRouter
 from core.settings_app import app_settings
 from services.budget_service import BudgetServiceError, create_first_budget
 from services.dto.budget import CreateBudgetDTO
+from services.dto.user import CurrentUserDTO
 from services.invite_service import (
     InviteServiceError,
     accept_invite,
     create_invite_for_owner,
     get_invite_preview,
 )
-from services.user_service import ensure_user
 
-router = Router()
+router = IndexedRouter()
 logger = logging.getLogger(__name__)
 
 
 @router.message(CommandStart())
-async def start_handler(message: Message, session: AsyncSession, state: FSMContext) -> None:
-    user = None
+async def start_handler(
+    message: Message, session: AsyncSession, state: FSMContext, user: CurrentUserDTO | None
+) -> None:
     first_name = message.from_user.first_name if message.from_user else None
-    if message.from_user is not None:
-        user = await ensure_user(
-            session=session,
-            telegram_user_id=message.from_user.id,
-            telegram_username=message.from_user.username,
-            first_name=message.from_user.first_name,
-            last_name=message.from_user.last_name,
-        )
-
     greeting = build_greeting_text(first_name)
     await message.answer(greeting, reply_markup=build_home_reply_keyboard())
 
@@ -85,19 +79,12 @@ async def start_handler(message: Message, session: AsyncSession, state: FSMConte
 async def create_budget_callback(
     callback: CallbackQuery,
     state: FSMContext,
-    session: AsyncSession,
+    user: CurrentUserDTO | None,
 ) -> None:
-    if callback.from_user is None:
-        await callback.answer()
+    if user is None:
+        await safe_callback_answer(callback)
         return
 
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=callback.from_user.id,
-        telegram_username=callback.from_user.username,
-        first_name=callback.from_user.first_name,
-        last_name=callback.from_user.last_name,
-    )
     await state.update_data(owner_user_id=str(user.id))
     await state.set_state(CreateBudgetStates.name)
     await state.update_data(flow_message_id=callback.message.message_id)
@@ -115,9 +102,7 @@ async def create_budget_callback(
             reply_markup=build_first_run_back_keyboard(),
             parse_mode="HTML",
         )
-    await _safe_callback_answer(callback)
-
-
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == JOIN_BUDGET_CALLBACK)
@@ -137,48 +122,35 @@ async def join_budget_callback(callback: CallbackQuery, state: FSMContext) -> No
             reply_markup=build_first_run_back_keyboard(),
             parse_mode="HTML",
         )
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == FIRST_RUN_BACK)
-async def first_run_back(callback: CallbackQuery, state: FSMContext, session: AsyncSession) -> None:
+async def first_run_back(
+    callback: CallbackQuery, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     await state.clear()
-    if callback.from_user is None:
-        await _safe_callback_answer(callback)
+    if user is None:
+        await safe_callback_answer(callback)
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=callback.from_user.id,
-        telegram_username=callback.from_user.username,
-        first_name=callback.from_user.first_name,
-        last_name=callback.from_user.last_name,
-    )
     await render_root_for_callback(callback, session, str(user.id))
 
 
-
-
 @router.callback_query(F.data == INVITE_BUDGET_CALLBACK)
 async def invite_budget_callback(
     callback: CallbackQuery,
     session: AsyncSession,
+    user: CurrentUserDTO | None,
 ) -> None:
-    if callback.from_user is None:
-        await _safe_callback_answer(callback)
+    if user is None:
+        await safe_callback_answer(callback)
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=callback.from_user.id,
-        telegram_username=callback.from_user.username,
-        first_name=callback.from_user.first_name,
-        last_name=callback.from_user.last_name,
-    )
     try:
         invite = await create_invite_for_owner(session, user.id)
         bot_username = (await callback.bot.get_me()).username
         if not bot_username:
             await callback.message.answer("Не удалось получить имя бота. Попробуй позже.")
-            await _safe_callback_answer(callback)
+            await safe_callback_answer(callback)
             return
         link = f"https://t.me/{bot_username}?start=invite_{invite.token}"
         await callback.message.answer(
@@ -187,68 +159,48 @@ async def invite_budget_callback(
         )
     except InviteServiceError as exc:
         await callback.message.answer(f"Не удалось создать приглашение: {exc}")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.message(F.text.casefold() == "отмена")
-async def cancel_message(message: Message, state: FSMContext, session: AsyncSession) -> None:
+async def cancel_message(
+    message: Message, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     await state.clear()
-    if message.from_user is None:
+    if user is None:
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=message.from_user.id,
-        telegram_username=message.from_user.username,
-        first_name=message.from_user.first_name,
-        last_name=message.from_user.last_name,
-    )
     await render_root_for_message(message, session, str(user.id))
 
 
 @router.message(F.text == HOME_REPLY_TEXT)
-async def home_message(message: Message, state: FSMContext, session: AsyncSession) -> None:
+async def home_message(
+    message: Message, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     await state.clear()
-    if message.from_user is None:
+    if user is None:
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=message.from_user.id,
-        telegram_username=message.from_user.username,
-        first_name=message.from_user.first_name,
-        last_name=message.from_user.last_name,
-    )
     await render_root_for_message(message, session, str(user.id))
 
 
 @router.callback_query(F.data == CANCEL_CALLBACK)
-async def cancel_callback(callback: CallbackQuery, state: FSMContext, session: AsyncSession) -> None:
+async def cancel_callback(
+    callback: CallbackQuery, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     await state.clear()
-    if callback.from_user is None:
-        await _safe_callback_answer(callback)
+    if user is None:
+        await safe_callback_answer(callback)
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=callback.from_user.id,
-        telegram_username=callback.from_user.username,
-        first_name=callback.from_user.first_name,
-        last_name=callback.from_user.last_name,
-    )
     await render_root_for_callback(callback, session, str(user.id))
 
 
 @router.message(CreateBudgetStates.name)
-async def budget_name_step(message: Message, state: FSMContext, session: AsyncSession) -> None:
+async def budget_name_step(
+    message: Message, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
     if (message.text or "").strip().casefold() in {"назад", HOME_REPLY_TEXT.casefold()}:
         await state.clear()
-        if message.from_user is None:
+        if user is None:
             return
-        user = await ensure_user(
-            session=session,
-            telegram_user_id=message.from_user.id,
-            telegram_username=message.from_user.username,
-            first_name=message.from_user.first_name,
-            last_name=message.from_user.last_name,
-        )
         await render_root_for_message(message, session, str(user.id))
         return
     name = (message.text or "").strip()
@@ -270,8 +222,10 @@ async def budget_name_step(message: Message, state: FSMContext, session: AsyncSe
 
 
 @router.message(JoinBudgetStates.token)
-async def join_budget_token_step(message: Message, state: FSMContext, session: AsyncSession) -> None:
-    if message.from_user is None:
+async def join_budget_token_step(
+    message: Message, state: FSMContext, session: AsyncSession, user: CurrentUserDTO | None
+) -> None:
+    if user is None:
         await message.answer("Не нашёл пользователя. Попробуй /start ещё раз.")
         await state.clear()
         return
@@ -281,28 +235,12 @@ async def join_budget_token_step(message: Message, state: FSMContext, session: A
         ("/start", "/main_menu", "/main-menu")
     ):
         await state.clear()
-        if message.from_user is None:
-            return
-        user = await ensure_user(
-            session=session,
-            telegram_user_id=message.from_user.id,
-            telegram_username=message.from_user.username,
-            first_name=message.from_user.first_name,
-            last_name=message.from_user.last_name,
-        )
         await render_root_for_message(message, session, str(user.id))
         return
     token = _extract_invite_token(text_raw)
     if token is None:
         await message.answer("Не вижу токен. Пришли ссылку или код вида invite_XXXX.")
         return
-    user = await ensure_user(
-        session=session,
-        telegram_user_id=message.from_user.id,
-        telegram_username=message.from_user.username,
-        first_name=message.from_user.first_name,
-        last_name=message.from_user.last_name,
-    )
     try:
         invite, budget_name, owner_username = await get_invite_preview(session, token)
     except InviteServiceError as exc:
@@ -334,28 +272,28 @@ async def accept_invite_callback(
     if token is None or user_id is None:
         await callback.message.answer("Не найден инвайт. Попробуй ещё раз.")
         await state.clear()
-        await _safe_callback_answer(callback)
+        await safe_callback_answer(callback)
         return
     try:
         await accept_invite(session, token, uuid.UUID(user_id))
     except InviteServiceError as exc:
         await callback.message.answer(f"Не удалось присоединиться: {exc}")
         await state.clear()
-        await _safe_callback_answer(callback)
+        await safe_callback_answer(callback)
         return
     await state.clear()
     if user_id is not None:
         await render_root_for_callback(callback, session, user_id)
         return
     await callback.message.answer("✅ Ты присоединился к бюджету.")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data.startswith(BASE_CURRENCY_PREFIX), CreateBudgetStates.base_currency)
 async def budget_base_currency_step(callback: CallbackQuery, state: FSMContext) -> None:
     value = callback.data.split(BASE_CURRENCY_PREFIX, 1)[1].upper()
     if value not in BASE_CURRENCIES:
-        await callback.answer()
+        await safe_callback_answer(callback)
         return
     await state.update_data(base_currency=value, aux_currency_1=None, aux_currency_2=None)
     await state.set_state(CreateBudgetStates.aux_currency_1)
@@ -364,7 +302,7 @@ async def budget_base_currency_step(callback: CallbackQuery, state: FSMContext)
         "Выберите до 2 дополнительных валют",
         reply_markup=build_aux_currency_keyboard(available, allow_skip=True),
     )
-    await callback.answer()
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data.startswith(AUX_CURRENCY_PREFIX), CreateBudgetStates.aux_currency_1)
@@ -374,7 +312,7 @@ async def budget_aux_currency_pick(callback: CallbackQuery, state: FSMContext) -
     base_currency = (data.get("base_currency") or "").upper()
     selected: list[str] = list(data.get("aux_currencies") or [])
     if value == base_currency or value not in BASE_CURRENCIES or value in selected:
-        await callback.answer()
+        await safe_callback_answer(callback)
         return
     selected.append(value)
     available = [c for c in BASE_CURRENCIES if c != base_currency and c not in selected]
@@ -389,13 +327,13 @@ async def budget_aux_currency_pick(callback: CallbackQuery, state: FSMContext) -
             "Выберите таймзону",
             reply_markup=build_timezone_keyboard(),
         )
-        await callback.answer()
+        await safe_callback_answer(callback)
         return
     await callback.message.edit_text(
         "Выберите до 2 дополнительных валют",
         reply_markup=build_aux_currency_keyboard(available, allow_skip=True),
     )
-    await callback.answer()
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == AUX_SKIP_CALLBACK, CreateBudgetStates.aux_currency_1)
@@ -411,7 +349,7 @@ async def budget_aux_currency_skip(callback: CallbackQuery, state: FSMContext) -
         "Выберите таймзону",
         reply_markup=build_timezone_keyboard(),
     )
-    await callback.answer()
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data.startswith(TIMEZONE_PREFIX), CreateBudgetStates.timezone)
@@ -457,7 +395,7 @@ async def _send_budget_summary_callback(
         "Создать бюджет?"
     )
     await callback.message.edit_text(text, reply_markup=build_confirm_inline_keyboard())
-    await callback.answer()
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == "onboarding:confirm_budget", CreateBudgetStates.confirm)
@@ -467,7 +405,7 @@ async def confirm_budget(callback: CallbackQuery, state: FSMContext, session: As
     if owner_user_id is None:
         await callback.message.answer("Не нашёл пользователя. Попробуй /start ещё раз.")
         await state.clear()
-        await _safe_callback_answer(callback)
+        await safe_callback_answer(callback)
         return
 
     owner_uuid = uuid.UUID(owner_user_id)
@@ -484,13 +422,13 @@ async def confirm_budget(callback: CallbackQuery, state: FSMContext, session: As
     except BudgetServiceError as exc:
         await callback.message.answer(f"Не удалось создать бюджет: {exc}")
         await state.set_state(CreateBudgetStates.base_currency)
-        await _safe_callback_answer(callback)
+        await safe_callback_answer(callback)
         return
     except Exception:
         logger.exception("Create budget failed", extra={"owner_user_id": owner_user_id, "data": data})
         await callback.message.answer("Что-то пошло не так. Попробуй ещё раз.")
         await state.clear()
-        await _safe_callback_answer(callback)
+        await safe_callback_answer(callback)
         return
 
     await state.clear()
@@ -504,14 +442,7 @@ async def edit_budget(callback: CallbackQuery, state: FSMContext) -> None:
         "Выберите таймзону",
         reply_markup=build_timezone_keyboard(),
     )
-    await _safe_callback_answer(callback)
-
-
-async def _safe_callback_answer(callback: CallbackQuery) -> None:
-    try:
-        await callback.answer()
-    except TelegramBadRequest:
-        return
+    await safe_callback_answer(callback)
 
 
 async def _edit_flow_message(
@@ -1,5 +1,7 @@
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from bot.utils.keyboards import keyboard_registry
+
 SETTINGS_ROOT = "settings:root"
 SETTINGS_BUDGETS = "settings:budgets"
 SETTINGS_CURRENCIES = "settings:currencies"
@@ -21,6 +23,7 @@ SETTINGS_BACK = "settings:back"
 SETTINGS_CANCEL = "settings:cancel"
 
 
+@keyboard_registry.static
 def build_settings_root_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -31,6 +34,7 @@ def build_settings_root_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.cached
 def build_settings_back_cancel_keyboard(back_cb: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -40,6 +44,7 @@ def build_settings_back_cancel_keyboard(back_cb: str) -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_settings_budgets_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -53,6 +58,7 @@ def build_settings_budgets_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_settings_currencies_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -65,6 +71,7 @@ def build_settings_currencies_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+@keyboard_registry.static
 def build_settings_categories_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
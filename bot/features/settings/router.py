@@ -1,7 +1,6 @@
-from aiogram import F, Router
+from aiogram import F
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import CallbackQuery, Message
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.features.main_menu.texts import build_section_text
 from bot.features.settings.keyboards import (
@@ -24,22 +23,14 @@ from bot.features.settings.keyboards import (
     build_settings_currencies_keyboard,
     build_settings_root_keyboard,
 )
-from services.user_service import ensure_user
+from bot.utils.callback_answer import safe_callback_answer
+from bot.utils.callback_dispatch import IndexedRouter
 
-router = Router()
+router = IndexedRouter()
 
 
 @router.message(F.text.startswith("/settings"))
-async def settings_command(message: Message, session: AsyncSession) -> None:
-    if message.from_user is None:
-        return
-    await ensure_user(
-        session=session,
-        telegram_user_id=message.from_user.id,
-        telegram_username=message.from_user.username,
-        first_name=message.from_user.first_name,
-        last_name=message.from_user.last_name,
-    )
+async def settings_command(message: Message) -> None:
     text = build_section_text("⚙️ НАСТРОЙКИ", "Выберите раздел")
     await message.answer(text, reply_markup=build_settings_root_keyboard(), parse_mode="HTML")
 
@@ -48,28 +39,28 @@ async def settings_command(message: Message, session: AsyncSession) -> None:
 async def settings_root(callback: CallbackQuery) -> None:
     text = build_section_text("⚙️ НАСТРОЙКИ", "Выберите раздел")
     await _edit_or_answer(callback, text, reply_markup=build_settings_root_keyboard(), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == SETTINGS_BUDGETS)
 async def settings_budgets(callback: CallbackQuery) -> None:
     text = build_section_text("⚙️ БЮДЖЕТЫ", "Выберите действие")
     await _edit_or_answer(callback, text, reply_markup=build_settings_budgets_keyboard(), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == SETTINGS_CURRENCIES)
 async def settings_currencies(callback: CallbackQuery) -> None:
     text = build_section_text("⚙️ ВАЛЮТЫ", "Выберите раздел")
     await _edit_or_answer(callback, text, reply_markup=build_settings_currencies_keyboard(), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == SETTINGS_CATEGORIES)
 async def settings_categories(callback: CallbackQuery) -> None:
     text = build_section_text("⚙️ КАТЕГОРИИ", "Выберите раздел")
     await _edit_or_answer(callback, text, reply_markup=build_settings_categories_keyboard(), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(
@@ -85,7 +76,7 @@ async def settings_categories(callback: CallbackQuery) -> None:
 async def settings_budgets_placeholder(callback: CallbackQuery) -> None:
     text = build_section_text("⚙️ БЮДЖЕТЫ", "Сценарий будет добавлен позже.")
     await _edit_or_answer(callback, text, reply_markup=build_settings_budgets_keyboard(), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(
@@ -100,7 +91,7 @@ async def settings_budgets_placeholder(callback: CallbackQuery) -> None:
 async def settings_currencies_placeholder(callback: CallbackQuery) -> None:
     text = build_section_text("⚙️ ВАЛЮТЫ", "Сценарий будет добавлен позже.")
     await _edit_or_answer(callback, text, reply_markup=build_settings_currencies_keyboard(), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(
@@ -114,7 +105,7 @@ async def settings_currencies_placeholder(callback: CallbackQuery) -> None:
 async def settings_categories_placeholder(callback: CallbackQuery) -> None:
     text = build_section_text("⚙️ КАТЕГОРИИ", "Сценарий будет добавлен позже.")
     await _edit_or_answer(callback, text, reply_markup=build_settings_categories_keyboard(), parse_mode="HTML")
-    await _safe_callback_answer(callback)
+    await safe_callback_answer(callback)
 
 
 @router.callback_query(F.data == SETTINGS_CANCEL)
@@ -122,13 +113,6 @@ async def settings_cancel(callback: CallbackQuery) -> None:
     await settings_root(callback)
 
 
-async def _safe_callback_answer(callback: CallbackQuery) -> None:
-    try:
-        await callback.answer()
-    except TelegramBadRequest:
-        return None
-
-
 async def _edit_or_answer(
     callback: CallbackQuery,
     text: str,
@@ -2,21 +2,69 @@ import asyncio
 import logging
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import BotCommand
 
 from bot.features.budgets.router import router as budgets_router
+from bot.features.fallback.router import router as fallback_router
+from bot.features.imports.router import router as imports_router
 from bot.features.main_menu.router import router as main_menu_router
 from bot.features.onboarding.router import router as onboarding_router
 from bot.features.settings.router import router as settings_router
-from bot.middlewares.db_session import DbSessionMiddleware
+from bot.middlewares import (
+    CallbackAnswerMiddleware,
+    CurrentUserMiddleware,
+    DbSessionMiddleware,
+    UpdateSchedulerMiddleware,
+)
+from bot.session import PreserializedMarkupSession
+from bot.sharding import run_supervisor
+from bot.storage import ExpiringStorage, build_fsm_storage
+from bot.webhook import run_webhook
 from core.settings_app import app_settings
+from core.settings_db import db_settings
+from db.session import warm_up_pool
+from services.category_stats import category_stats
+
+
+def build_dispatcher() -> Dispatcher:
+    dp = Dispatcher(storage=build_fsm_storage(app_settings))
+    scheduler = UpdateSchedulerMiddleware(
+        # Every running handler may hold a pooled connection.
+        max_concurrency=app_settings.scheduler_max_concurrency
+        or db_settings.db_pool_size + db_settings.db_max_overflow,
+        max_backlog=app_settings.scheduler_max_backlog,
+        report_interval_seconds=app_settings.scheduler_report_interval_seconds,
+    )
+    dp["update_scheduler"] = scheduler
+
+    dp.update.outer_middleware(scheduler)
+    dp.update.middleware(DbSessionMiddleware())
+    dp.message.middleware(CurrentUserMiddleware())
+    dp.callback_query.middleware(CallbackAnswerMiddleware(app_settings.callback_answer_delay_seconds))
+    dp.callback_query.middleware(CurrentUserMiddleware())
+
+    dp.include_router(onboarding_router)
+    dp.include_router(budgets_router)
+    dp.include_router(main_menu_router)
+    dp.include_router(settings_router)
+    dp.include_router(imports_router)
+    dp.include_router(fallback_router)
+
+    dp.startup.register(warm_up_pool)
+    dp.startup.register(scheduler.start_reporting)
+    dp.shutdown.register(scheduler.stop_reporting)
+    dp.startup.register(category_stats.start)
+    dp.shutdown.register(category_stats.stop)
+    if isinstance(dp.storage, ExpiringStorage):
+        dp.startup.register(dp.storage.start_purging)
+        dp.shutdown.register(dp.storage.stop_purging)
+    return dp
 
 
 async def main() -> None:
     logging.basicConfig(level=logging.INFO)
-    bot = Bot(token=app_settings.bot_token)
-    dp = Dispatcher(storage=MemoryStorage())
+    bot = Bot(token=app_settings.bot_token, session=PreserializedMarkupSession())
+    dp = build_dispatcher()
 
     await bot.set_my_commands(
         [
@@ -26,13 +74,12 @@ async def main() -> None:
         ]
     )
 
-    dp.update.middleware(DbSessionMiddleware())
-
-    dp.include_router(onboarding_router)
-    dp.include_router(budgets_router)
-    dp.include_router(main_menu_router)
-    dp.include_router(settings_router)
-
+    if app_settings.bot_workers > 1:
+        await run_supervisor(bot, dp, build_dispatcher, app_settings)
+        return
+    if app_settings.bot_mode == "webhook":
+        await run_webhook(bot, dp, app_settings)
+        return
     await dp.start_polling(bot)
 
 
@@ -1 +1,4 @@
+from bot.middlewares.callback_answer import CallbackAnswerMiddleware  # noqa: F401
+from bot.middlewares.current_user import CurrentUserMiddleware  # noqa: F401
 from bot.middlewares.db_session import DbSessionMiddleware  # noqa: F401
+from bot.middlewares.scheduler import SchedulerMetrics, UpdateSchedulerMiddleware  # noqa: F401
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, TelegramObject
+
+from bot.utils.callback_answer import CallbackAck, current_ack
+
+MANUAL_ANSWER = "manual"
+
+
+class CallbackAnswerMiddleware(BaseMiddleware):
+    def __init__(self, delay_seconds: float = 0) -> None:
+        self._delay_seconds = delay_seconds
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, CallbackQuery):
+            return await handler(event, data)
+
+        ack = CallbackAck(event)
+        token = current_ack.set(ack)
+        early = None
+        if get_flag(data, "callback_answer") != MANUAL_ANSWER:
+            early = asyncio.create_task(self._answer_later(ack))
+        try:
+            return await handler(event, data)
+        finally:
+            current_ack.reset(token)
+            if early is not None:
+                if not ack.answered:
+                    early.cancel()
+                await asyncio.gather(early, return_exceptions=True)
+            await ack.answer()
+
+    async def _answer_later(self, ack: CallbackAck) -> None:
+        if self._delay_seconds > 0:
+            await asyncio.sleep(self._delay_seconds)
+        await ack.answer()
@@ -0,0 +1,32 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from services.user_service import ensure_user
+
+
+class CurrentUserMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        if handler_object is not None and "user" not in handler_object.params:
+            return await handler(event, data)
+
+        from_user = data.get("event_from_user")
+        if from_user is None:
+            data["user"] = None
+            return await handler(event, data)
+
+        data["user"] = await ensure_user(
+            session=data["session"],
+            telegram_user_id=from_user.id,
+            telegram_username=from_user.username,
+            first_name=from_user.first_name,
+            last_name=from_user.last_name,
+        )
+        return await handler(event, data)
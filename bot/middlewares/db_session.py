@@ -2,7 +2,6 @@ from typing import Any, Awaitable, Callable, Dict
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.session import SessionMaker
 
@@ -14,6 +13,9 @@ class DbSessionMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
+        # AsyncSession checks out a pooled connection only on its first query
+        # and returns it on commit or rollback, so handlers that never touch
+        # the database never hold a connection.
         async with SessionMaker() as session:
             data["session"] = session
             return await handler(event, data)
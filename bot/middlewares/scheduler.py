@@ -0,0 +1,162 @@
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+logger = logging.getLogger(__name__)
+
+WAIT_BUCKETS_SECONDS: tuple[float, ...] = (0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+@dataclass
+class SchedulerMetrics:
+    queued: int = 0
+    running: int = 0
+    handled_total: int = 0
+    shed_total: int = 0
+    wait_seconds_sum: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.wait_buckets = [0] * len(WAIT_BUCKETS_SECONDS)
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_seconds_sum += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        for idx, bound in enumerate(WAIT_BUCKETS_SECONDS):
+            if seconds <= bound:
+                self.wait_buckets[idx] += 1
+
+    def render(self) -> str:
+        started = self.handled_total + self.running
+        lines = [
+            "# TYPE bot_updates_queued gauge",
+            f"bot_updates_queued {self.queued}",
+            "# TYPE bot_updates_running gauge",
+            f"bot_updates_running {self.running}",
+            "# TYPE bot_updates_handled_total counter",
+            f"bot_updates_handled_total {self.handled_total}",
+            "# TYPE bot_updates_shed_total counter",
+            f"bot_updates_shed_total {self.shed_total}",
+            "# TYPE bot_update_wait_seconds histogram",
+        ]
+        for bound, count in zip(WAIT_BUCKETS_SECONDS, self.wait_buckets):
+            lines.append(f'bot_update_wait_seconds_bucket{{le="{bound}"}} {count}')
+        lines.append(f'bot_update_wait_seconds_bucket{{le="+Inf"}} {started}')
+        lines.append(f"bot_update_wait_seconds_sum {self.wait_seconds_sum:.6f}")
+        lines.append(f"bot_update_wait_seconds_count {started}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        started = self.handled_total + self.running
+        avg_ms = self.wait_seconds_sum / started * 1000 if started else 0.0
+        return (
+            f"queued={self.queued} running={self.running} handled={self.handled_total} "
+            f"shed={self.shed_total} wait_avg={avg_ms:.1f}ms wait_max={self.wait_seconds_max * 1000:.1f}ms"
+        )
+
+
+class _UserSlot:
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class UpdateSchedulerMiddleware(BaseMiddleware):
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_backlog: int,
+        report_interval_seconds: float = 0,
+    ) -> None:
+        self.metrics = SchedulerMetrics()
+        self._max_backlog = max_backlog
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._user_slots: dict[int, _UserSlot] = {}
+        self._report_interval_seconds = report_interval_seconds
+        self._report_task: asyncio.Task | None = None
+
+    async def start_reporting(self) -> None:
+        if self._report_interval_seconds > 0 and self._report_task is None:
+            self._report_task = asyncio.create_task(
+                log_scheduler_metrics(self.metrics, self._report_interval_seconds)
+            )
+
+    async def stop_reporting(self) -> None:
+        if self._report_task is None:
+            return
+        task, self._report_task = self._report_task, None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        metrics = self.metrics
+        if metrics.queued >= self._max_backlog:
+            metrics.shed_total += 1
+            logger.warning("Update backlog is full, dropping update", extra={"queued": metrics.queued})
+            return None
+
+        key = _serial_key(data)
+        user_slot = None
+        if key is not None:
+            user_slot = self._user_slots.get(key)
+            if user_slot is None:
+                user_slot = self._user_slots[key] = _UserSlot()
+            user_slot.users += 1
+
+        queued_at = time.monotonic()
+        metrics.queued += 1
+        started = False
+        try:
+            async with _optional_lock(user_slot), self._slots:
+                started = True
+                metrics.queued -= 1
+                metrics.observe_wait(time.monotonic() - queued_at)
+                metrics.running += 1
+                try:
+                    return await handler(event, data)
+                finally:
+                    metrics.running -= 1
+                    metrics.handled_total += 1
+        finally:
+            if not started:
+                metrics.queued -= 1
+            if user_slot is not None:
+                user_slot.users -= 1
+                if user_slot.users == 0:
+                    del self._user_slots[key]
+
+
+def _serial_key(data: Dict[str, Any]) -> int | None:
+    user = data.get("event_from_user")
+    if user is not None:
+        return user.id
+    chat = data.get("event_chat")
+    if chat is not None:
+        return chat.id
+    return None
+
+
+def _optional_lock(user_slot: _UserSlot | None) -> contextlib.AbstractAsyncContextManager[Any]:
+    if user_slot is None:
+        return contextlib.nullcontext()
+    return user_slot.lock
+
+
+async def log_scheduler_metrics(metrics: SchedulerMetrics, interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        logger.info("Update scheduler: %s", metrics.summary())
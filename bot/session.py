@@ -0,0 +1,36 @@
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import InputFile
+from aiohttp import FormData
+
+from bot.utils.keyboards import keyboard_registry
+
+
+class PreserializedMarkupSession(AiohttpSession):
+    """Sends registry keyboards as their cached JSON instead of re-dumping them."""
+
+    def build_form_data(self, bot: Bot, method: TelegramMethod[TelegramType]) -> FormData:
+        serialized = keyboard_registry.serialized(
+            getattr(method, "reply_markup", None),
+            lambda markup: self.prepare_value(markup, bot=bot, files={}),
+        )
+        if serialized is None:
+            return super().build_form_data(bot, method)
+
+        form = FormData(quote_fields=False)
+        files: dict[str, InputFile] = {}
+        for key, value in method.model_dump(warnings=False, exclude={"reply_markup"}).items():
+            value = self.prepare_value(value, bot=bot, files=files)
+            if not value:
+                continue
+            form.add_field(key, value)
+        form.add_field("reply_markup", serialized)
+        for key, value in files.items():
+            form.add_field(
+                key,
+                value.read(bot),
+                filename=value.filename or key,
+            )
+        return form
@@ -0,0 +1,323 @@
+import asyncio
+import logging
+import multiprocessing
+import queue as queue_module
+import signal
+import time
+from collections import deque
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Event
+from typing import Any, Callable
+
+from aiogram import Bot, Dispatcher
+
+from bot.session import PreserializedMarkupSession
+from bot.webhook import run_webhook
+from core.invalidation import invalidation_bus
+from core.settings_app import AppSettings
+
+logger = logging.getLogger(__name__)
+
+DispatcherFactory = Callable[[], Dispatcher]
+
+POLLING_TIMEOUT_SECONDS = 30
+POLLING_RETRY_SECONDS = 1.0
+WORKER_READY_TIMEOUT_SECONDS = 60.0
+WORKER_BACKLOG_FACTOR = 4
+WORKER_CHECK_INTERVAL_SECONDS = 1.0
+WORKER_MAX_RESTARTS = 5
+WORKER_RESTART_WINDOW_SECONDS = 300.0
+
+
+def shard_key(raw: dict[str, Any]) -> int:
+    for name, event in raw.items():
+        if name == "update_id" or not isinstance(event, dict):
+            continue
+        user = event.get("from") or event.get("user")
+        if user:
+            return user["id"]
+        chat = event.get("chat") or (event.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"]
+    return raw.get("update_id", 0)
+
+
+def shard_for(raw: dict[str, Any], workers: int) -> int:
+    return shard_key(raw) % workers
+
+
+class ShardPool:
+    """Runs one dispatcher per worker process and routes updates by shard_key.
+
+    Inside a worker, updates with the same key run one after another and
+    different keys run concurrently up to max_concurrency. supervise()
+    restarts a worker that dies; updates still queued for it are kept and
+    handled by the new process.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        dispatcher_factory: DispatcherFactory,
+        bot_token: str,
+        max_concurrency: int,
+        log_level: int = logging.INFO,
+    ) -> None:
+        self._context = multiprocessing.get_context("spawn")
+        self._dispatcher_factory = dispatcher_factory
+        self._bot_token = bot_token
+        self._max_concurrency = max_concurrency
+        self._log_level = log_level
+        self._queues: list[Queue] = [self._context.Queue() for _ in range(workers)]
+        self._ready: list[Event] = [self._context.Event() for _ in range(workers)]
+        # Workers report cache invalidations here; the supervisor relays them
+        # to the other workers' own invalidation queues.
+        self._invalidations: Queue = self._context.Queue()
+        self._worker_invalidations: list[Queue] = [self._context.Queue() for _ in range(workers)]
+        self._relay: asyncio.Task | None = None
+        self._restarts: deque[float] = deque()
+        self._stopping = False
+        self._processes = [self._spawn(index) for index in range(workers)]
+
+    @property
+    def workers(self) -> int:
+        return len(self._processes)
+
+    async def start(self) -> None:
+        for process in self._processes:
+            process.start()
+        if not all(await asyncio.gather(*(self._wait_ready(index) for index in range(self.workers)))):
+            await self.stop()
+            raise RuntimeError("Bot workers failed to start")
+        self._relay = asyncio.create_task(self._relay_invalidations())
+        logger.info("Started %s bot workers", self.workers)
+
+    def dispatch(self, raw: dict[str, Any]) -> None:
+        self._queues[shard_for(raw, self.workers)].put(raw)
+
+    async def feed(self, raw: dict[str, Any]) -> None:
+        self.dispatch(raw)
+
+    async def supervise(self) -> None:
+        """Restart dead workers; raise once they keep dying."""
+        while not self._stopping:
+            await asyncio.sleep(WORKER_CHECK_INTERVAL_SECONDS)
+            for index, process in enumerate(self._processes):
+                if self._stopping or process.is_alive():
+                    continue
+                logger.error(
+                    "Bot worker %s exited with code %s; its in-flight updates are lost",
+                    index,
+                    process.exitcode,
+                )
+                now = time.monotonic()
+                self._restarts.append(now)
+                while self._restarts[0] < now - WORKER_RESTART_WINDOW_SECONDS:
+                    self._restarts.popleft()
+                if len(self._restarts) > WORKER_MAX_RESTARTS:
+                    raise RuntimeError(
+                        f"Bot workers died {len(self._restarts)} times "
+                        f"in {WORKER_RESTART_WINDOW_SECONDS:.0f}s"
+                    )
+                self._ready[index].clear()
+                self._processes[index] = self._spawn(index)
+                self._processes[index].start()
+                if not await self._wait_ready(index):
+                    raise RuntimeError(f"Bot worker {index} failed to restart")
+                logger.info("Restarted bot worker %s", index)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for queue, process in zip(self._queues, self._processes):
+            if process.is_alive():
+                queue.put(None)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(None, process.join) for process in self._processes if process.pid)
+        )
+        if self._relay is not None:
+            self._invalidations.put(None)
+            await self._relay
+            self._relay = None
+
+    def _spawn(self, index: int) -> BaseProcess:
+        return self._context.Process(
+            target=_worker_main,
+            args=(
+                index,
+                self._dispatcher_factory,
+                self._bot_token,
+                self._queues[index],
+                self._invalidations,
+                self._worker_invalidations[index],
+                self._ready[index],
+                self._max_concurrency,
+                self._log_level,
+            ),
+            name=f"bot-worker-{index}",
+        )
+
+    async def _wait_ready(self, index: int) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._ready[index].wait, WORKER_READY_TIMEOUT_SECONDS)
+
+    async def _relay_invalidations(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, self._invalidations.get)
+            if message is None:
+                return
+            source, topic, key = message
+            # Workers drain their invalidation queue before every update, so
+            # updates already queued do not run on the stale entry. Updates
+            # that start while the message is still on its way through this
+            # relay can; that window is the relay hop, not the queue depth.
+            for index, queue in enumerate(self._worker_invalidations):
+                if index != source:
+                    queue.put((topic, key))
+
+
+def _worker_main(
+    index: int,
+    dispatcher_factory: DispatcherFactory,
+    bot_token: str,
+    queue: Queue,
+    invalidations: Queue,
+    inbound_invalidations: Queue,
+    ready: Event,
+    max_concurrency: int,
+    log_level: int,
+) -> None:
+    # The supervisor owns shutdown: it drains workers by sending a sentinel.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=log_level)
+    invalidation_bus.set_publisher(lambda topic, key: invalidations.put((index, topic, key)))
+    asyncio.run(
+        _run_worker(
+            index,
+            dispatcher_factory,
+            bot_token,
+            queue,
+            inbound_invalidations,
+            ready,
+            max_concurrency,
+        )
+    )
+
+
+async def _run_worker(
+    index: int,
+    dispatcher_factory: DispatcherFactory,
+    bot_token: str,
+    queue: Queue,
+    invalidations: Queue,
+    ready: Event,
+    max_concurrency: int,
+) -> None:
+    loop = asyncio.get_running_loop()
+    bot = Bot(token=bot_token, session=PreserializedMarkupSession())
+    dp = dispatcher_factory()
+    running = asyncio.Semaphore(max_concurrency)
+    # Bounds updates taken off the queue but not finished yet, including the
+    # ones waiting behind an earlier update of the same key.
+    admitted = asyncio.Semaphore(max_concurrency * WORKER_BACKLOG_FACTOR)
+    pending: dict[int, deque[dict[str, Any]]] = {}
+    tasks: set[asyncio.Task] = set()
+
+    def apply_invalidations() -> None:
+        while True:
+            try:
+                topic, key = invalidations.get_nowait()
+            except queue_module.Empty:
+                return
+            invalidation_bus.apply(topic, key)
+
+    async def process(raw: dict[str, Any]) -> None:
+        try:
+            async with running:
+                apply_invalidations()
+                await dp.feed_raw_update(bot, raw)
+        except Exception:
+            logger.exception("Worker %s failed to process update %s", index, raw.get("update_id"))
+        finally:
+            admitted.release()
+
+    async def drain(key: int) -> None:
+        updates = pending[key]
+        while updates:
+            await process(updates.popleft())
+        del pending[key]
+
+    await dp.emit_startup(bot=bot, dispatcher=dp)
+    ready.set()
+    try:
+        while True:
+            await admitted.acquire()
+            item = await loop.run_in_executor(None, queue.get)
+            if item is None:
+                break
+            key = shard_key(item)
+            updates = pending.get(key)
+            if updates is not None:
+                updates.append(item)
+                continue
+            pending[key] = deque([item])
+            task = asyncio.create_task(drain(key))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await dp.emit_shutdown(bot=bot, dispatcher=dp)
+        await dp.storage.close()
+        await bot.session.close()
+
+
+async def poll_into(bot: Bot, pool: ShardPool, allowed_updates: list[str]) -> None:
+    offset: int | None = None
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset,
+                timeout=POLLING_TIMEOUT_SECONDS,
+                allowed_updates=allowed_updates,
+            )
+        except Exception:
+            logger.exception("Failed to fetch updates")
+            await asyncio.sleep(POLLING_RETRY_SECONDS)
+            continue
+        for update in updates:
+            pool.dispatch(update.model_dump(mode="json", by_alias=True, exclude_none=True))
+            offset = update.update_id + 1
+
+
+async def run_supervisor(
+    bot: Bot,
+    dp: Dispatcher,
+    dispatcher_factory: DispatcherFactory,
+    settings: AppSettings,
+) -> None:
+    pool = ShardPool(
+        settings.bot_workers,
+        dispatcher_factory,
+        settings.bot_token,
+        settings.worker_max_concurrency,
+    )
+    await pool.start()
+    if settings.bot_mode == "webhook":
+        serving = asyncio.create_task(run_webhook(bot, dp, settings, feed=pool.feed))
+    else:
+        serving = asyncio.create_task(poll_into(bot, pool, dp.resolve_used_update_types()))
+    supervisor = asyncio.create_task(pool.supervise())
+    try:
+        # Neither task ends on its own: one finishing means it failed.
+        done, _ = await asyncio.wait({serving, supervisor}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        for task in (serving, supervisor):
+            task.cancel()
+        await asyncio.gather(serving, supervisor, return_exceptions=True)
+        await pool.stop()
+        await bot.session.close()
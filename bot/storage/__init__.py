@@ -0,0 +1,4 @@
+from bot.storage.base import ExpiringStorage  # noqa: F401
+from bot.storage.factory import build_fsm_storage  # noqa: F401
+from bot.storage.postgres import PostgresStorage  # noqa: F401
+from bot.storage.sqlite import SqliteStorage  # noqa: F401
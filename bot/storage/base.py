@@ -0,0 +1,43 @@
+import asyncio
+import contextlib
+import logging
+from abc import abstractmethod
+
+from aiogram.fsm.storage.base import BaseStorage
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SECONDS = 600
+
+
+class ExpiringStorage(BaseStorage):
+    """FSM storage whose rows expire; a background task deletes the expired ones.
+
+    Purging runs off the request path, so no user's state write waits on it.
+    """
+
+    _purge_task: asyncio.Task | None = None
+
+    @abstractmethod
+    async def purge_expired(self) -> None:
+        raise NotImplementedError
+
+    async def start_purging(self) -> None:
+        if self._purge_task is None:
+            self._purge_task = asyncio.create_task(self._purge_periodically())
+
+    async def stop_purging(self) -> None:
+        if self._purge_task is None:
+            return
+        task, self._purge_task = self._purge_task, None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def _purge_periodically(self) -> None:
+        while True:
+            try:
+                await self.purge_expired()
+            except Exception:
+                logger.exception("Failed to purge expired FSM states")
+            await asyncio.sleep(PURGE_INTERVAL_SECONDS)
@@ -0,0 +1,30 @@
+import json
+import zlib
+from typing import Any, Mapping
+
+COMPRESS_THRESHOLD = 512
+
+_PLAIN = b"j"
+_ZLIB = b"z"
+
+
+def encode_data(data: Mapping[str, Any]) -> bytes | None:
+    if not data:
+        return None
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(raw) >= COMPRESS_THRESHOLD:
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) < len(raw):
+            return _ZLIB + compressed
+    return _PLAIN + raw
+
+
+def decode_data(payload: bytes | None) -> dict[str, Any]:
+    if not payload:
+        return {}
+    marker, body = payload[:1], payload[1:]
+    if marker == _ZLIB:
+        body = zlib.decompress(body)
+    elif marker != _PLAIN:
+        raise ValueError(f"Unknown FSM payload marker: {marker!r}")
+    return json.loads(body)
@@ -0,0 +1,15 @@
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.storage.postgres import PostgresStorage
+from bot.storage.sqlite import SqliteStorage
+from core.settings_app import AppSettings
+from db.session import engine
+
+
+def build_fsm_storage(settings: AppSettings) -> BaseStorage:
+    if settings.fsm_storage == "postgres":
+        return PostgresStorage(engine, ttl_seconds=settings.fsm_ttl_seconds)
+    if settings.fsm_storage == "sqlite":
+        return SqliteStorage(settings.fsm_sqlite_path, ttl_seconds=settings.fsm_ttl_seconds)
+    return MemoryStorage()
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.storage.base import ExpiringStorage
+from bot.storage.codec import decode_data, encode_data
+from db.models.fsm_state import FsmState
+
+
+class PostgresStorage(ExpiringStorage):
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        ttl_seconds: int,
+        key_builder: KeyBuilder | None = None,
+    ) -> None:
+        self._engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+        self._table = FsmState.__table__
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        value = state.state if isinstance(state, State) else state
+        await self._upsert(key, "state", value)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        row = await self._fetch(key, self._table.c.state)
+        return None if row is None else row[0]
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._upsert(key, "data", encode_data(data))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        row = await self._fetch(key, self._table.c.data)
+        return {} if row is None else decode_data(row[0])
+
+    async def purge_expired(self) -> None:
+        async with self._engine.connect() as connection:
+            await connection.execute(
+                delete(self._table).where(self._table.c.expires_at <= datetime.now(timezone.utc))
+            )
+
+    async def close(self) -> None:
+        return None
+
+    async def _fetch(self, key: StorageKey, column: Any) -> Any:
+        async with self._engine.connect() as connection:
+            result = await connection.execute(
+                select(column).where(
+                    self._table.c.key == self._key_builder.build(key),
+                    self._table.c.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            return result.first()
+
+    async def _upsert(self, key: StorageKey, column: str, value: Any) -> None:
+        other = "data" if column == "state" else "state"
+        now = datetime.now(timezone.utc)
+        statement = pg_insert(self._table).values(
+            {"key": self._key_builder.build(key), column: value, "expires_at": now + self._ttl}
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[self._table.c.key],
+            set_={
+                column: statement.excluded[column],
+                other: case((self._table.c.expires_at <= now, None), else_=self._table.c[other]),
+                "expires_at": statement.excluded.expires_at,
+            },
+        )
+        async with self._engine.connect() as connection:
+            await connection.execute(statement)
@@ -0,0 +1,90 @@
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Mapping, TypeVar
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+
+from bot.storage.base import ExpiringStorage
+from bot.storage.codec import decode_data, encode_data
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fsm_states (
+    key TEXT PRIMARY KEY,
+    state TEXT,
+    data BLOB,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class SqliteStorage(ExpiringStorage):
+    """FSM storage in a local SQLite file.
+
+    sqlite3 calls block, so they run on one dedicated thread: the event loop
+    never waits on disk, and the connection is never used by two threads at once.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl_seconds: int,
+        key_builder: KeyBuilder | None = None,
+    ) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+        self._ttl = ttl_seconds
+        self._key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fsm-sqlite")
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        value = state.state if isinstance(state, State) else state
+        await self._run(self._upsert, key, "state", value)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        row = await self._run(self._fetch, key, "state")
+        return None if row is None else row[0]
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._run(self._upsert, key, "data", encode_data(data))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        row = await self._run(self._fetch, key, "data")
+        return {} if row is None else decode_data(row[0])
+
+    async def purge_expired(self) -> None:
+        await self._run(
+            self._connection.execute, "DELETE FROM fsm_states WHERE expires_at <= ?", (time.time(),)
+        )
+
+    async def close(self) -> None:
+        await self._run(self._connection.close)
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _fetch(self, key: StorageKey, column: str) -> tuple[Any] | None:
+        return self._connection.execute(
+            f"SELECT {column} FROM fsm_states WHERE key = ? AND expires_at > ?",
+            (self._key_builder.build(key), time.time()),
+        ).fetchone()
+
+    def _upsert(self, key: StorageKey, column: str, value: Any) -> None:
+        other = "data" if column == "state" else "state"
+        now = time.time()
+        self._connection.execute(
+            f"INSERT INTO fsm_states (key, {column}, expires_at) VALUES (?, ?, ?) "
+            f"ON CONFLICT (key) DO UPDATE SET {column} = excluded.{column}, "
+            f"{other} = CASE WHEN fsm_states.expires_at <= ? THEN NULL ELSE fsm_states.{other} END, "
+            "expires_at = excluded.expires_at",
+            (self._key_builder.build(key), value, now + self._ttl, now),
+        )
@@ -0,0 +1,35 @@
+from contextvars import ContextVar
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery
+
+
+class CallbackAck:
+    __slots__ = ("callback", "answered")
+
+    def __init__(self, callback: CallbackQuery) -> None:
+        self.callback = callback
+        self.answered = False
+
+    async def answer(self, text: str | None = None, show_alert: bool | None = None) -> None:
+        if self.answered:
+            return
+        self.answered = True
+        try:
+            await self.callback.answer(text=text, show_alert=show_alert)
+        except TelegramBadRequest:
+            return
+
+
+current_ack: ContextVar[CallbackAck | None] = ContextVar("current_ack", default=None)
+
+
+async def safe_callback_answer(
+    callback: CallbackQuery,
+    text: str | None = None,
+    show_alert: bool | None = None,
+) -> None:
+    ack = current_ack.get()
+    if ack is None or ack.callback.id != callback.id:
+        ack = CallbackAck(callback)
+    await ack.answer(text=text, show_alert=show_alert)
@@ -1,5 +1,23 @@
 import base64
+import binascii
+import struct
 import uuid
+from typing import Any
+
+from aiogram.filters import Filter
+from aiogram.types import CallbackQuery
+
+CALLBACK_DATA_MAX_LENGTH = 64
+CALLBACK_DATA_VERSION = 1
+CALLBACK_DATA_MARKER = "~"
+
+_HEADER = struct.Struct(">BH")
+_FIELD_FORMATS = {"uuid": "16s", "u8": "B", "u16": "H", "u32": "I"}
+_actions: dict[int, "CallbackAction"] = {}
+
+
+class CallbackDataError(ValueError):
+    pass
 
 
 def encode_uuid(value: uuid.UUID | str) -> str:
@@ -11,3 +29,122 @@ def encode_uuid(value: uuid.UUID | str) -> str:
 def decode_uuid(value: str) -> uuid.UUID:
     padding = "=" * ((4 - len(value) % 4) % 4)
     return uuid.UUID(bytes=base64.urlsafe_b64decode(value + padding))
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    padding = "=" * ((4 - len(value) % 4) % 4)
+    try:
+        return base64.urlsafe_b64decode(value + padding)
+    except (binascii.Error, ValueError) as exc:
+        raise CallbackDataError("malformed callback payload") from exc
+
+
+class CallbackAction:
+    """Typed callback payload: version byte, action code and packed fields.
+
+    Packed data is ``~`` followed by unpadded urlsafe base64. The 3-byte header
+    encodes to exactly four characters, so every action has a stable string
+    ``prefix`` that routers can match with ``F.data.startswith``.
+    """
+
+    def __init__(self, code: int, *fields: str) -> None:
+        if not 0 < code <= 0xFFFF:
+            raise ValueError(f"Callback action code out of range: {code}")
+        if code in _actions:
+            raise ValueError(f"Callback action code already registered: {code}")
+        unknown = [field for field in fields if field not in _FIELD_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown callback field types: {unknown}")
+        self.code = code
+        self.fields = fields
+        self._struct = struct.Struct(
+            _HEADER.format + "".join(_FIELD_FORMATS[field] for field in fields)
+        )
+        self._uuid_positions = frozenset(
+            idx for idx, field in enumerate(fields) if field == "uuid"
+        )
+        self.prefix = CALLBACK_DATA_MARKER + _b64encode(
+            _HEADER.pack(CALLBACK_DATA_VERSION, code)
+        )
+        length = len(CALLBACK_DATA_MARKER) + -(-self._struct.size * 4 // 3)
+        if length > CALLBACK_DATA_MAX_LENGTH:
+            raise ValueError(
+                f"Callback action {code} needs {length} bytes, "
+                f"limit is {CALLBACK_DATA_MAX_LENGTH}"
+            )
+        _actions[code] = self
+
+    def pack(self, *values: Any) -> str:
+        if len(values) != len(self.fields):
+            raise CallbackDataError(
+                f"Callback action {self.code} expects {len(self.fields)} values"
+            )
+        packed: list[Any] = []
+        for idx, value in enumerate(values):
+            if idx in self._uuid_positions:
+                value = (value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))).bytes
+            packed.append(value)
+        try:
+            raw = self._struct.pack(CALLBACK_DATA_VERSION, self.code, *packed)
+        except struct.error as exc:
+            raise CallbackDataError(str(exc)) from exc
+        return CALLBACK_DATA_MARKER + _b64encode(raw)
+
+    def unpack(self, data: str | None) -> tuple[Any, ...]:
+        if not data or not data.startswith(self.prefix):
+            raise CallbackDataError(f"Not a callback for action {self.code}")
+        return self._unpack_raw(_b64decode(data[len(CALLBACK_DATA_MARKER):]))
+
+    def filter(self) -> "CallbackActionFilter":
+        return CallbackActionFilter(self)
+
+    def _unpack_raw(self, raw: bytes) -> tuple[Any, ...]:
+        if len(raw) != self._struct.size:
+            raise CallbackDataError(f"Bad payload size for action {self.code}")
+        values = self._struct.unpack(raw)[2:]
+        if not self._uuid_positions:
+            return values
+        return tuple(
+            uuid.UUID(bytes=value) if idx in self._uuid_positions else value
+            for idx, value in enumerate(values)
+        )
+
+
+class CallbackActionFilter(Filter):
+    """Matches callbacks of one action and passes the unpacked values as ``payload``.
+
+    A payload that carries the action's prefix but does not unpack does not
+    match, so it reaches the stale-button fallback instead of a handler.
+    """
+
+    def __init__(self, action: CallbackAction) -> None:
+        self.action = action
+
+    @property
+    def prefix(self) -> str:
+        return self.action.prefix
+
+    async def __call__(self, callback: CallbackQuery) -> bool | dict[str, Any]:
+        try:
+            return {"payload": self.action.unpack(callback.data)}
+        except CallbackDataError:
+            return False
+
+
+def decode_callback(data: str | None) -> tuple[CallbackAction, tuple[Any, ...]]:
+    if not data or not data.startswith(CALLBACK_DATA_MARKER):
+        raise CallbackDataError("Not a packed callback payload")
+    raw = _b64decode(data[len(CALLBACK_DATA_MARKER):])
+    if len(raw) < _HEADER.size:
+        raise CallbackDataError("Truncated callback payload")
+    version, code = _HEADER.unpack_from(raw)
+    if version != CALLBACK_DATA_VERSION:
+        raise CallbackDataError(f"Unsupported callback payload version: {version}")
+    action = _actions.get(code)
+    if action is None:
+        raise CallbackDataError(f"Unknown callback action: {code}")
+    return action, action._unpack_raw(raw)
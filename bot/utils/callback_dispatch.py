@@ -0,0 +1,161 @@
+import operator
+from typing import Any
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import UNHANDLED, SkipHandler
+from aiogram.dispatcher.event.handler import CallbackType, HandlerObject
+from aiogram.dispatcher.event.telegram import TelegramEventObserver
+from aiogram.types import TelegramObject
+from magic_filter import MagicFilter
+from magic_filter.operations import (
+    CallOperation,
+    ComparatorOperation,
+    FunctionOperation,
+    GetAttributeOperation,
+)
+from magic_filter.util import in_op
+
+from bot.utils.callback_data import CallbackActionFilter
+
+
+class _PrefixTrie:
+    __slots__ = ("children", "positions")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _PrefixTrie] = {}
+        self.positions: list[int] = []
+
+    def insert(self, prefix: str, position: int) -> None:
+        node = self
+        for char in prefix:
+            node = node.children.setdefault(char, _PrefixTrie())
+        node.positions.append(position)
+
+    def matches(self, value: str) -> list[int]:
+        found = list(self.positions)
+        node = self
+        for char in value:
+            node = node.children.get(char)
+            if node is None:
+                break
+            found.extend(node.positions)
+        return found
+
+
+def _callback_data_keys(filter_: Any) -> tuple[str, tuple[str, ...]] | None:
+    """Return ("exact", values) or ("prefix", (prefix,)) for F.data filters."""
+    if isinstance(filter_, CallbackActionFilter):
+        return "prefix", (filter_.prefix,)
+    if not isinstance(filter_, MagicFilter):
+        return None
+    operations = filter_._operations
+    if len(operations) < 2:
+        return None
+    head, *rest = operations
+    if not isinstance(head, GetAttributeOperation) or head.name != "data":
+        return None
+
+    if len(rest) == 1:
+        operation = rest[0]
+        if (
+            isinstance(operation, ComparatorOperation)
+            and operation.comparator is operator.eq
+            and isinstance(operation.right, str)
+        ):
+            return "exact", (operation.right,)
+        if (
+            isinstance(operation, FunctionOperation)
+            and operation.function is in_op
+            and len(operation.args) == 1
+            and not operation.kwargs
+            and all(isinstance(value, str) for value in operation.args[0])
+        ):
+            return "exact", tuple(operation.args[0])
+    elif len(rest) == 2:
+        attribute, call = rest
+        if (
+            isinstance(attribute, GetAttributeOperation)
+            and attribute.name == "startswith"
+            and isinstance(call, CallOperation)
+            and len(call.args) == 1
+            and not call.kwargs
+            and isinstance(call.args[0], str)
+        ):
+            return "prefix", (call.args[0],)
+    return None
+
+
+class IndexedCallbackObserver(TelegramEventObserver):
+    """callback_query observer that only checks handlers whose F.data filter can match.
+
+    Handlers filtered by ``F.data == ...``, ``F.data.in_(...)`` or
+    ``F.data.startswith(...)`` are indexed by exact value and in a prefix trie;
+    any other handler is always a candidate. Candidates are checked in
+    registration order with all their filters, so matching behaves exactly like
+    the stock observer. trigger() mirrors TelegramEventObserver.trigger of the
+    aiogram version pinned in requirements.txt; recheck it when bumping.
+    """
+
+    def __init__(self, router: Router, event_name: str = "callback_query") -> None:
+        super().__init__(router=router, event_name=event_name)
+        self._exact: dict[str, list[int]] = {}
+        self._prefixes = _PrefixTrie()
+        self._unindexed: list[int] = []
+
+    def register(
+        self,
+        callback: CallbackType,
+        *filters: CallbackType,
+        flags: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> CallbackType:
+        result = super().register(callback, *filters, flags=flags, **kwargs)
+        self._index(len(self.handlers) - 1, filters)
+        return result
+
+    def candidates(self, data: str | None) -> list[HandlerObject]:
+        if data is None:
+            positions = self._unindexed
+        else:
+            positions = sorted(
+                {*self._exact.get(data, ()), *self._prefixes.matches(data), *self._unindexed}
+            )
+        return [self.handlers[position] for position in positions]
+
+    async def trigger(self, event: TelegramObject, **kwargs: Any) -> Any:
+        for handler in self.candidates(getattr(event, "data", None)):
+            kwargs["handler"] = handler
+            result, data = await handler.check(event, **kwargs)
+            if result:
+                kwargs.update(data)
+                try:
+                    wrapped_inner = self.outer_middleware.wrap_middlewares(
+                        self._resolve_middlewares(),
+                        handler.call,
+                    )
+                    return await wrapped_inner(event, kwargs)
+                except SkipHandler:
+                    continue
+
+        return UNHANDLED
+
+    def _index(self, position: int, filters: tuple[CallbackType, ...]) -> None:
+        for filter_ in filters:
+            keys = _callback_data_keys(filter_)
+            if keys is None:
+                continue
+            kind, values = keys
+            for value in values:
+                if kind == "exact":
+                    self._exact.setdefault(value, []).append(position)
+                else:
+                    self._prefixes.insert(value, position)
+            return
+        self._unindexed.append(position)
+
+
+class IndexedRouter(Router):
+    def __init__(self, *, name: str | None = None) -> None:
+        super().__init__(name=name)
+        self.callback_query = IndexedCallbackObserver(router=self)
+        self.observers["callback_query"] = self.callback_query
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, TypeVar
+
+from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardMarkup
+
+Markup = InlineKeyboardMarkup | ReplyKeyboardMarkup
+M = TypeVar("M", bound=Markup)
+
+KEYBOARD_CACHE_MAX_SIZE = 512
+
+
+class KeyboardRegistry:
+    """Shares keyboard markups between sends and keeps their serialized JSON.
+
+    Markups handed out by the registry are shared and must not be mutated.
+    """
+
+    def __init__(self, max_size: int = KEYBOARD_CACHE_MAX_SIZE) -> None:
+        self._max_size = max_size
+        self._cached: OrderedDict[Hashable, Markup] = OrderedDict()
+        # Markups compare by value and all hash alike, so entries are found by
+        # id() and hold the markup itself: a lookup only hits for that object.
+        self._serialized: dict[int, tuple[Markup, str | None]] = {}
+
+    def static(self, builder: Callable[[], M]) -> Callable[[], M]:
+        markup = builder()
+        self._register(markup)
+
+        @wraps(builder)
+        def get() -> M:
+            return markup
+
+        return get
+
+    def cached(self, builder: Callable[..., M]) -> Callable[..., M]:
+        @wraps(builder)
+        def get(*args: Any, **kwargs: Any) -> M:
+            key = (
+                builder,
+                tuple(_freeze(arg) for arg in args),
+                tuple(sorted((name, _freeze(value)) for name, value in kwargs.items())),
+            )
+            markup = self._cached.get(key)
+            if markup is not None:
+                self._cached.move_to_end(key)
+                return markup
+            markup = builder(*args, **kwargs)
+            self._cached[key] = markup
+            self._register(markup)
+            while len(self._cached) > self._max_size:
+                _, evicted = self._cached.popitem(last=False)
+                self._serialized.pop(id(evicted), None)
+            return markup
+
+        return get
+
+    def serialized(self, markup: Any, dump: Callable[[Markup], str]) -> str | None:
+        """Return the JSON of a registry markup, dumping it on first use.
+
+        dump should be the session's own serializer, so the cached JSON is
+        exactly what the session would have sent.
+        """
+        entry = self._serialized.get(id(markup))
+        if entry is None or entry[0] is not markup:
+            return None
+        if entry[1] is None:
+            entry = (markup, dump(markup))
+            self._serialized[id(markup)] = entry
+        return entry[1]
+
+    def _register(self, markup: Markup) -> None:
+        self._serialized[id(markup)] = (markup, None)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+keyboard_registry = KeyboardRegistry()
@@ -0,0 +1,114 @@
+import asyncio
+import hmac
+import logging
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
+
+from bot.middlewares.scheduler import SchedulerMetrics
+from core.settings_app import AppSettings
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+logger = logging.getLogger(__name__)
+
+UpdateFeed = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+class WebhookHandler:
+    def __init__(self, feed: UpdateFeed, secret_token: str, max_concurrency: int) -> None:
+        if not secret_token:
+            raise ValueError("Webhook secret token is required")
+        self._feed = feed
+        self._secret_token = secret_token
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def __call__(self, request: web.Request) -> web.Response:
+        received = request.headers.get(SECRET_TOKEN_HEADER, "")
+        if not hmac.compare_digest(received, self._secret_token):
+            return web.Response(status=401)
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+        if not isinstance(payload, dict):
+            return web.Response(status=400)
+
+        await self._slots.acquire()
+        task = asyncio.create_task(self._process(payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return web.Response()
+
+    async def drain(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _process(self, payload: dict[str, Any]) -> None:
+        try:
+            await self._feed(payload)
+        except Exception:
+            logger.exception("Webhook update failed", extra={"update_id": payload.get("update_id")})
+        finally:
+            self._slots.release()
+
+
+def build_webhook_app(
+    handler: WebhookHandler,
+    path: str,
+    metrics: SchedulerMetrics | None = None,
+) -> web.Application:
+    app = web.Application()
+    app.router.add_post(path, handler)
+    if metrics is not None:
+
+        async def render_metrics(_: web.Request) -> web.Response:
+            return web.Response(text=metrics.render(), content_type="text/plain")
+
+        app.router.add_get("/metrics", render_metrics)
+
+    async def on_shutdown(_: web.Application) -> None:
+        await handler.drain()
+
+    app.on_shutdown.append(on_shutdown)
+    return app
+
+
+async def serve(app: web.Application, host: str, port: int) -> None:
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=host, port=port)
+    await site.start()
+    logger.info("Webhook server listening on %s:%s", host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def run_webhook(
+    bot: Bot,
+    dp: Dispatcher,
+    settings: AppSettings,
+    feed: UpdateFeed | None = None,
+) -> None:
+    app_feed = feed or partial(dp.feed_raw_update, bot)
+    handler = WebhookHandler(app_feed, settings.webhook_secret, settings.webhook_max_concurrency)
+    scheduler = dp.get("update_scheduler") if feed is None else None
+    app = build_webhook_app(handler, settings.webhook_path, scheduler.metrics if scheduler else None)
+    if feed is None:
+        # Updates are handled in this process, so it runs the dispatcher lifecycle.
+        setup_application(app, dp, bot=bot)
+
+    if settings.webhook_url:
+        await bot.set_webhook(
+            url=settings.webhook_url.rstrip("/") + settings.webhook_path,
+            secret_token=settings.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+
+    await serve(app, settings.webhook_host, settings.webhook_port)
@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-process LRU cache whose entries expire after ttl_seconds.
+
+    on_evict is called for entries dropped by expiry or by the size bound,
+    not for explicit pop().
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        on_evict: Callable[[K, V], None] | None = None,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+        self._on_evict = on_evict
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K) -> V | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._items[key]
+            if self._on_evict is not None:
+                self._on_evict(key, value)
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._items[key] = (time.monotonic() + self._ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_size:
+            evicted_key, (_, evicted) = self._items.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict(evicted_key, evicted)
+
+    def pop(self, key: K) -> V | None:
+        item = self._items.pop(key, None)
+        return None if item is None else item[1]
+
+    def clear(self) -> None:
+        self._items.clear()
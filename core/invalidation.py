@@ -0,0 +1,41 @@
+import logging
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+Publisher = Callable[[str, Hashable], None]
+
+
+class InvalidationBus:
+    """Routes cache invalidations to local caches and to sibling workers.
+
+    Services subscribe one handler per topic and call invalidate() after a
+    commit. Without a publisher (a single process) invalidation stays local;
+    the shard supervisor installs one in every worker so the other workers
+    drop the same entries.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, Callable[[Any], None]] = {}
+        self._publisher: Publisher | None = None
+
+    def subscribe(self, topic: str, handler: Callable[[Any], None]) -> None:
+        self._handlers[topic] = handler
+
+    def set_publisher(self, publisher: Publisher | None) -> None:
+        self._publisher = publisher
+
+    def invalidate(self, topic: str, key: Hashable) -> None:
+        self.apply(topic, key)
+        if self._publisher is not None:
+            self._publisher(topic, key)
+
+    def apply(self, topic: str, key: Hashable) -> None:
+        handler = self._handlers.get(topic)
+        if handler is None:
+            logger.warning("No cache registered for invalidation topic %s", topic)
+            return
+        handler(key)
+
+
+invalidation_bus = InvalidationBus()
@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +8,28 @@ class AppSettings(BaseSettings):
     bot_token: str
     default_timezone: str = "Europe/Belgrade"
 
+    bot_mode: Literal["polling", "webhook"] = "polling"
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = Field(default=8080, ge=1, le=65535)
+    webhook_path: str = Field(default="/telegram/webhook", pattern=r"^/")
+    webhook_url: str | None = None
+    webhook_secret: str | None = Field(default=None, pattern=r"^[A-Za-z0-9_-]{1,256}$")
+    webhook_max_concurrency: int = Field(default=32, ge=1)
+
+    # None: DB_POOL_SIZE + DB_MAX_OVERFLOW, see bot.main.build_dispatcher.
+    scheduler_max_concurrency: int | None = Field(default=None, ge=1)
+    scheduler_max_backlog: int = Field(default=1000, ge=0)
+    scheduler_report_interval_seconds: float = Field(default=60, ge=0)
+
+    callback_answer_delay_seconds: float = Field(default=0, ge=0)
+
+    bot_workers: int = Field(default=1, ge=1)
+    worker_max_concurrency: int = Field(default=32, ge=1)
+
+    fsm_storage: Literal["memory", "postgres", "sqlite"] = "memory"
+    fsm_sqlite_path: str = "data/fsm.sqlite3"
+    fsm_ttl_seconds: int = Field(default=7 * 24 * 3600, gt=0)
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -12,5 +37,12 @@ class AppSettings(BaseSettings):
         case_sensitive=False,
     )
 
+    @model_validator(mode="after")
+    def require_webhook_secret(self) -> "AppSettings":
+        # The webhook endpoint is public; the secret is what keeps forged updates out.
+        if self.bot_mode == "webhook" and not self.webhook_secret:
+            raise ValueError("WEBHOOK_SECRET is required when BOT_MODE=webhook")
+        return self
+
 
 app_settings = AppSettings()
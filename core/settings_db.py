@@ -1,5 +1,7 @@
+from typing import Any
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import Field, model_validator
 
 ASYNC_DRIVER_PREFIX = "postgresql+asyncpg://"
 
@@ -12,6 +14,21 @@ class DbSettings(BaseSettings):
     db_user: str = Field(validation_alias="DB_USER")
     db_password: str = Field(validation_alias="DB_PASSWORD")
 
+    db_pool_size: int = Field(default=10, ge=1, le=200, validation_alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, ge=0, le=200, validation_alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=10.0, gt=0, validation_alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, ge=-1, validation_alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=True, validation_alias="DB_POOL_PRE_PING")
+    db_pool_warmup: int = Field(default=2, ge=0, validation_alias="DB_POOL_WARMUP")
+    db_statement_cache_size: int = Field(default=100, ge=0, validation_alias="DB_STATEMENT_CACHE_SIZE")
+    db_prepared_statement_cache_size: int = Field(
+        default=100, ge=0, validation_alias="DB_PREPARED_STATEMENT_CACHE_SIZE"
+    )
+    db_seq_block_size: int = Field(default=0, ge=0, validation_alias="DB_SEQ_BLOCK_SIZE")
+    db_seq_block_hot_threshold: int = Field(
+        default=20, ge=0, validation_alias="DB_SEQ_BLOCK_HOT_THRESHOLD"
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -20,6 +37,25 @@ class DbSettings(BaseSettings):
         populate_by_name=True,
     )
 
+    @model_validator(mode="after")
+    def check_pool_warmup(self) -> "DbSettings":
+        if self.db_pool_warmup > self.db_pool_size:
+            raise ValueError("DB_POOL_WARMUP must not exceed DB_POOL_SIZE")
+        return self
+
+    def get_engine_options(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.db_pool_size,
+            "max_overflow": self.db_max_overflow,
+            "pool_timeout": self.db_pool_timeout,
+            "pool_recycle": self.db_pool_recycle,
+            "pool_pre_ping": self.db_pool_pre_ping,
+            "connect_args": {
+                "statement_cache_size": self.db_statement_cache_size,
+                "prepared_statement_cache_size": self.db_prepared_statement_cache_size,
+            },
+        }
+
     def get_async_database_url(self) -> str:
         if self.database_url:
             return self._normalize_database_url(self.database_url)
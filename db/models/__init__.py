@@ -3,6 +3,7 @@ from db.models.budget_counter import BudgetCounter  # noqa: F401
 from db.models.budget_invite import BudgetInvite  # noqa: F401
 from db.models.budget_membership import BudgetMembership  # noqa: F401
 from db.models.category import Category  # noqa: F401
+from db.models.fsm_state import FsmState  # noqa: F401
 from db.models.goal import Goal  # noqa: F401
 from db.models.transaction import Transaction  # noqa: F401
 from db.models.transaction_audit import TransactionAudit  # noqa: F401
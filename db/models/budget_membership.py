@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Text, UniqueConstraint, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Text, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -13,6 +13,26 @@ class BudgetMembership(Base):
         UniqueConstraint("budget_id", "user_id", name="uq_budget_memberships_budget_user"),
         Index("idx_budget_memberships_budget_id", "budget_id"),
         Index("idx_budget_memberships_user_id", "user_id"),
+        Index(
+            "idx_budget_memberships_user_active",
+            "user_id",
+            "budget_id",
+            postgresql_include=["role"],
+            postgresql_where=text("is_active IS TRUE"),
+        ),
+        Index(
+            "idx_budget_memberships_budget_active",
+            "budget_id",
+            "user_id",
+            postgresql_include=["role"],
+            postgresql_where=text("is_active IS TRUE"),
+        ),
+        Index(
+            "idx_budget_memberships_owner_active",
+            "user_id",
+            "budget_id",
+            postgresql_where=text("is_active IS TRUE AND role = 'owner'"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
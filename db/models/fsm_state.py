@@ -0,0 +1,16 @@
+from sqlalchemy import DateTime, Index, LargeBinary, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+class FsmState(Base):
+    __tablename__ = "fsm_states"
+    __table_args__ = (
+        Index("idx_fsm_states_expires_at", "expires_at"),
+    )
+
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    state: Mapped[str | None] = mapped_column(Text, nullable=True)
+    data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    expires_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -23,6 +23,7 @@ class Transaction(Base):
     __tablename__ = "transactions"
     __table_args__ = (
         UniqueConstraint("budget_id", "seq_no", name="uq_transactions_budget_seq_no"),
+        UniqueConstraint("idempotency_key", name="uq_transactions_idempotency_key"),
         CheckConstraint(
             "(type IN ('goal_deposit', 'goal_withdraw') AND goal_id IS NOT NULL) "
             "OR (type NOT IN ('goal_deposit', 'goal_withdraw') AND goal_id IS NULL)",
@@ -40,8 +41,8 @@ class Transaction(Base):
     type: Mapped[str] = mapped_column(Text, nullable=False)
     amount: Mapped[Numeric] = mapped_column(Numeric(14, 2), nullable=False)
     currency: Mapped[str] = mapped_column(CHAR(3), nullable=False)
-    amount_base: Mapped[Numeric] = mapped_column(Numeric(14, 2), nullable=False)
-    fx_rate: Mapped[Numeric] = mapped_column(Numeric(18, 8), nullable=False)
+    amount_base: Mapped[Numeric | None] = mapped_column(Numeric(14, 2), nullable=True)
+    fx_rate: Mapped[Numeric | None] = mapped_column(Numeric(18, 8), nullable=True)
     fx_date: Mapped[Date] = mapped_column(Date, nullable=False)
     occurred_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
     local_date: Mapped[Date] = mapped_column(Date, nullable=False)
@@ -62,3 +63,4 @@ class Transaction(Base):
     telegram_file_id: Mapped[str | None] = mapped_column(Text, nullable=True)
     raw_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     parsed_payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    idempotency_key: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
@@ -1,12 +1,29 @@
+import asyncio
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from core.settings_db import db_settings
 
 
-engine = create_async_engine(db_settings.get_async_database_url(), echo=False)
+engine = create_async_engine(
+    db_settings.get_async_database_url(),
+    echo=False,
+    **db_settings.get_engine_options(),
+)
 
 SessionMaker = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+
+
+async def warm_up_pool(connections: int = db_settings.db_pool_warmup) -> None:
+    if connections <= 0:
+        return
+    opened = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+    try:
+        await asyncio.gather(*(connection.execute(text("SELECT 1")) for connection in opened))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in opened))
@@ -0,0 +1,34 @@
+"""add fsm states
+
+Revision ID: 0004_add_fsm_states
+Revises: 0003_add_active_budget_id
+Create Date: 2026-02-02 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004_add_fsm_states"
+down_revision: Union[str, None] = "0003_add_active_budget_id"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fsm_states",
+        sa.Column("key", sa.Text(), nullable=False),
+        sa.Column("state", sa.Text(), nullable=True),
+        sa.Column("data", sa.LargeBinary(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("idx_fsm_states_expires_at", "fsm_states", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_fsm_states_expires_at", table_name="fsm_states")
+    op.drop_table("fsm_states")
@@ -0,0 +1,67 @@
+"""add membership partial indexes
+
+Revision ID: 0005_membership_indexes
+Revises: 0004_add_fsm_states
+Create Date: 2026-02-03 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005_membership_indexes"
+down_revision: Union[str, None] = "0004_add_fsm_states"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_budget_memberships_user_active",
+            "budget_memberships",
+            ["user_id", "budget_id"],
+            unique=False,
+            postgresql_include=["role"],
+            postgresql_where=sa.text("is_active IS TRUE"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_budget_memberships_budget_active",
+            "budget_memberships",
+            ["budget_id", "user_id"],
+            unique=False,
+            postgresql_include=["role"],
+            postgresql_where=sa.text("is_active IS TRUE"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_budget_memberships_owner_active",
+            "budget_memberships",
+            ["user_id", "budget_id"],
+            unique=False,
+            postgresql_where=sa.text("is_active IS TRUE AND role = 'owner'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_budget_memberships_owner_active",
+            table_name="budget_memberships",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_budget_memberships_budget_active",
+            table_name="budget_memberships",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_budget_memberships_user_active",
+            table_name="budget_memberships",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,56 @@
+"""add transaction idempotency key, allow transactions without a base amount
+
+Revision ID: 0006_transaction_idempotency_key
+Revises: 0005_membership_indexes
+Create Date: 2026-02-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0006_transaction_idempotency_key"
+down_revision: Union[str, None] = "0005_membership_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "transactions",
+        sa.Column("idempotency_key", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    # Build the index without blocking writers, then attach it as the constraint.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_transactions_idempotency_key",
+            "transactions",
+            ["idempotency_key"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+    op.execute(
+        "ALTER TABLE transactions ADD CONSTRAINT uq_transactions_idempotency_key "
+        "UNIQUE USING INDEX uq_transactions_idempotency_key"
+    )
+    # Foreign-currency operations keep amount_base and fx_rate empty until a
+    # rate is known.
+    op.alter_column("transactions", "amount_base", existing_type=sa.Numeric(14, 2), nullable=True)
+    op.alter_column("transactions", "fx_rate", existing_type=sa.Numeric(18, 8), nullable=True)
+
+
+def downgrade() -> None:
+    unconverted = op.get_bind().execute(
+        sa.text("SELECT count(*) FROM transactions WHERE amount_base IS NULL OR fx_rate IS NULL")
+    ).scalar_one()
+    if unconverted:
+        raise RuntimeError(
+            f"{unconverted} transactions have no base amount; convert them before downgrading."
+        )
+    op.alter_column("transactions", "fx_rate", existing_type=sa.Numeric(18, 8), nullable=False)
+    op.alter_column("transactions", "amount_base", existing_type=sa.Numeric(14, 2), nullable=False)
+    op.drop_constraint("uq_transactions_idempotency_key", "transactions", type_="unique")
+    op.drop_column("transactions", "idempotency_key")
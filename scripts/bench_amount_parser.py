@@ -0,0 +1,70 @@
+"""Micro-benchmark services.amount_parser.parse_amount.
+
+Times every input of a fixed corpus (plain numbers, grouped thousands, k
+suffixes, currencies, arithmetic, rejected input) and reports microseconds
+per call. The "replace" baseline is the strip-and-Decimal normalizer the DTO
+used before, and it only understands the plain inputs.
+
+Usage:
+    python -m scripts.bench_amount_parser --iterations 100000
+"""
+import argparse
+import time
+from decimal import Decimal, InvalidOperation
+
+from services.amount_parser import AmountParseError, parse_amount
+
+CORPUS = (
+    "350",
+    "12,5",
+    "1 200,50",
+    "1.200,50",
+    "1,200.50",
+    "12.5k",
+    "15€",
+    "200 rsd",
+    "120+35.5",
+    "-1 200 + 35,5 eur",
+    "12 5",
+    "abc",
+)
+
+
+def replace_normalizer(text: str) -> Decimal | None:
+    try:
+        return Decimal(text.replace(" ", "").replace(",", ".")).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        return None
+
+
+def parse_or_none(text: str) -> Decimal | None:
+    try:
+        return parse_amount(text).amount
+    except AmountParseError:
+        return None
+
+
+def per_call_us(func, text: str, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(text)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'input':<20} {'result':>22} {'parse':>9} {'replace':>9}")
+    for text in CORPUS:
+        result = parse_or_none(text)
+        print(
+            f"{text!r:<20} {str(result):>22} "
+            f"{per_call_us(parse_or_none, text, args.iterations):7.2f}us "
+            f"{per_call_us(replace_normalizer, text, args.iterations):7.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark callback dispatch cost against the number of menu items.
+
+Registers N handlers with F.data == ... (plus N / 10 prefix handlers) on a
+stock aiogram Router and on bot.utils.callback_dispatch.IndexedRouter, then
+feeds callback queries aimed at the last registered item through a Dispatcher.
+With the stock router the cost grows with N; with the index it stays flat.
+
+Usage:
+    python -m scripts.bench_callback_dispatch --sizes 10,50,200,1000 --iterations 2000
+"""
+import argparse
+import asyncio
+import time
+
+from aiogram import Bot, Dispatcher, F, Router
+from aiogram.types import CallbackQuery, Update
+
+from bot.utils.callback_dispatch import IndexedRouter
+
+BENCH_BOT_TOKEN = "123456:BENCH"
+
+
+async def noop(callback: CallbackQuery) -> None:
+    return None
+
+
+def build_dispatcher(router_class: type[Router], size: int) -> Dispatcher:
+    router = router_class()
+    for idx in range(size // 10):
+        router.callback_query.register(noop, F.data.startswith(f"section{idx}:"))
+    for idx in range(size):
+        router.callback_query.register(noop, F.data == f"menu:item:{idx}")
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+def make_update(data: str) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": 1,
+            "callback_query": {
+                "id": "1",
+                "from": {"id": 1, "is_bot": False, "first_name": "Bench"},
+                "chat_instance": "bench",
+                "data": data,
+            },
+        }
+    )
+
+
+async def measure(dp: Dispatcher, bot: Bot, update: Update, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await dp.feed_update(bot, update)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,50,200,1000")
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    bot = Bot(token=BENCH_BOT_TOKEN)
+    for size in (int(value) for value in args.sizes.split(",")):
+        update = make_update(f"menu:item:{size - 1}")
+        stock = await measure(build_dispatcher(Router, size), bot, update, args.iterations)
+        indexed = await measure(build_dispatcher(IndexedRouter, size), bot, update, args.iterations)
+        print(f"items={size:>5} stock={stock:9.1f}us indexed={indexed:7.1f}us")
+    await bot.session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
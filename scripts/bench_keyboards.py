@@ -0,0 +1,98 @@
+"""Micro-benchmark keyboard building and serialization.
+
+For a mix of static and currency keyboards, compares building a fresh markup
+and serializing it with aiogram's stock session against the registry markups
+sent through PreserializedMarkupSession. Reports time per send and the peak
+memory allocated per send, measured with tracemalloc.
+
+Usage:
+    python -m scripts.bench_keyboards --iterations 20000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import EditMessageText
+
+from bot.features.main_menu.keyboards import (
+    BACK_TO_EXPENSE_AMOUNT,
+    EXPENSE_CURRENCY_PREFIX,
+    build_currency_keyboard,
+    build_expense_currency_keyboard,
+    build_goals_root_keyboard,
+    build_main_menu_keyboard,
+    build_reports_root_keyboard,
+)
+from bot.features.onboarding.keyboards import build_first_run_keyboard, build_timezone_keyboard
+from bot.features.settings.keyboards import build_settings_root_keyboard
+from bot.session import PreserializedMarkupSession
+
+BENCH_BOT_TOKEN = "123456:BENCH"
+CURRENCIES = ["RSD", "EUR", "USD"]
+
+STATIC_BUILDERS = (
+    build_main_menu_keyboard,
+    build_goals_root_keyboard,
+    build_reports_root_keyboard,
+    build_settings_root_keyboard,
+    build_first_run_keyboard,
+    build_timezone_keyboard,
+)
+
+
+def fresh_markups() -> list:
+    markups = [builder.__wrapped__() for builder in STATIC_BUILDERS]
+    markups.append(
+        build_currency_keyboard.__wrapped__(list(CURRENCIES), EXPENSE_CURRENCY_PREFIX, BACK_TO_EXPENSE_AMOUNT)
+    )
+    return markups
+
+
+def registry_markups() -> list:
+    markups = [builder() for builder in STATIC_BUILDERS]
+    markups.append(build_expense_currency_keyboard(list(CURRENCIES)))
+    return markups
+
+
+def send_all(session: AiohttpSession, bot: Bot, markups: Callable[[], list]) -> None:
+    for markup in markups():
+        method = EditMessageText(text="Главное меню", chat_id=1, message_id=1, reply_markup=markup)
+        session.build_form_data(bot, method)
+
+
+def measure(name: str, session: AiohttpSession, bot: Bot, markups: Callable[[], list], iterations: int) -> None:
+    sends = len(markups())
+    started = time.perf_counter()
+    for _ in range(iterations):
+        send_all(session, bot, markups)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(iterations, 1000)):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        send_all(session, bot, markups)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    per_send_us = elapsed / (iterations * sends) * 1_000_000
+    peak_kb = sum(peaks) / len(peaks) / sends / 1024
+    print(f"{name:<10} {per_send_us:8.2f}us/send  peak {peak_kb:7.2f}KiB/send")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    bot = Bot(token=BENCH_BOT_TOKEN)
+    measure("fresh", AiohttpSession(), bot, fresh_markups, args.iterations)
+    measure("registry", PreserializedMarkupSession(), bot, registry_markups, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
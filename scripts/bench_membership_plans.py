@@ -0,0 +1,166 @@
+"""Show query plans for the budget_memberships hot paths.
+
+Seeds users, budgets and memberships (a share of them inactive), runs
+VACUUM ANALYZE and prints the plan and execution time of each membership
+lookup used by the services twice: with the partial indexes from migration
+0005_membership_indexes, and with those indexes dropped inside a transaction
+that is rolled back afterwards.
+
+DROP INDEX takes an exclusive lock on budget_memberships while the comparison
+runs, so only point this at a local database.
+
+Usage (needs a database migrated to head from .env / .env.local):
+    python -m scripts.bench_membership_plans --users 50000 --members-per-budget 3
+"""
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from db.session import engine
+
+TELEGRAM_ID_BASE = 9_100_000_000
+PARTIAL_INDEXES = (
+    "idx_budget_memberships_user_active",
+    "idx_budget_memberships_budget_active",
+    "idx_budget_memberships_owner_active",
+)
+
+QUERIES: dict[str, str] = {
+    "user budgets": (
+        "SELECT budget_id, role FROM budget_memberships "
+        "WHERE user_id = :user_id AND is_active IS TRUE"
+    ),
+    "membership check": (
+        "SELECT budget_id FROM budget_memberships "
+        "WHERE user_id = :user_id AND budget_id = :budget_id AND is_active IS TRUE"
+    ),
+    "owner budget": (
+        "SELECT budget_id FROM budget_memberships "
+        "WHERE user_id = :user_id AND role = 'owner' AND is_active IS TRUE"
+    ),
+    "budget participants": (
+        "SELECT user_id, role FROM budget_memberships "
+        "WHERE budget_id = :budget_id AND is_active IS TRUE"
+    ),
+}
+
+SEED_SQL = (
+    """
+    INSERT INTO users (id, telegram_user_id, first_name)
+    SELECT gen_random_uuid(), :base + n, 'Bench'
+    FROM generate_series(1, :users) AS n
+    """,
+    """
+    INSERT INTO budgets (id, name, base_currency, timezone, created_by_user_id)
+    SELECT gen_random_uuid(), 'Bench ' || u.telegram_user_id, 'EUR', 'Europe/Belgrade', u.id
+    FROM users u
+    WHERE u.telegram_user_id > :base AND (u.telegram_user_id - :base - 1) % :members = 0
+    """,
+    """
+    INSERT INTO budget_memberships (id, budget_id, user_id, role, is_active)
+    SELECT gen_random_uuid(), b.id, u.id,
+           CASE WHEN u.id = b.created_by_user_id THEN 'owner' ELSE 'participant' END,
+           (u.telegram_user_id % 10) <> 0
+    FROM users u
+    JOIN users o ON o.telegram_user_id = :base + 1 + ((u.telegram_user_id - :base - 1) / :members) * :members
+    JOIN budgets b ON b.created_by_user_id = o.id
+    WHERE u.telegram_user_id > :base
+    """,
+)
+
+
+async def seed(users: int, members_per_budget: int) -> None:
+    async with engine.begin() as connection:
+        for statement in SEED_SQL:
+            await connection.execute(
+                text(statement),
+                {"base": TELEGRAM_ID_BASE, "users": users, "members": members_per_budget},
+            )
+    autocommit = engine.execution_options(isolation_level="AUTOCOMMIT")
+    async with autocommit.connect() as connection:
+        await connection.execute(text("VACUUM ANALYZE users, budgets, budget_memberships"))
+
+
+async def cleanup() -> None:
+    async with engine.begin() as connection:
+        seeded_users = "SELECT id FROM users WHERE telegram_user_id > :base"
+        params = {"base": TELEGRAM_ID_BASE}
+        await connection.execute(text(f"DELETE FROM budget_memberships WHERE user_id IN ({seeded_users})"), params)
+        await connection.execute(text(f"DELETE FROM budgets WHERE created_by_user_id IN ({seeded_users})"), params)
+        await connection.execute(text("DELETE FROM users WHERE telegram_user_id > :base"), params)
+
+
+async def sample_params(connection: AsyncConnection) -> dict[str, str]:
+    row = (
+        await connection.execute(
+            text(
+                "SELECT m.user_id, m.budget_id FROM budget_memberships m "
+                "JOIN users u ON u.id = m.user_id "
+                "WHERE u.telegram_user_id > :base AND m.role = 'owner' AND m.is_active IS TRUE "
+                "ORDER BY u.telegram_user_id DESC LIMIT 1"
+            ),
+            {"base": TELEGRAM_ID_BASE},
+        )
+    ).one()
+    return {"user_id": str(row.user_id), "budget_id": str(row.budget_id)}
+
+
+def plan_nodes(plan: dict) -> list[str]:
+    label = plan["Node Type"]
+    if "Index Name" in plan:
+        label = f"{label} using {plan['Index Name']}"
+    nodes = [label]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def explain(connection: AsyncConnection, sql: str, params: dict[str, str]) -> tuple[str, float]:
+    result = await connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params)
+    raw = result.scalar_one()
+    document = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    return " -> ".join(plan_nodes(document["Plan"])), document["Execution Time"]
+
+
+async def report(params: dict[str, str]) -> None:
+    async with engine.connect() as connection:
+        with_indexes = {name: await explain(connection, sql, params) for name, sql in QUERIES.items()}
+
+        transaction = await connection.begin()
+        try:
+            for index_name in PARTIAL_INDEXES:
+                await connection.execute(text(f"DROP INDEX {index_name}"))
+            without_indexes = {name: await explain(connection, sql, params) for name, sql in QUERIES.items()}
+        finally:
+            await transaction.rollback()
+
+    for name in QUERIES:
+        before_plan, before_ms = without_indexes[name]
+        after_plan, after_ms = with_indexes[name]
+        print(f"{name}")
+        print(f"  before {before_ms:8.3f}ms  {before_plan}")
+        print(f"  after  {after_ms:8.3f}ms  {after_plan}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--members-per-budget", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        await cleanup()
+        await seed(args.users, args.members_per_budget)
+        async with engine.connect() as connection:
+            params = await sample_params(connection)
+        await report(params)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
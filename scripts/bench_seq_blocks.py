@@ -0,0 +1,87 @@
+"""Benchmark writer throughput with per-row vs block-reserved seq_no allocation.
+
+"row" bumps budget_counters inside every insert statement, so all writers of
+one budget serialize on the counter row until COMMIT. "block" takes seq_no from
+services.seq_allocator.SeqBlockAllocator, which touches the counter once per
+block in its own short transaction. Every run writes to a single shared budget
+and checks that seq_no values are unique.
+
+Usage (needs a migrated database from .env / .env.local; keep
+DB_POOL_SIZE + DB_MAX_OVERFLOW at or above the highest writer count):
+    DB_POOL_SIZE=64 python -m scripts.bench_seq_blocks --operations 2000 --writers 1,8,64 --block-size 32
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import func, select
+
+from db.models.transaction import Transaction
+from db.session import SessionMaker, engine
+from scripts.bench_transaction_insert import _values, cleanup, reset, seed
+from services.seq_allocator import SeqBlockAllocator
+from services.transaction_service import build_insert_transaction
+
+
+async def run(
+    allocator: SeqBlockAllocator | None,
+    budget_id: uuid.UUID,
+    user_id: uuid.UUID,
+    operations: int,
+    writers: int,
+) -> float:
+    remaining = operations
+
+    async def writer() -> None:
+        nonlocal remaining
+        async with SessionMaker() as session:
+            while remaining > 0:
+                remaining -= 1
+                seq_no = await allocator.take(budget_id) if allocator is not None else None
+                await session.execute(build_insert_transaction(_values(budget_id, user_id), seq_no))
+                await session.commit()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(writers)))
+    return time.perf_counter() - started
+
+
+async def check(budget_id: uuid.UUID) -> str:
+    async with SessionMaker() as session:
+        result = await session.execute(
+            select(func.count(), func.count(func.distinct(Transaction.seq_no)), func.max(Transaction.seq_no))
+            .where(Transaction.budget_id == budget_id)
+        )
+        rows, distinct, highest = result.one()
+    status = "unique" if rows == distinct else "DUPLICATES"
+    return f"{status} gaps={highest - rows}"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--writers", default="1,8,64")
+    parser.add_argument("--block-size", type=int, default=32)
+    args = parser.parse_args()
+
+    try:
+        await cleanup()
+        budget_id, user_id = await seed()
+        for writers in (int(value) for value in args.writers.split(",")):
+            for mode in ("row", "block"):
+                await reset(budget_id)
+                allocator = SeqBlockAllocator(args.block_size) if mode == "block" else None
+                elapsed = await run(allocator, budget_id, user_id, args.operations, writers)
+                print(
+                    f"writers={writers:>3} mode={mode:<5} ops={args.operations:>6} "
+                    f"total={elapsed:7.3f}s rate={args.operations / elapsed:8.1f}/s "
+                    f"seq={await check(budget_id)}"
+                )
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Benchmark update throughput of the sharded worker pool.
+
+Feeds synthetic message updates from many users through bot.sharding.ShardPool
+with a CPU-bound handler and reports handled updates per second for each
+worker count. No Telegram or database access is needed: the handler does not
+call the Bot API and the dispatcher has no database middleware.
+
+Usage:
+    python -m scripts.bench_sharding --workers 1,2,4 --updates 20000 --work 20000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from aiogram import Dispatcher, F
+from aiogram.types import Message
+
+from bot.sharding import ShardPool
+
+BENCH_BOT_TOKEN = "123456:BENCH"
+WORK_ENV = "BENCH_SHARDING_WORK"
+
+
+def build_bench_dispatcher() -> Dispatcher:
+    work = int(os.environ.get(WORK_ENV, "20000"))
+    dp = Dispatcher()
+
+    @dp.message(F.text)
+    async def handle(message: Message) -> None:
+        sum(idx * idx for idx in range(work))
+
+    return dp
+
+
+def make_update(update_id: int, user_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 1_700_000_000,
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Bench"},
+            "text": f"expense {update_id}",
+        },
+    }
+
+
+async def run(workers: int, updates: list[dict], max_concurrency: int) -> float:
+    pool = ShardPool(workers, build_bench_dispatcher, BENCH_BOT_TOKEN, max_concurrency, logging.WARNING)
+    await pool.start()
+    started = time.perf_counter()
+    for update in updates:
+        pool.dispatch(update)
+    await pool.stop()
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--work", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    os.environ[WORK_ENV] = str(args.work)
+    updates = [make_update(idx, 1_000_000 + idx % args.users) for idx in range(args.updates)]
+
+    baseline: float | None = None
+    for workers in (int(value) for value in args.workers.split(",")):
+        elapsed = await run(workers, updates, args.concurrency)
+        rate = len(updates) / elapsed
+        baseline = baseline or rate
+        print(
+            f"workers={workers:>2} updates={len(updates):>7} total={elapsed:7.3f}s "
+            f"rate={rate:9.1f}/s speedup={rate / baseline:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
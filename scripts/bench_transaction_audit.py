@@ -0,0 +1,230 @@
+"""Compare full-snapshot and diff-based transaction audit rows.
+
+Seeds two equal sets of transactions in one budget and applies the same
+random one- or two-field edits to both. The "full" set stores complete before
+and after snapshots for every edit, as the audit table was designed for. The
+"diff" set goes through services.audit_service.edit_transaction, which
+stores changed fields only. The script reports JSONB bytes per audit row,
+edit latency, and the latency of rebuilding a random historical version.
+It also checks rebuilt versions against snapshots taken during the run.
+
+Usage (needs a migrated database from .env / .env.local):
+    python -m scripts.bench_transaction_audit --transactions 500 --edits 8 --samples 500
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.transaction import Transaction
+from db.models.transaction_audit import TransactionAudit
+from db.session import SessionMaker, engine
+from scripts.bench_transaction_insert import _values, cleanup, seed
+from services.audit_service import (
+    edit_transaction,
+    get_transaction_version,
+    snapshot_transaction,
+)
+from services.transaction_service import build_insert_transaction
+
+FULL = "bench:full"
+DIFF = "bench:diff"
+
+
+def random_changes(transaction: Transaction) -> dict[str, Any]:
+    choice = random.randrange(4)
+    if choice == 0:
+        return {"amount": transaction.amount + Decimal("1.25")}
+    if choice == 1:
+        return {"comment": f"note {random.randint(0, 10**6)}"}
+    if choice == 2:
+        return {"occurred_at": transaction.occurred_at + timedelta(minutes=random.randint(1, 600))}
+    return {"currency": "RSD" if transaction.currency == "EUR" else "EUR"}
+
+
+def derived_changes(transaction: Transaction, changes: dict[str, Any]) -> dict[str, Any]:
+    # Mirror edit_transaction so both sets store the same edits.
+    values = dict(changes)
+    if "occurred_at" in values:
+        values["local_date"] = values["fx_date"] = values["occurred_at"].date()
+    if values.keys() & {"amount", "currency"}:
+        in_base = values.get("currency", transaction.currency) == "EUR"
+        amount = values.get("amount", transaction.amount)
+        values["amount_base"] = amount if in_base else None
+        values["fx_rate"] = Decimal(1) if in_base else None
+    return values
+
+
+async def full_edit(
+    session: AsyncSession, user_id: uuid.UUID, transaction_id: uuid.UUID, changes: dict
+) -> None:
+    result = await session.execute(
+        select(Transaction).where(Transaction.id == transaction_id).with_for_update()
+    )
+    transaction = result.scalar_one()
+    before = snapshot_transaction(transaction)
+    for field, value in derived_changes(transaction, changes).items():
+        setattr(transaction, field, value)
+    after = snapshot_transaction(transaction)
+    session.add(
+        TransactionAudit(
+            transaction_id=transaction_id,
+            edited_at=func.clock_timestamp(),
+            edited_by_user_id=user_id,
+            before=before,
+            after=after,
+            reason=FULL,
+        )
+    )
+    await session.commit()
+
+
+async def full_version(session: AsyncSession, transaction_id: uuid.UUID, version: int) -> dict[str, Any]:
+    if version == 0:
+        column, offset = TransactionAudit.before, 0
+    else:
+        column, offset = TransactionAudit.after, version - 1
+    result = await session.execute(
+        select(column)
+        .where(TransactionAudit.transaction_id == transaction_id)
+        .order_by(TransactionAudit.edited_at.asc(), TransactionAudit.id.asc())
+        .offset(offset)
+        .limit(1)
+    )
+    return result.scalar_one()
+
+
+async def seed_transactions(budget_id: uuid.UUID, user_id: uuid.UUID, count: int) -> list[uuid.UUID]:
+    ids = []
+    async with SessionMaker() as session:
+        for _ in range(count):
+            result = await session.execute(build_insert_transaction(_values(budget_id, user_id)))
+            ids.append(result.one().id)
+        await session.commit()
+    return ids
+
+
+async def apply_edits(
+    mode: str, user_id: uuid.UUID, ids: list[uuid.UUID], edits: int, tracked: int
+) -> tuple[list[float], dict[uuid.UUID, list[dict[str, Any]]]]:
+    random.seed(7)
+    latencies = []
+    history: dict[uuid.UUID, list[dict[str, Any]]] = {}
+    for _ in range(edits):
+        for idx, transaction_id in enumerate(ids):
+            async with SessionMaker() as session:
+                transaction = await session.get(Transaction, transaction_id)
+                if idx < tracked and transaction_id not in history:
+                    history[transaction_id] = [snapshot_transaction(transaction)]
+                changes = random_changes(transaction)
+            async with SessionMaker() as session:
+                started = time.perf_counter()
+                if mode == FULL:
+                    await full_edit(session, user_id, transaction_id, changes)
+                else:
+                    await edit_transaction(session, user_id, transaction_id, changes, reason=DIFF)
+                latencies.append(time.perf_counter() - started)
+            if transaction_id in history:
+                async with SessionMaker() as session:
+                    transaction = await session.get(Transaction, transaction_id)
+                    history[transaction_id].append(snapshot_transaction(transaction))
+    return latencies, history
+
+
+async def storage(tag: str) -> tuple[int, int]:
+    async with SessionMaker() as session:
+        result = await session.execute(
+            select(
+                func.count(),
+                func.coalesce(
+                    func.sum(
+                        func.pg_column_size(TransactionAudit.before)
+                        + func.pg_column_size(TransactionAudit.after)
+                    ),
+                    0,
+                ),
+            ).where(TransactionAudit.reason == tag)
+        )
+        return tuple(result.one())
+
+
+async def rebuild(mode: str, user_id: uuid.UUID, ids: list[uuid.UUID], edits: int, samples: int) -> list[float]:
+    latencies = []
+    for _ in range(samples):
+        transaction_id = random.choice(ids)
+        version = random.randint(0, edits)
+        async with SessionMaker() as session:
+            started = time.perf_counter()
+            if mode == FULL:
+                await full_version(session, transaction_id, version)
+            else:
+                await get_transaction_version(session, user_id, transaction_id, version)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def verify(mode: str, user_id: uuid.UUID, history: dict[uuid.UUID, list[dict[str, Any]]]) -> str:
+    async with SessionMaker() as session:
+        for transaction_id, versions in history.items():
+            for version, expected in enumerate(versions):
+                if mode == FULL:
+                    rebuilt = await full_version(session, transaction_id, version)
+                else:
+                    rebuilt = await get_transaction_version(session, user_id, transaction_id, version)
+                if rebuilt != expected:
+                    return f"MISMATCH {transaction_id} v{version}"
+    return "ok"
+
+
+async def remove_audit() -> None:
+    async with SessionMaker() as session:
+        await session.execute(delete(TransactionAudit).where(TransactionAudit.reason.in_([FULL, DIFF])))
+        await session.commit()
+
+
+def ms(values: list[float]) -> str:
+    ordered = sorted(values)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"p50={statistics.median(ordered) * 1000:6.2f}ms p95={p95 * 1000:6.2f}ms"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, default=500)
+    parser.add_argument("--edits", type=int, default=8)
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    try:
+        await remove_audit()
+        await cleanup()
+        budget_id, user_id = await seed()
+        sets = {
+            FULL: await seed_transactions(budget_id, user_id, args.transactions),
+            DIFF: await seed_transactions(budget_id, user_id, args.transactions),
+        }
+        for mode, ids in sets.items():
+            edit_latencies, history = await apply_edits(mode, user_id, ids, args.edits, tracked=20)
+            rows, size = await storage(mode)
+            rebuild_latencies = await rebuild(mode, user_id, ids, args.edits, args.samples)
+            print(
+                f"{mode:<11} audit_rows={rows:>7} jsonb_bytes={size:>10} "
+                f"per_row={size / max(rows, 1):7.1f}B edit {ms(edit_latencies)} "
+                f"rebuild {ms(rebuild_latencies)} versions={await verify(mode, user_id, history)}"
+            )
+    finally:
+        await remove_audit()
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,168 @@
+"""Benchmark seq_no allocation when many members write to one budget.
+
+Compares a read-lock-write flow (SELECT ... FOR UPDATE on budget_counters,
+UPDATE, ORM INSERT, COMMIT) against the single-statement
+UPDATE ... RETURNING -> INSERT used by services.transaction_service. All
+writers target the same budget, so every insert contends on one counter row.
+Seq numbers are checked for gaps and duplicates after each run.
+
+Usage (needs a migrated database from .env / .env.local):
+    python -m scripts.bench_transaction_insert --operations 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.budget import Budget
+from db.models.budget_counter import BudgetCounter
+from db.models.budget_membership import BudgetMembership
+from db.models.transaction import Transaction
+from db.models.user import User
+from db.session import SessionMaker, engine
+from services.transaction_service import build_insert_transaction
+
+TELEGRAM_ID = 9_100_000_000
+
+
+def _values(budget_id: uuid.UUID, user_id: uuid.UUID) -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": uuid.uuid4(),
+        "budget_id": budget_id,
+        "type": "expense",
+        "amount": Decimal("12.50"),
+        "currency": "EUR",
+        "amount_base": Decimal("12.50"),
+        "fx_rate": Decimal(1),
+        "fx_date": now.date(),
+        "occurred_at": now,
+        "local_date": now.date(),
+        "created_by_user_id": user_id,
+    }
+
+
+async def locked_insert(session: AsyncSession, budget_id: uuid.UUID, user_id: uuid.UUID) -> int:
+    counter = (
+        await session.execute(
+            select(BudgetCounter).where(BudgetCounter.budget_id == budget_id).with_for_update()
+        )
+    ).scalar_one()
+    seq_no = counter.next_seq_no
+    counter.next_seq_no = seq_no + 1
+    session.add(Transaction(seq_no=seq_no, **_values(budget_id, user_id)))
+    await session.commit()
+    return seq_no
+
+
+async def statement_insert(session: AsyncSession, budget_id: uuid.UUID, user_id: uuid.UUID) -> int:
+    result = await session.execute(build_insert_transaction(_values(budget_id, user_id)))
+    seq_no = result.one().seq_no
+    await session.commit()
+    return seq_no
+
+
+async def run(flow, budget_id: uuid.UUID, user_id: uuid.UUID, operations: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def write() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with SessionMaker() as session:
+                await flow(session, budget_id, user_id)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(write() for _ in range(operations)))
+    return latencies
+
+
+async def seed() -> tuple[uuid.UUID, uuid.UUID]:
+    async with SessionMaker() as session:
+        user = User(telegram_user_id=TELEGRAM_ID, first_name="Bench")
+        session.add(user)
+        await session.flush()
+        budget = Budget(
+            name="bench",
+            base_currency="EUR",
+            aux_currency_1="RSD",
+            timezone="UTC",
+            created_by_user_id=user.id,
+        )
+        session.add(budget)
+        await session.flush()
+        session.add(BudgetCounter(budget_id=budget.id, next_seq_no=1))
+        session.add(BudgetMembership(budget_id=budget.id, user_id=user.id, role="owner", is_active=True))
+        await session.commit()
+        return budget.id, user.id
+
+
+async def reset(budget_id: uuid.UUID) -> None:
+    async with SessionMaker() as session:
+        await session.execute(delete(Transaction).where(Transaction.budget_id == budget_id))
+        counter = await session.get(BudgetCounter, budget_id)
+        counter.next_seq_no = 1
+        await session.commit()
+
+
+async def check(budget_id: uuid.UUID, operations: int) -> str:
+    async with SessionMaker() as session:
+        result = await session.execute(
+            select(func.count(), func.count(func.distinct(Transaction.seq_no)), func.max(Transaction.seq_no))
+            .where(Transaction.budget_id == budget_id)
+        )
+        rows, distinct, highest = result.one()
+    ok = rows == distinct == highest == operations
+    return "ok" if ok else f"BROKEN rows={rows} distinct={distinct} max={highest}"
+
+
+async def cleanup() -> None:
+    async with SessionMaker() as session:
+        user_ids = select(User.id).where(User.telegram_user_id == TELEGRAM_ID).scalar_subquery()
+        budget_ids = select(Budget.id).where(Budget.created_by_user_id == user_ids).scalar_subquery()
+        await session.execute(delete(Transaction).where(Transaction.budget_id == budget_ids))
+        await session.execute(delete(BudgetCounter).where(BudgetCounter.budget_id == budget_ids))
+        await session.execute(delete(BudgetMembership).where(BudgetMembership.budget_id == budget_ids))
+        await session.execute(delete(Budget).where(Budget.created_by_user_id == user_ids))
+        await session.execute(delete(User).where(User.telegram_user_id == TELEGRAM_ID))
+        await session.commit()
+
+
+def report(name: str, latencies: list[float], elapsed: float, status: str) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<10} ops={len(latencies):>6} total={elapsed:7.3f}s "
+        f"rate={len(latencies) / elapsed:8.1f}/s "
+        f"p50={statistics.median(ordered) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms seq={status}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    try:
+        await cleanup()
+        budget_id, user_id = await seed()
+        for name, flow in (("locked", locked_insert), ("statement", statement_insert)):
+            await reset(budget_id)
+            started = time.perf_counter()
+            latencies = await run(flow, budget_id, user_id, args.operations, args.concurrency)
+            elapsed = time.perf_counter() - started
+            report(name, latencies, elapsed, await check(budget_id, args.operations))
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
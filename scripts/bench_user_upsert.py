@@ -0,0 +1,134 @@
+"""Benchmark ensure_user under a first-contact storm.
+
+Compares the previous SELECT -> INSERT -> COMMIT flow (with rollback and
+re-SELECT on IntegrityError) against the single-statement upsert used by
+services.user_service.ensure_user. Every simulated user sends several
+concurrent updates, as when an invite link is posted in a large group.
+
+Usage (needs a migrated database from .env / .env.local):
+    python -m scripts.bench_user_upsert --users 500 --updates-per-user 3 --concurrency 50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.user import User
+from db.session import SessionMaker, engine
+from services import user_service
+
+TELEGRAM_ID_BASE = 9_000_000_000
+
+
+async def legacy_ensure_user(
+    session: AsyncSession,
+    telegram_user_id: int,
+    telegram_username: str | None,
+    first_name: str | None,
+    last_name: str | None,
+) -> User:
+    result = await session.execute(select(User).where(User.telegram_user_id == telegram_user_id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        user = User(
+            telegram_user_id=telegram_user_id,
+            telegram_username=telegram_username,
+            first_name=first_name,
+            last_name=last_name,
+        )
+        session.add(user)
+        try:
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            result = await session.execute(select(User).where(User.telegram_user_id == telegram_user_id))
+            return result.scalar_one()
+        return user
+
+    changed = False
+    if user.telegram_username != telegram_username:
+        user.telegram_username = telegram_username
+        changed = True
+    if user.first_name != first_name:
+        user.first_name = first_name
+        changed = True
+    if user.last_name != last_name:
+        user.last_name = last_name
+        changed = True
+    if changed:
+        await session.commit()
+    return user
+
+
+async def upsert_ensure_user(
+    session: AsyncSession,
+    telegram_user_id: int,
+    telegram_username: str | None,
+    first_name: str | None,
+    last_name: str | None,
+) -> User:
+    # Measure the database path only: the identity cache would absorb repeats.
+    user_service._identity_cache.pop(telegram_user_id)
+    return await user_service.ensure_user(session, telegram_user_id, telegram_username, first_name, last_name)
+
+
+async def run_storm(flow, users: int, updates_per_user: int, concurrency: int) -> list[float]:
+    telegram_ids = [TELEGRAM_ID_BASE + idx for idx in range(users)] * updates_per_user
+    random.shuffle(telegram_ids)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def contact(telegram_user_id: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with SessionMaker() as session:
+                await flow(session, telegram_user_id, f"user{telegram_user_id}", "Bench", None)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(contact(telegram_user_id) for telegram_user_id in telegram_ids))
+    return latencies
+
+
+async def cleanup() -> None:
+    async with SessionMaker() as session:
+        await session.execute(delete(User).where(User.telegram_user_id >= TELEGRAM_ID_BASE))
+        await session.commit()
+    user_service._identity_cache.clear()
+    user_service._telegram_ids.clear()
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<8} updates={len(latencies):>6} total={elapsed:7.3f}s "
+        f"rate={len(latencies) / elapsed:8.1f}/s "
+        f"p50={statistics.median(ordered) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--updates-per-user", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    try:
+        for name, flow in (("legacy", legacy_ensure_user), ("upsert", upsert_ensure_user)):
+            await cleanup()
+            started = time.perf_counter()
+            latencies = await run_storm(flow, args.users, args.updates_per_user, args.concurrency)
+            report(name, latencies, time.perf_counter() - started)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
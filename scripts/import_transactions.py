@@ -0,0 +1,63 @@
+"""Import transactions from a CSV file into a budget.
+
+The file needs a header row with at least date and amount columns
+(date/дата, amount/сумма). Optional columns are currency/валюта,
+category/категория, type/тип (expense/income, расход/приход) and
+comment/комментарий. Without a type column, negative amounts are expenses
+and positive ones are income. Either ';' or ',' works as the delimiter.
+
+Usage (needs a migrated database from .env / .env.local):
+    python -m scripts.import_transactions --budget-id <uuid> --telegram-user-id <id> history.csv
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+from sqlalchemy import select
+
+from db.models.user import User
+from db.session import SessionMaker, engine
+from services.import_service import ImportServiceError, import_transactions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--budget-id", type=uuid.UUID, required=True)
+    parser.add_argument("--telegram-user-id", type=int, required=True)
+    parser.add_argument("--encoding", default="utf-8-sig")
+    args = parser.parse_args()
+
+    try:
+        async with SessionMaker() as session:
+            user_id = (
+                await session.execute(
+                    select(User.id).where(User.telegram_user_id == args.telegram_user_id)
+                )
+            ).scalar_one_or_none()
+            if user_id is None:
+                print(f"User with telegram id {args.telegram_user_id} not found", file=sys.stderr)
+                return 1
+            started = time.perf_counter()
+            with open(args.path, encoding=args.encoding, newline="") as source:
+                result = await import_transactions(session, user_id, args.budget_id, source)
+            elapsed = time.perf_counter() - started
+    except ImportServiceError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        await engine.dispose()
+
+    print(
+        f"imported={result.imported} duplicates={result.duplicates} "
+        f"skipped={result.skipped} elapsed={elapsed:.2f}s"
+    )
+    for error in result.errors:
+        print(f"  {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,11 +1,22 @@
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import case, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import TTLCache
+from core.invalidation import invalidation_bus
 from db.models.budget import Budget
 from db.models.budget_membership import BudgetMembership
 from db.models.user import User
+from services.dto.budget import ActiveBudgetContextDTO
+from services.user_service import invalidate_user
+
+CONTEXT_CACHE_MAX_SIZE = 10_000
+CONTEXT_CACHE_TTL_SECONDS = 300
+
+_context_cache: TTLCache[uuid.UUID, ActiveBudgetContextDTO] = TTLCache(
+    CONTEXT_CACHE_MAX_SIZE, CONTEXT_CACHE_TTL_SECONDS
+)
 
 
 class ActiveBudgetServiceError(Exception):
@@ -39,7 +50,7 @@ async def set_active_budget(
     session: AsyncSession, user_id: uuid.UUID, budget_id: uuid.UUID
 ) -> Budget:
     membership = await session.execute(
-        select(BudgetMembership).where(
+        select(BudgetMembership.budget_id).where(
             BudgetMembership.user_id == user_id,
             BudgetMembership.budget_id == budget_id,
             BudgetMembership.is_active.is_(True),
@@ -58,6 +69,8 @@ async def set_active_budget(
 
     user.active_budget_id = budget.id
     await session.commit()
+    invalidate_user(user_id)
+    invalidate_budget_context(user_id)
     return budget
 
 
@@ -72,7 +85,7 @@ async def get_budget_detail(
     session: AsyncSession, user_id: uuid.UUID, budget_id: uuid.UUID
 ) -> Budget:
     membership = await session.execute(
-        select(BudgetMembership).where(
+        select(BudgetMembership.budget_id).where(
             BudgetMembership.user_id == user_id,
             BudgetMembership.budget_id == budget_id,
             BudgetMembership.is_active.is_(True),
@@ -93,3 +106,58 @@ async def get_active_budget_name(session: AsyncSession, user_id: uuid.UUID) -> s
         .where(User.id == user_id)
     )
     return result.scalar_one_or_none()
+
+
+async def get_active_budget_context(
+    session: AsyncSession, user_id: uuid.UUID | str
+) -> ActiveBudgetContextDTO | None:
+    if isinstance(user_id, str):
+        user_id = uuid.UUID(user_id)
+    context = _context_cache.get(user_id)
+    if context is not None:
+        return context
+
+    result = await session.execute(
+        select(
+            Budget.id,
+            Budget.name,
+            Budget.base_currency,
+            Budget.aux_currency_1,
+            Budget.aux_currency_2,
+            Budget.timezone,
+            BudgetMembership.role,
+        )
+        .join(BudgetMembership, BudgetMembership.budget_id == Budget.id)
+        .join(User, User.id == BudgetMembership.user_id)
+        .where(
+            BudgetMembership.user_id == user_id,
+            BudgetMembership.is_active.is_(True),
+            Budget.is_archived.is_(False),
+        )
+        .order_by(
+            case((Budget.id == User.active_budget_id, 0), else_=1),
+            Budget.created_at.asc(),
+        )
+        .limit(1)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    context = ActiveBudgetContextDTO(
+        budget_id=row.id,
+        name=row.name,
+        base_currency=row.base_currency,
+        aux_currency_1=row.aux_currency_1,
+        aux_currency_2=row.aux_currency_2,
+        timezone=row.timezone,
+        role=row.role,
+    )
+    _context_cache.set(user_id, context)
+    return context
+
+
+def invalidate_budget_context(user_id: uuid.UUID) -> None:
+    invalidation_bus.invalidate("budget_context", user_id)
+
+
+invalidation_bus.subscribe("budget_context", _context_cache.pop)
@@ -0,0 +1,210 @@
+import re
+from collections.abc import Collection
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+AMOUNT_QUANTUM = Decimal("0.01")
+# Numeric(14, 2) leaves twelve integer digits.
+AMOUNT_LIMIT = Decimal("1e12")
+AMOUNT_MAX_INPUT_LENGTH = 64
+
+CURRENCY_ALIASES = {
+    "€": "EUR",
+    "евро": "EUR",
+    "$": "USD",
+    "долл": "USD",
+    "₽": "RUB",
+    "р": "RUB",
+    "руб": "RUB",
+    "дин": "RSD",
+    "din": "RSD",
+}
+KNOWN_CURRENCIES = frozenset(CURRENCY_ALIASES.values())
+# Active ISO 4217 codes; a three-letter word outside this list is just text.
+ISO_CURRENCIES = frozenset(
+    """
+    AED AFN ALL AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BHD BIF BMD BND BOB
+    BRL BSD BTN BWP BYN BZD CAD CDF CHF CLP CNY COP CRC CUP CVE CZK DJF DKK DOP
+    DZD EGP ERN ETB EUR FJD FKP GBP GEL GHS GIP GMD GNF GTQ GYD HKD HNL HTG HUF
+    IDR ILS INR IQD IRR ISK JMD JOD JPY KES KGS KHR KMF KPW KRW KWD KYD KZT LAK
+    LBP LKR LRD LSL LYD MAD MDL MGA MKD MMK MNT MOP MRU MUR MVR MWK MXN MYR MZN
+    NAD NGN NIO NOK NPR NZD OMR PAB PEN PGK PHP PKR PLN PYG QAR RON RSD RUB RWF
+    SAR SBD SCR SDG SEK SGD SHP SLE SOS SRD SSP STN SVC SYP SZL THB TJS TMT TND
+    TOP TRY TTD TWD TZS UAH UGX USD UYU UZS VES VND VUV WST XAF XCD XOF XPF YER
+    ZAR ZMW ZWL
+    """.split()
+)
+_MULTIPLIERS = {
+    "k": Decimal(1000),
+    "к": Decimal(1000),
+    "тыс": Decimal(1000),
+    "m": Decimal(1_000_000),
+    "м": Decimal(1_000_000),
+    "млн": Decimal(1_000_000),
+}
+
+_PLAIN = re.compile(r"\s*(\d{1,12}(?:[.,]\d{1,2})?)\s*")
+_NUMBER = re.compile(
+    r"\s*(\d+(?:[ \u00a0\u202f'.,]\d+)*)(?:\s*(k|к|тыс|m|м|млн)\.?(?![^\W\d_]))?",
+    re.IGNORECASE,
+)
+# One term with an optional sign, multiplier and currency suffix.
+_SINGLE = re.compile(
+    r"\s*([+\-−])?\s*(\d+(?:[ \u00a0\u202f'.,]\d+)*)"
+    r"(?:\s*(k|к|тыс|m|м|млн)\.?(?![^\W\d_]))?\s*([€$₽]|[^\W\d_]+)?\s*",
+    re.IGNORECASE,
+)
+_OPERATOR = re.compile(r"\s*([+\-−])")
+_CURRENCY = re.compile(r"\s*([€$₽]|[^\W\d_]+)")
+_GROUPED = re.compile(r"([1-9]\d{0,2})((?:([ \u00a0\u202f'.,])\d{3})(?:\3\d{3})*)(?:([.,])(\d+))?")
+_DECIMAL = re.compile(r"(\d+)(?:[.,](\d+))?")
+
+
+class AmountParseError(ValueError):
+    pass
+
+
+class ParsedAmount(NamedTuple):
+    amount: Decimal
+    currency: str | None = None
+    sign: str | None = None
+
+
+def parse_amount(text: str) -> ParsedAmount:
+    """Parse a typed amount such as "1 200,50", "12.5k", "15€" or "120+35.5".
+
+    A leading + or - is returned as sign and applies to the whole expression;
+    the amount itself is always positive and quantized to cents. A currency
+    symbol, code or alias may stand before or after the amount.
+    """
+    plain = _PLAIN.fullmatch(text)
+    if plain is not None:
+        amount = Decimal(plain.group(1).replace(",", ".")).quantize(AMOUNT_QUANTUM)
+        if not amount:
+            raise AmountParseError("Сумма должна быть больше нуля.")
+        return ParsedAmount(amount)
+
+    single = _SINGLE.fullmatch(text)
+    if single is not None:
+        sign, number, multiplier, word = single.groups()
+        currency = _currency_code(word)
+        if word is None or currency is not None:
+            return ParsedAmount(_quantize(_term_value(number, multiplier)), currency, _sign(sign))
+
+    parsed, end = scan_amount(text)
+    if text[end:].strip():
+        raise AmountParseError(f"Не понял «{text[end:].strip()}» в сумме.")
+    return parsed
+
+
+def scan_amount(
+    text: str, currencies: Collection[str] | None = None
+) -> tuple[ParsedAmount, int]:
+    """Parse the amount at the start of text and return where it ended.
+
+    Words after the amount that are not a currency are left unread, so the
+    caller can treat them as a category or a comment. With currencies given,
+    only those codes are taken as the currency.
+    """
+    if len(text) > AMOUNT_MAX_INPUT_LENGTH:
+        text = text[:AMOUNT_MAX_INPUT_LENGTH]
+    pos = 0
+    sign = None
+    match = _OPERATOR.match(text)
+    if match is not None:
+        sign = _sign(match.group(1))
+        pos = match.end()
+
+    currency, pos = _scan_currency(text, pos, currencies)
+    total, pos = _scan_term(text, pos)
+    while True:
+        match = _OPERATOR.match(text, pos)
+        if match is None:
+            break
+        number = _NUMBER.match(text, match.end())
+        if number is None:
+            break
+        value = _term_value(*number.groups())
+        total = total + value if match.group(1) == "+" else total - value
+        pos = number.end()
+    if currency is None:
+        currency, pos = _scan_currency(text, pos, currencies)
+
+    return ParsedAmount(_quantize(total), currency, sign), pos
+
+
+def _quantize(value: Decimal) -> Decimal:
+    if value >= AMOUNT_LIMIT:
+        raise AmountParseError("Слишком большая сумма.")
+    amount = value.quantize(AMOUNT_QUANTUM, rounding=ROUND_HALF_UP)
+    if amount <= 0:
+        raise AmountParseError("Сумма должна быть больше нуля.")
+    return amount
+
+
+def _sign(symbol: str | None) -> str | None:
+    return "-" if symbol == "−" else symbol
+
+
+def _scan_term(text: str, pos: int) -> tuple[Decimal, int]:
+    match = _NUMBER.match(text, pos)
+    if match is None:
+        raise AmountParseError("Не понял сумму.")
+    return _term_value(*match.groups()), match.end()
+
+
+def _scan_currency(
+    text: str, pos: int, currencies: Collection[str] | None
+) -> tuple[str | None, int]:
+    match = _CURRENCY.match(text, pos)
+    if match is None:
+        return None, pos
+    code = _currency_code(match.group(1))
+    if code is None or currencies is not None and code not in currencies:
+        return None, pos
+    return code, match.end()
+
+
+def known_currency(word: str) -> str | None:
+    """Return the code for an alias or a real ISO 4217 code, else None.
+
+    Unlike the parser, this does not take any three letters as a code, so
+    words such as "bus" or "tip" stay text.
+    """
+    code = CURRENCY_ALIASES.get(word.lower())
+    if code is None and word.upper() in ISO_CURRENCIES:
+        code = word.upper()
+    return code
+
+
+def _currency_code(word: str | None) -> str | None:
+    if word is None:
+        return None
+    code = CURRENCY_ALIASES.get(word.lower())
+    if code is None and len(word) == 3 and word.isascii():
+        code = word.upper()
+    return code
+
+
+def _term_value(number: str, multiplier: str | None) -> Decimal:
+    value = _number_value(number)
+    if multiplier is not None:
+        value *= _MULTIPLIERS[multiplier.lower()]
+    return value
+
+
+def _number_value(raw: str) -> Decimal:
+    # A single . or , before exactly three digits groups thousands: "1.200" is
+    # a thousand and two hundred, since amounts never carry three decimals.
+    match = _GROUPED.fullmatch(raw)
+    if match is not None:
+        head, groups, separator, point, fraction = match.groups()
+        if point is None:
+            return Decimal(head + groups.replace(separator, ""))
+        if point != separator:
+            return Decimal(f"{head}{groups.replace(separator, '')}.{fraction}")
+    match = _DECIMAL.fullmatch(raw)
+    if match is None:
+        raise AmountParseError(f"Не понял число «{raw}».")
+    whole, fraction = match.groups()
+    return Decimal(f"{whole}.{fraction}" if fraction else whole)
@@ -0,0 +1,202 @@
+import uuid
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.budget import Budget
+from db.models.budget_membership import BudgetMembership
+from db.models.category import Category
+from db.models.transaction import Transaction
+from db.models.transaction_audit import TransactionAudit
+from services.amount_parser import AMOUNT_LIMIT, AMOUNT_QUANTUM
+from services.transaction_service import to_local_date
+
+AUDITED_FIELDS = (
+    "type",
+    "amount",
+    "currency",
+    "amount_base",
+    "fx_rate",
+    "fx_date",
+    "occurred_at",
+    "local_date",
+    "category_id",
+    "goal_id",
+    "comment",
+    "is_deleted",
+)
+# amount_base, fx_rate, fx_date and local_date follow from these and the budget.
+EDITABLE_FIELDS = ("amount", "currency", "occurred_at", "category_id", "comment", "is_deleted")
+
+
+class AuditServiceError(Exception):
+    pass
+
+
+def snapshot_transaction(transaction: Transaction) -> dict[str, Any]:
+    return {field: _to_json(getattr(transaction, field)) for field in AUDITED_FIELDS}
+
+
+def diff_snapshots(
+    before: dict[str, Any], after: dict[str, Any]
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    changed = [field for field in after if before.get(field) != after[field]]
+    return (
+        {field: before.get(field) for field in changed},
+        {field: after[field] for field in changed},
+    )
+
+
+async def edit_transaction(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    transaction_id: uuid.UUID,
+    changes: dict[str, Any],
+    reason: str | None = None,
+) -> bool:
+    """Apply changes and record only the fields that actually changed.
+
+    This must stay the only writer of the audited fields: versions are
+    replayed backwards from the current row.
+    Returns False when every value already matched and nothing was written.
+    """
+    unknown = set(changes) - set(EDITABLE_FIELDS)
+    if unknown:
+        raise AuditServiceError(f"Поля нельзя менять: {', '.join(sorted(unknown))}.")
+
+    result = await session.execute(
+        _member_transaction(user_id, transaction_id).with_for_update(of=Transaction)
+    )
+    transaction = result.scalar_one_or_none()
+    if transaction is None:
+        await session.rollback()
+        raise AuditServiceError("Операция не найдена.")
+    try:
+        values = await _validated_changes(session, transaction, changes)
+    except AuditServiceError:
+        await session.rollback()
+        raise
+
+    before = snapshot_transaction(transaction)
+    for field, value in values.items():
+        setattr(transaction, field, value)
+    before_diff, after_diff = diff_snapshots(before, snapshot_transaction(transaction))
+    if not after_diff:
+        await session.rollback()
+        return False
+
+    transaction.updated_by_user_id = user_id
+    transaction.updated_at = func.clock_timestamp()
+    session.add(
+        TransactionAudit(
+            transaction_id=transaction.id,
+            # now() is the transaction start; edits that waited on the row lock
+            # must still sort after the edit they waited for.
+            edited_at=func.clock_timestamp(),
+            edited_by_user_id=user_id,
+            before=before_diff,
+            after=after_diff,
+            reason=reason,
+        )
+    )
+    await session.commit()
+    return True
+
+
+async def get_transaction_version(
+    session: AsyncSession, user_id: uuid.UUID, transaction_id: uuid.UUID, version: int
+) -> dict[str, Any]:
+    """Rebuild the audited fields as they were after the given number of edits.
+
+    Version 0 is the operation as created. Replay starts from the current row
+    and undoes the newer edits' before values, newest first. Older audit rows
+    that hold full snapshots replay the same way.
+    """
+    result = await session.execute(_member_transaction(user_id, transaction_id))
+    transaction = result.scalar_one_or_none()
+    if transaction is None:
+        raise AuditServiceError("Операция не найдена.")
+    result = await session.execute(
+        select(TransactionAudit.before, TransactionAudit.after)
+        .where(TransactionAudit.transaction_id == transaction_id)
+        .order_by(TransactionAudit.edited_at.asc(), TransactionAudit.id.asc())
+    )
+    audit = result.all()
+    if not 0 <= version <= len(audit):
+        raise AuditServiceError(f"Версии {version} нет: правок {len(audit)}.")
+
+    state = snapshot_transaction(transaction)
+    if audit and any(state.get(field) != value for field, value in audit[-1].after.items()):
+        # Someone wrote the row without edit_transaction; replaying from it
+        # would pass off the unaudited values as earlier versions.
+        raise AuditServiceError("История правок не сходится с операцией.")
+    for row in reversed(audit[version:]):
+        state.update(row.before)
+    return state
+
+
+def _member_transaction(user_id: uuid.UUID, transaction_id: uuid.UUID):
+    return (
+        select(Transaction)
+        .join(
+            BudgetMembership,
+            (BudgetMembership.budget_id == Transaction.budget_id)
+            & (BudgetMembership.user_id == user_id)
+            & BudgetMembership.is_active.is_(True),
+        )
+        .where(Transaction.id == transaction_id)
+    )
+
+
+async def _validated_changes(
+    session: AsyncSession, transaction: Transaction, changes: dict[str, Any]
+) -> dict[str, Any]:
+    values = dict(changes)
+    budget = await session.get(Budget, transaction.budget_id)
+
+    if "amount" in values:
+        amount = Decimal(values["amount"]).quantize(AMOUNT_QUANTUM, rounding=ROUND_HALF_UP)
+        if amount <= 0 or amount >= AMOUNT_LIMIT:
+            raise AuditServiceError("Сумма должна быть больше нуля.")
+        values["amount"] = amount
+    if "currency" in values:
+        currencies = {budget.base_currency, budget.aux_currency_1, budget.aux_currency_2}
+        if values["currency"] not in currencies - {None}:
+            raise AuditServiceError("Эта валюта не подключена к бюджету.")
+    if values.get("category_id") is not None:
+        category = await session.get(Category, values["category_id"])
+        if (
+            category is None
+            or category.budget_id != transaction.budget_id
+            or category.kind != transaction.type
+        ):
+            raise AuditServiceError("Категория не найдена.")
+
+    if "occurred_at" in values:
+        occurred_at = values["occurred_at"]
+        if occurred_at.tzinfo is None:
+            raise AuditServiceError("Время операции должно быть с часовым поясом.")
+        values["local_date"] = to_local_date(occurred_at, budget.timezone)
+    if values.keys() & {"amount", "currency", "occurred_at"}:
+        # Same rule as create_transaction: no rate source yet, so only a
+        # base-currency amount has a base value.
+        amount = values.get("amount", transaction.amount)
+        in_base = values.get("currency", transaction.currency) == budget.base_currency
+        values["amount_base"] = amount if in_base else None
+        values["fx_rate"] = Decimal(1) if in_base else None
+        values["fx_date"] = values.get("local_date", transaction.local_date)
+    return values
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # 12.5 and 12.50 are the same amount and must not show up as a change.
+        return format(value.normalize(), "f")
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
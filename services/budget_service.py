@@ -7,7 +7,9 @@ from db.models.budget import Budget
 from db.models.budget_counter import BudgetCounter
 from db.models.budget_membership import BudgetMembership
 from db.models.user import User
-from services.dto.budget import CreateBudgetDTO
+from services.dto.budget import BudgetMetaDTO, CreateBudgetDTO
+from services.active_budget_service import invalidate_budget_context
+from services.user_service import invalidate_user
 
 
 class BudgetServiceError(Exception):
@@ -31,7 +33,7 @@ async def create_first_budget(
     async with session.begin():
         owner = await session.get(User, owner_user_id)
         existing = await session.execute(
-            select(BudgetMembership).where(
+            select(BudgetMembership.budget_id).where(
                 BudgetMembership.user_id == owner_user_id,
                 BudgetMembership.is_active.is_(True),
             )
@@ -67,4 +69,20 @@ async def create_first_budget(
         if owner is not None and owner.active_budget_id is None:
             owner.active_budget_id = budget.id
 
+    invalidate_user(owner_user_id)
+    invalidate_budget_context(owner_user_id)
     return budget
+
+
+async def get_budget_meta(session: AsyncSession, budget_id: uuid.UUID) -> BudgetMetaDTO | None:
+    budget = await session.get(Budget, budget_id)
+    if budget is None:
+        return None
+    return BudgetMetaDTO(
+        budget_id=budget.id,
+        base_currency=budget.base_currency,
+        aux_currency_1=budget.aux_currency_1,
+        aux_currency_2=budget.aux_currency_2,
+        timezone=budget.timezone,
+        is_archived=budget.is_archived,
+    )
@@ -0,0 +1,165 @@
+import asyncio
+import contextlib
+import logging
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db.models.user_category_stat import UserCategoryStat
+from db.session import SessionMaker
+
+logger = logging.getLogger(__name__)
+
+STATS_FLUSH_INTERVAL_SECONDS = 5.0
+STATS_MAX_PENDING = 500
+STATS_MAX_FLUSH_FAILURES = 5
+# Five bind parameters per row; stays well under the 32767 limit.
+STATS_WRITE_CHUNK = 1000
+
+
+class CategoryStatsBuffer:
+    """Write-behind buffer for user_category_stats.
+
+    record() only updates an in-memory (user_id, category_id) tally. Pending
+    tallies are written as one INSERT ... ON CONFLICT DO UPDATE every
+    flush_interval_seconds, as soon as max_pending keys pile up, and on stop().
+    A failed flush puts its tallies back so the next one retries them. After
+    max_flush_failures failures in a row the batch is written key by key and
+    the keys that still fail are logged and dropped, so one bad row cannot
+    hold the rest back or grow the buffer forever.
+    """
+
+    def __init__(
+        self,
+        flush_interval_seconds: float = STATS_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = STATS_MAX_PENDING,
+        max_flush_failures: int = STATS_MAX_FLUSH_FAILURES,
+        session_factory: async_sessionmaker[AsyncSession] = SessionMaker,
+    ) -> None:
+        self._interval = flush_interval_seconds
+        self._max_pending = max_pending
+        self._max_failures = max_flush_failures
+        self._failures = 0
+        self._factory = session_factory
+        self._pending: dict[tuple[uuid.UUID, uuid.UUID], tuple[int, datetime]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self, user_id: uuid.UUID, category_id: uuid.UUID, used_at: datetime | None = None
+    ) -> None:
+        used_at = used_at or datetime.now(timezone.utc)
+        key = (user_id, category_id)
+        current = self._pending.get(key)
+        if current is None:
+            self._pending[key] = (1, used_at)
+        else:
+            self._pending[key] = (current[0] + 1, max(current[1], used_at))
+        if len(self._pending) >= self._max_pending:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                await self._write(batch)
+            except Exception:
+                self._failures += 1
+                if self._failures < self._max_failures:
+                    self._restore(batch)
+                    raise
+                logger.exception("Category stats flush failed %s times; writing keys one by one", self._failures)
+                self._failures = 0
+                return await self._write_each(batch)
+            self._failures = 0
+            return len(batch)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to drain category stats on shutdown", extra={"pending": self.pending})
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self._interval)
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush category stats", extra={"pending": self.pending})
+
+    async def _write(self, batch: dict[tuple[uuid.UUID, uuid.UUID], tuple[int, datetime]]) -> None:
+        stats = UserCategoryStat.__table__
+        # Sorted keys give concurrent flushes from other workers the same
+        # row lock order, so they cannot deadlock each other.
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "category_id": category_id,
+                "usage_count": count,
+                "last_used_at": used_at,
+            }
+            for (user_id, category_id), (count, used_at) in sorted(batch.items())
+        ]
+        async with self._factory() as session:
+            for start in range(0, len(rows), STATS_WRITE_CHUNK):
+                insert_stmt = pg_insert(stats).values(rows[start:start + STATS_WRITE_CHUNK])
+                await session.execute(
+                    insert_stmt.on_conflict_do_update(
+                        constraint="uq_user_category_stats_user_category",
+                        set_={
+                            "usage_count": stats.c.usage_count + insert_stmt.excluded.usage_count,
+                            "last_used_at": func.greatest(
+                                stats.c.last_used_at, insert_stmt.excluded.last_used_at
+                            ),
+                        },
+                    )
+                )
+            await session.commit()
+
+    async def _write_each(self, batch: dict[tuple[uuid.UUID, uuid.UUID], tuple[int, datetime]]) -> int:
+        dropped = []
+        for key, value in sorted(batch.items()):
+            try:
+                await self._write({key: value})
+            except Exception:
+                dropped.append(key)
+        if dropped:
+            logger.error(
+                "Dropped category stats for %s keys that keep failing",
+                len(dropped),
+                extra={"keys": [f"{user_id}:{category_id}" for user_id, category_id in dropped[:20]]},
+            )
+        return len(batch) - len(dropped)
+
+    def _restore(self, batch: dict[tuple[uuid.UUID, uuid.UUID], tuple[int, datetime]]) -> None:
+        for key, (count, used_at) in batch.items():
+            current = self._pending.get(key)
+            if current is not None:
+                count, used_at = count + current[0], max(used_at, current[1])
+            self._pending[key] = (count, used_at)
+
+
+category_stats = CategoryStatsBuffer()
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, field_validator
+import uuid
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class CreateBudgetDTO(BaseModel):
@@ -14,3 +16,36 @@ class CreateBudgetDTO(BaseModel):
         if value is None:
             return None
         return value.strip().upper()
+
+
+class ActiveBudgetContextDTO(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    budget_id: uuid.UUID
+    name: str
+    base_currency: str
+    aux_currency_1: str | None
+    aux_currency_2: str | None
+    timezone: str
+    role: str
+
+    @property
+    def currencies(self) -> list[str]:
+        currencies = [self.base_currency, self.aux_currency_1, self.aux_currency_2]
+        return [currency for currency in currencies if currency]
+
+
+class BudgetMetaDTO(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    budget_id: uuid.UUID
+    base_currency: str
+    aux_currency_1: str | None
+    aux_currency_2: str | None
+    timezone: str
+    is_archived: bool
+
+    @property
+    def currencies(self) -> list[str]:
+        currencies = [self.base_currency, self.aux_currency_1, self.aux_currency_2]
+        return [currency for currency in currencies if currency]
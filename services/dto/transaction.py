@@ -0,0 +1,64 @@
+import uuid
+from decimal import Decimal
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from services.amount_parser import AMOUNT_QUANTUM, parse_amount
+
+
+class CreateTransactionDTO(BaseModel):
+    type: Literal["expense", "income"]
+    amount: Decimal = Field(gt=0, max_digits=14, decimal_places=2)
+    currency: str = Field(min_length=3, max_length=3)
+    category_name: str | None = Field(default=None, max_length=200)
+    # Set only when the user picked the category, so a missing one may be created.
+    create_category: bool = False
+    comment: str | None = None
+    input_type: str | None = None
+    raw_text: str | None = None
+    idempotency_key: uuid.UUID | None = None
+
+    @field_validator("amount", mode="before")
+    @classmethod
+    def normalize_amount(cls, value: object) -> object:
+        if isinstance(value, str):
+            return parse_amount(value).amount
+        if isinstance(value, Decimal):
+            return value.quantize(AMOUNT_QUANTUM)
+        return value
+
+    @field_validator("currency", mode="before")
+    @classmethod
+    def normalize_currency(cls, value: object) -> object:
+        if isinstance(value, str):
+            return value.strip().upper()
+        return value
+
+
+class CreatedTransactionDTO(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    transaction_id: uuid.UUID
+    budget_id: uuid.UUID
+    seq_no: int
+    created: bool = True
+
+
+class ImportResultDTO(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    imported: int
+    duplicates: int
+    skipped: int
+    errors: list[str]
+
+
+class QuickEntryDTO(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    type: Literal["expense", "income"]
+    amount: Decimal
+    currency: str
+    category_name: str | None
+    comment: str | None
@@ -0,0 +1,14 @@
+import uuid
+
+from pydantic import BaseModel, ConfigDict
+
+
+class CurrentUserDTO(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    id: uuid.UUID
+    telegram_user_id: int
+    telegram_username: str | None
+    first_name: str | None
+    last_name: str | None
+    active_budget_id: uuid.UUID | None
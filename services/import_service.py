@@ -0,0 +1,390 @@
+import asyncio
+import csv
+import itertools
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.budget_membership import BudgetMembership
+from services.amount_parser import AmountParseError, parse_amount
+from services.budget_service import get_budget_meta
+from services.dto.budget import BudgetMetaDTO
+from services.dto.transaction import ImportResultDTO
+from services.transaction_service import invalidate_category_names
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_ERROR_LIMIT = 20
+IMPORT_STAGING_TABLE = "transactions_import"
+
+_HEADER_ALIASES = {
+    "date": ("date", "дата", "occurred_at"),
+    "amount": ("amount", "сумма"),
+    "currency": ("currency", "валюта"),
+    "category": ("category", "категория", "source", "источник"),
+    "type": ("type", "тип"),
+    "comment": ("comment", "комментарий", "description", "описание"),
+}
+_TYPE_ALIASES = {
+    "expense": "expense",
+    "расход": "expense",
+    "-": "expense",
+    "income": "income",
+    "приход": "income",
+    "доход": "income",
+    "+": "income",
+}
+_DATE_FORMATS = ("%d.%m.%Y", "%d.%m.%Y %H:%M", "%d.%m.%Y %H:%M:%S", "%d/%m/%Y", "%d/%m/%Y %H:%M")
+
+# Staged rows carry their position in the file as seq_no and the category by
+# name; the merge turns both into the real seq_no and category_id.
+_COPY_COLUMNS = (
+    "id",
+    "budget_id",
+    "seq_no",
+    "type",
+    "amount",
+    "currency",
+    "amount_base",
+    "fx_rate",
+    "fx_date",
+    "occurred_at",
+    "local_date",
+    "category_name",
+    "comment",
+    "created_by_user_id",
+    "input_type",
+    "raw_text",
+)
+_MERGE_COLUMNS = tuple(
+    column for column in _COPY_COLUMNS if column not in ("seq_no", "category_name")
+)
+_DEDUP_COLUMNS = ("budget_id", "occurred_at", "type", "amount", "currency")
+
+
+class ImportServiceError(Exception):
+    pass
+
+
+class _ParsedRow(NamedTuple):
+    type: str
+    amount: Decimal
+    currency: str
+    occurred_at: datetime
+    local_date: date
+    category: str | None
+    comment: str | None
+    raw_text: str
+
+
+class _RowError(NamedTuple):
+    line_no: int
+    reason: str
+
+
+async def import_transactions(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    budget_id: uuid.UUID,
+    lines: Iterable[str],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportResultDTO:
+    """Stream CSV lines into transactions through COPY into a staging table.
+
+    Rows are parsed and copied batch by batch, so memory stays flat. On
+    commit, new categories are created and the staging table is merged into
+    transactions, skipping rows that an earlier import of the same file
+    already added. The merge also takes the seq_no range and updates the
+    category stats, so nothing outlives a failed import.
+    """
+    membership = await session.execute(
+        select(BudgetMembership.role).where(
+            BudgetMembership.user_id == user_id,
+            BudgetMembership.budget_id == budget_id,
+            BudgetMembership.is_active.is_(True),
+        )
+    )
+    role = membership.scalar_one_or_none()
+    if role is None:
+        raise ImportServiceError("Ты не участник этого бюджета.")
+    # Bulk history goes in on the owner's say, like invites and removals.
+    if role != "owner":
+        raise ImportServiceError("Импортировать операции может только владелец бюджета.")
+    meta = await get_budget_meta(session, budget_id)
+    if meta is None or meta.is_archived:
+        raise ImportServiceError("Бюджет не найден или архивирован.")
+    await session.commit()
+
+    await session.execute(
+        text(
+            f"CREATE TEMP TABLE {IMPORT_STAGING_TABLE} "
+            "(LIKE transactions INCLUDING DEFAULTS, category_name text) ON COMMIT DROP"
+        )
+    )
+    connection = await session.connection()
+    raw_connection = (await connection.get_raw_connection()).driver_connection
+
+    staged = 0
+    skipped = 0
+    errors: list[str] = []
+    batch: list[_ParsedRow] = []
+
+    async def flush() -> None:
+        nonlocal staged
+        records = _build_records(batch, staged, user_id, meta)
+        await raw_connection.copy_records_to_table(
+            IMPORT_STAGING_TABLE, records=records, columns=_COPY_COLUMNS
+        )
+        staged += len(records)
+        batch.clear()
+
+    try:
+        for item in parse_import_rows(lines, meta):
+            if isinstance(item, _RowError):
+                skipped += 1
+                if len(errors) < IMPORT_ERROR_LIMIT:
+                    errors.append(f"строка {item.line_no}: {item.reason}")
+                continue
+            batch.append(item)
+            if len(batch) >= batch_size:
+                await flush()
+                # Parsing is CPU-bound; let other updates run between batches.
+                await asyncio.sleep(0)
+        if batch:
+            await flush()
+
+        await session.execute(text(_create_categories_sql()))
+        result = await session.execute(text(_merge_sql()), {"budget_id": budget_id})
+        imported, counters = result.one()
+        if staged and not counters:
+            raise ImportServiceError("Счётчик операций бюджета не найден.")
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    invalidate_category_names(budget_id)
+
+    return ImportResultDTO(
+        imported=imported,
+        duplicates=staged - imported,
+        skipped=skipped,
+        errors=errors,
+    )
+
+
+def parse_import_rows(
+    lines: Iterable[str], meta: BudgetMetaDTO
+) -> Iterator[_ParsedRow | _RowError]:
+    lines = iter(lines)
+    first_line = next(lines, None)
+    if first_line is None:
+        raise ImportServiceError("Файл пустой.")
+    first_line = first_line.lstrip("\ufeff")
+    delimiter = ";" if first_line.count(";") > first_line.count(",") else ","
+    reader = csv.reader(itertools.chain([first_line], lines), delimiter=delimiter)
+    positions = _resolve_header(next(reader))
+
+    tz = _budget_zone(meta.timezone)
+    currencies = set(meta.currencies)
+    while True:
+        try:
+            fields = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield _RowError(reader.line_num, str(exc))
+            continue
+        if not any(field.strip() for field in fields):
+            continue
+        raw_text = delimiter.join(fields)
+        try:
+            yield _parse_row(fields, positions, meta.base_currency, currencies, tz, raw_text)
+        except ValueError as exc:
+            yield _RowError(reader.line_num, str(exc))
+
+
+def _resolve_header(header: list[str]) -> dict[str, int]:
+    normalized = [column.strip().lower() for column in header]
+    positions: dict[str, int] = {}
+    for field, aliases in _HEADER_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                positions[field] = normalized.index(alias)
+                break
+    missing = [field for field in ("date", "amount") if field not in positions]
+    if missing:
+        raise ImportServiceError(f"Нет обязательных колонок: {', '.join(missing)}.")
+    return positions
+
+
+def _parse_row(
+    fields: list[str],
+    positions: dict[str, int],
+    base_currency: str,
+    currencies: set[str],
+    tz: ZoneInfo | timezone,
+    raw_text: str,
+) -> _ParsedRow:
+    def column(name: str) -> str | None:
+        idx = positions.get(name)
+        if idx is None or idx >= len(fields):
+            return None
+        value = fields[idx].strip()
+        return value or None
+
+    amount = _parse_amount(column("amount") or "")
+    type_raw = column("type")
+    if type_raw is not None:
+        op_type = _TYPE_ALIASES.get(type_raw.lower())
+        if op_type is None:
+            raise ValueError(f"неизвестный тип «{type_raw}»")
+        amount = abs(amount)
+    else:
+        op_type = "expense" if amount < 0 else "income"
+        amount = abs(amount)
+    if amount == 0:
+        raise ValueError("нулевая сумма")
+
+    currency = (column("currency") or base_currency).upper()
+    if currency not in currencies:
+        raise ValueError(f"валюта {currency} не подключена к бюджету")
+
+    occurred_at = _parse_moment(column("date") or "", tz)
+    return _ParsedRow(
+        type=op_type,
+        amount=amount,
+        currency=currency,
+        occurred_at=occurred_at.astimezone(timezone.utc),
+        local_date=occurred_at.date(),
+        category=column("category"),
+        comment=column("comment"),
+        raw_text=raw_text,
+    )
+
+
+def _parse_amount(value: str) -> Decimal:
+    try:
+        parsed = parse_amount(value)
+    except AmountParseError:
+        raise ValueError(f"не понял сумму «{value}»") from None
+    return -parsed.amount if parsed.sign == "-" else parsed.amount
+
+
+def _parse_moment(value: str, tz: ZoneInfo | timezone) -> datetime:
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        for fmt in _DATE_FORMATS:
+            try:
+                moment = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"не понял дату «{value}»") from None
+    if moment.tzinfo is None:
+        if len(value) <= 10:
+            # Date-only rows land at local noon so DST shifts keep the same day.
+            moment = datetime.combine(moment.date(), time(12), tzinfo=tz)
+        else:
+            moment = moment.replace(tzinfo=tz)
+    return moment.astimezone(tz)
+
+
+def _budget_zone(tz_name: str) -> ZoneInfo | timezone:
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def _build_records(
+    rows: list[_ParsedRow],
+    position: int,
+    user_id: uuid.UUID,
+    meta: BudgetMetaDTO,
+) -> list[tuple[Any, ...]]:
+    # No rate source yet: foreign-currency rows keep amount_base and fx_rate
+    # empty, like operations entered in the bot.
+    return [
+        (
+            uuid.uuid4(),
+            meta.budget_id,
+            position + offset,
+            row.type,
+            row.amount,
+            row.currency,
+            row.amount if row.currency == meta.base_currency else None,
+            Decimal(1) if row.currency == meta.base_currency else None,
+            row.local_date,
+            row.occurred_at,
+            row.local_date,
+            row.category,
+            row.comment,
+            user_id,
+            "import",
+            row.raw_text,
+        )
+        for offset, row in enumerate(rows)
+    ]
+
+
+def _fresh_rows_sql() -> str:
+    matches = " AND ".join(f"t.{column} = s.{column}" for column in _DEDUP_COLUMNS)
+    return (
+        f"SELECT s.* FROM {IMPORT_STAGING_TABLE} AS s "
+        "WHERE NOT EXISTS ("
+        f"SELECT 1 FROM transactions AS t WHERE {matches} "
+        "AND t.raw_text IS NOT DISTINCT FROM s.raw_text AND NOT t.is_deleted)"
+    )
+
+
+def _create_categories_sql() -> str:
+    return (
+        "INSERT INTO categories (id, budget_id, name, kind) "
+        "SELECT gen_random_uuid(), f.budget_id, f.category_name, f.type "
+        f"FROM ({_fresh_rows_sql()}) AS f "
+        "WHERE f.category_name IS NOT NULL "
+        "GROUP BY f.budget_id, f.category_name, f.type "
+        "ON CONFLICT ON CONSTRAINT uq_categories_budget_name_kind DO NOTHING"
+    )
+
+
+def _merge_sql() -> str:
+    columns = ", ".join(_MERGE_COLUMNS)
+    fresh_columns = ", ".join(f"f.{column}" for column in _MERGE_COLUMNS)
+    # One statement numbers the new rows, bumps the counter by exactly that
+    # many, inserts them and adds them to user_category_stats. Duplicates take
+    # no seq_no; the counter row stays locked only until the commit.
+    return (
+        "WITH fresh AS ("
+        "SELECT s.*, row_number() OVER (ORDER BY s.seq_no) AS position "
+        f"FROM ({_fresh_rows_sql()}) AS s"
+        "), counter AS ("
+        "UPDATE budget_counters "
+        "SET next_seq_no = next_seq_no + (SELECT count(*) FROM fresh), updated_at = now() "
+        "WHERE budget_id = :budget_id "
+        "RETURNING next_seq_no - (SELECT count(*) FROM fresh) AS first_seq_no"
+        "), inserted AS ("
+        f"INSERT INTO transactions ({columns}, seq_no, category_id) "
+        f"SELECT {fresh_columns}, counter.first_seq_no + f.position - 1, c.id "
+        "FROM fresh AS f CROSS JOIN counter "
+        "LEFT JOIN categories AS c "
+        "ON c.budget_id = f.budget_id AND c.kind = f.type AND c.name = f.category_name "
+        "RETURNING category_id, created_by_user_id, occurred_at"
+        "), stats AS ("
+        "INSERT INTO user_category_stats (id, user_id, category_id, usage_count, last_used_at) "
+        "SELECT gen_random_uuid(), created_by_user_id, category_id, count(*), max(occurred_at) "
+        "FROM inserted WHERE category_id IS NOT NULL "
+        "GROUP BY created_by_user_id, category_id ORDER BY category_id "
+        "ON CONFLICT ON CONSTRAINT uq_user_category_stats_user_category DO UPDATE SET "
+        "usage_count = user_category_stats.usage_count + EXCLUDED.usage_count, "
+        "last_used_at = greatest(user_category_stats.last_used_at, EXCLUDED.last_used_at)"
+        ") "
+        "SELECT (SELECT count(*) FROM inserted), (SELECT count(*) FROM counter)"
+    )
@@ -9,6 +9,8 @@ from db.models.budget import Budget
 from db.models.budget_invite import BudgetInvite
 from db.models.budget_membership import BudgetMembership
 from db.models.user import User
+from services.active_budget_service import invalidate_budget_context
+from services.user_service import invalidate_user
 
 
 class InviteServiceError(Exception):
@@ -21,17 +23,17 @@ INVITE_MAX_USES = 1
 
 async def create_invite_for_owner(session: AsyncSession, owner_user_id: uuid.UUID) -> BudgetInvite:
     membership = await session.execute(
-        select(BudgetMembership).where(
+        select(BudgetMembership.budget_id).where(
             BudgetMembership.user_id == owner_user_id,
             BudgetMembership.role == "owner",
             BudgetMembership.is_active.is_(True),
         )
     )
-    owner_membership = membership.scalar_one_or_none()
-    if owner_membership is None:
+    owner_budget_id = membership.scalar_one_or_none()
+    if owner_budget_id is None:
         raise InviteServiceError("Приглашение может создать только владелец бюджета.")
 
-    budget = await session.get(Budget, owner_membership.budget_id)
+    budget = await session.get(Budget, owner_budget_id)
     if budget is None or budget.is_archived:
         raise InviteServiceError("Бюджет не найден или архивирован.")
 
@@ -66,7 +68,7 @@ async def accept_invite(session: AsyncSession, token: str, user_id: uuid.UUID) -
         raise InviteServiceError("Ссылка уже использована.")
 
     existing = await session.execute(
-        select(BudgetMembership).where(
+        select(BudgetMembership.budget_id).where(
             BudgetMembership.user_id == user_id,
             BudgetMembership.budget_id == invite.budget_id,
             BudgetMembership.is_active.is_(True),
@@ -93,6 +95,8 @@ async def accept_invite(session: AsyncSession, token: str, user_id: uuid.UUID) -
         invite.is_active = False
 
     await session.commit()
+    invalidate_user(user_id)
+    invalidate_budget_context(user_id)
 
     return membership
 
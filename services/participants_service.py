@@ -1,74 +1,114 @@
 import uuid
+from typing import NamedTuple
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, or_, select, true, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models.budget_membership import BudgetMembership
 from db.models.user import User
+from services.active_budget_service import invalidate_budget_context
+from services.user_service import invalidate_user
+
+
+PARTICIPANTS_PAGE_SIZE = 10
 
 
 class ParticipantsServiceError(Exception):
     pass
 
 
+class ParticipantsPage(NamedTuple):
+    items: list[dict[str, str]]
+    next_after: uuid.UUID | None
+
+
 async def list_active_participants(
-    session: AsyncSession, owner_user_id: uuid.UUID
-) -> list[dict[str, str]]:
+    session: AsyncSession,
+    owner_user_id: uuid.UUID,
+    after: uuid.UUID | None = None,
+    limit: int = PARTICIPANTS_PAGE_SIZE,
+) -> ParticipantsPage:
     budget_id = await _get_owner_budget_id(session, owner_user_id)
-    result = await session.execute(
-        select(BudgetMembership, User)
-        .join(User, User.id == BudgetMembership.user_id)
-        .where(
-            BudgetMembership.budget_id == budget_id,
-            BudgetMembership.is_active.is_(True),
-        )
-        .order_by(BudgetMembership.role.desc(), User.created_at.asc())
-    )
-    items: list[dict[str, str]] = []
-    for membership, user in result.all():
-        username = f"@{user.telegram_username}" if user.telegram_username else "без username"
-        name = " ".join([part for part in [user.first_name, user.last_name] if part]) or "Без имени"
-        role = "владелец" if membership.role == "owner" else "участник"
-        items.append(
-            {
-                "user_id": str(user.id),
-                "username": username,
-                "name": name,
-                "role": role,
-            }
-        )
-    return items
+    return await _list_participants_page(session, budget_id, after, limit)
 
 
 async def list_active_participants_for_budget(
-    session: AsyncSession, owner_user_id: uuid.UUID, budget_id: uuid.UUID | str
-) -> list[dict[str, str]]:
+    session: AsyncSession,
+    owner_user_id: uuid.UUID,
+    budget_id: uuid.UUID | str,
+    after: uuid.UUID | None = None,
+    limit: int = PARTICIPANTS_PAGE_SIZE,
+) -> ParticipantsPage:
     if isinstance(budget_id, str):
         budget_id = uuid.UUID(budget_id)
     await _ensure_owner_for_budget(session, owner_user_id, budget_id)
-    result = await session.execute(
-        select(BudgetMembership, User)
+    return await _list_participants_page(session, budget_id, after, limit)
+
+
+def _participants_query(budget_id: uuid.UUID, after: uuid.UUID | None, limit: int) -> Select:
+    query = (
+        select(
+            BudgetMembership.role,
+            User.id,
+            User.telegram_username,
+            User.first_name,
+            User.last_name,
+        )
         .join(User, User.id == BudgetMembership.user_id)
         .where(
             BudgetMembership.budget_id == budget_id,
             BudgetMembership.is_active.is_(True),
         )
-        .order_by(BudgetMembership.role.desc(), User.created_at.asc())
+        .order_by(BudgetMembership.role.desc(), User.created_at.asc(), User.id.asc())
+        .limit(limit)
     )
+    if after is None:
+        return query
+
+    # Keyset position of the last row of the previous page; role sorts
+    # descending, so the comparison is split instead of one row comparison.
+    cursor = (
+        select(
+            BudgetMembership.role.label("role"),
+            User.created_at.label("created_at"),
+            User.id.label("user_id"),
+        )
+        .join(User, User.id == BudgetMembership.user_id)
+        .where(BudgetMembership.budget_id == budget_id, BudgetMembership.user_id == after)
+        .cte("participants_cursor")
+    )
+    return query.join(cursor, true()).where(
+        or_(
+            BudgetMembership.role < cursor.c.role,
+            and_(
+                BudgetMembership.role == cursor.c.role,
+                tuple_(User.created_at, User.id) > tuple_(cursor.c.created_at, cursor.c.user_id),
+            ),
+        )
+    )
+
+
+async def _list_participants_page(
+    session: AsyncSession, budget_id: uuid.UUID, after: uuid.UUID | None, limit: int
+) -> ParticipantsPage:
+    result = await session.execute(_participants_query(budget_id, after, limit + 1))
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     items: list[dict[str, str]] = []
-    for membership, user in result.all():
-        username = f"@{user.telegram_username}" if user.telegram_username else "без username"
-        name = " ".join([part for part in [user.first_name, user.last_name] if part]) or "Без имени"
-        role = "владелец" if membership.role == "owner" else "участник"
+    for row in rows:
+        username = f"@{row.telegram_username}" if row.telegram_username else "без username"
+        name = " ".join([part for part in [row.first_name, row.last_name] if part]) or "Без имени"
+        role = "владелец" if row.role == "owner" else "участник"
         items.append(
             {
-                "user_id": str(user.id),
+                "user_id": str(row.id),
                 "username": username,
                 "name": name,
                 "role": role,
             }
         )
-    return items
+    return ParticipantsPage(items=items, next_after=rows[-1].id if has_more else None)
 
 
 async def remove_participant(
@@ -94,6 +134,8 @@ async def remove_participant(
     if user is not None and user.active_budget_id == budget_id:
         user.active_budget_id = None
     await session.commit()
+    invalidate_user(participant_user_id)
+    invalidate_budget_context(participant_user_id)
 
 
 async def remove_participant_from_budget(
@@ -121,6 +163,8 @@ async def remove_participant_from_budget(
     if user is not None and user.active_budget_id == budget_id:
         user.active_budget_id = None
     await session.commit()
+    invalidate_user(participant_user_id)
+    invalidate_budget_context(participant_user_id)
 
 
 async def get_participant_display(
@@ -148,29 +192,28 @@ async def get_participant_display(
 
 async def _get_owner_budget_id(session: AsyncSession, owner_user_id: uuid.UUID) -> uuid.UUID:
     membership = await session.execute(
-        select(BudgetMembership).where(
+        select(BudgetMembership.budget_id).where(
             BudgetMembership.user_id == owner_user_id,
             BudgetMembership.role == "owner",
             BudgetMembership.is_active.is_(True),
         )
     )
-    owner_membership = membership.scalar_one_or_none()
-    if owner_membership is None:
+    owner_budget_id = membership.scalar_one_or_none()
+    if owner_budget_id is None:
         raise ParticipantsServiceError("Только владелец может управлять участниками.")
-    return owner_membership.budget_id
+    return owner_budget_id
 
 
 async def _ensure_owner_for_budget(
     session: AsyncSession, owner_user_id: uuid.UUID, budget_id: uuid.UUID
 ) -> None:
     membership = await session.execute(
-        select(BudgetMembership).where(
+        select(BudgetMembership.budget_id).where(
             BudgetMembership.user_id == owner_user_id,
             BudgetMembership.budget_id == budget_id,
             BudgetMembership.role == "owner",
             BudgetMembership.is_active.is_(True),
         )
     )
-    owner_membership = membership.scalar_one_or_none()
-    if owner_membership is None:
+    if membership.scalar_one_or_none() is None:
         raise ParticipantsServiceError("Только владелец может управлять участниками.")
@@ -0,0 +1,70 @@
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.amount_parser import AmountParseError, known_currency, scan_amount
+from services.dto.budget import ActiveBudgetContextDTO
+from services.dto.transaction import QuickEntryDTO
+from services.transaction_service import list_category_names
+
+# Longest category name, in words, tried as an exact match.
+QUICK_ENTRY_MAX_CATEGORY_WORDS = 3
+# Shortest first word that may pick a category by prefix.
+QUICK_ENTRY_MIN_PREFIX = 3
+
+
+async def parse_quick_entry(
+    session: AsyncSession,
+    context: ActiveBudgetContextDTO,
+    text: str,
+    default_categories: dict[str, Iterable[str]] | None = None,
+) -> QuickEntryDTO:
+    """Parse a one-message operation such as "350 еда кофе" or "+50000 rsd аренда".
+
+    A leading + makes it income, anything else an expense. The words after the
+    amount are matched against the budget's categories of that type plus
+    default_categories; whatever is left becomes the comment. Raises
+    AmountParseError when the text does not start with an amount or names a
+    currency the budget does not have.
+    """
+    parsed, end = scan_amount(text, context.currencies)
+    op_type = "income" if parsed.sign == "+" else "expense"
+    names = await list_category_names(session, context.budget_id, op_type)
+    if default_categories:
+        names = [*names, *default_categories.get(op_type, ())]
+    category_name, comment = match_category(text[end:], names)
+    words = text[end:].split()
+    if category_name is None and words:
+        # "100 gbp" must not save 100 in the base currency, while "350 bus"
+        # is an ordinary comment.
+        code = known_currency(words[0])
+        if code is not None:
+            raise AmountParseError(f"Валюта {code} не подключена к бюджету.")
+    return QuickEntryDTO(
+        type=op_type,
+        amount=parsed.amount,
+        currency=parsed.currency or context.base_currency,
+        category_name=category_name,
+        comment=comment,
+    )
+
+
+def match_category(rest: str, names: Iterable[str]) -> tuple[str | None, str | None]:
+    words = rest.split()
+    if not words:
+        return None, None
+    index = {_fold(name): name for name in names}
+    for size in range(min(len(words), QUICK_ENTRY_MAX_CATEGORY_WORDS), 0, -1):
+        name = index.get(_fold(" ".join(words[:size])))
+        if name is not None:
+            return name, " ".join(words[size:]) or None
+    head = _fold(words[0])
+    if len(head) >= QUICK_ENTRY_MIN_PREFIX:
+        matches = {name for key, name in index.items() if key.startswith(head)}
+        if len(matches) == 1:
+            return matches.pop(), " ".join(words[1:]) or None
+    return None, " ".join(words)
+
+
+def _fold(value: str) -> str:
+    return value.casefold().replace("ё", "е")
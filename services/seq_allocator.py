@@ -0,0 +1,127 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.cache import TTLCache
+from core.settings_db import db_settings
+from db.models.budget_counter import BudgetCounter
+from db.session import SessionMaker
+
+
+SEQ_TRACKED_BUDGETS_MAX_SIZE = 10_000
+
+
+class SeqBlockAllocator:
+    """Hands out transaction seq_no values from per-budget blocks held in memory.
+
+    A block is reserved with one UPDATE budget_counters ... RETURNING committed
+    in its own short transaction, so writers only meet on the counter row once
+    per block. Numbers left unused when the process stops are skipped: seq_no
+    stays unique and increasing per worker, but may have gaps.
+
+    Budgets that see fewer than hot_threshold allocations within window_seconds
+    get None from take() and keep using per-row allocation. Every take() counts
+    towards that rate, whether or not a block is held.
+    """
+
+    def __init__(
+        self,
+        block_size: int,
+        hot_threshold: int = 0,
+        window_seconds: float = 10.0,
+        session_factory: async_sessionmaker[AsyncSession] = SessionMaker,
+    ) -> None:
+        self._block_size = block_size
+        self._hot_threshold = hot_threshold
+        self._window = window_seconds
+        self._factory = session_factory
+        self._blocks: dict[uuid.UUID, deque[int]] = {}
+        # Last hot_threshold take() times per budget; a budget idle for a whole
+        # window expires, since none of its times would count anymore.
+        self._recent: TTLCache[uuid.UUID, deque[float]] = TTLCache(
+            SEQ_TRACKED_BUDGETS_MAX_SIZE, window_seconds
+        )
+        # One in-flight reservation per budget, dropped once it finishes.
+        self._reserving: dict[uuid.UUID, asyncio.Future[bool]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._block_size > 1
+
+    async def take(self, budget_id: uuid.UUID) -> int | None:
+        if not self.enabled:
+            return None
+        hot = self._is_hot(budget_id)
+        while True:
+            seq_no = self._pop(budget_id)
+            if seq_no is not None:
+                return seq_no
+            if not hot:
+                return None
+            reserving = self._reserving.get(budget_id)
+            if reserving is None:
+                reserving = asyncio.ensure_future(self._refill(budget_id))
+                self._reserving[budget_id] = reserving
+                reserving.add_done_callback(lambda _: self._reserving.pop(budget_id, None))
+            # Shielded so a cancelled caller does not cancel the other waiters.
+            if not await asyncio.shield(reserving):
+                return None
+
+    def forget(self, budget_id: uuid.UUID) -> None:
+        self._blocks.pop(budget_id, None)
+        self._recent.pop(budget_id)
+
+    def _pop(self, budget_id: uuid.UUID) -> int | None:
+        block = self._blocks.get(budget_id)
+        if not block:
+            return None
+        seq_no = block.popleft()
+        if not block:
+            del self._blocks[budget_id]
+        return seq_no
+
+    def _is_hot(self, budget_id: uuid.UUID) -> bool:
+        if self._hot_threshold <= 0:
+            return True
+        now = time.monotonic()
+        recent = self._recent.get(budget_id)
+        if recent is None:
+            recent = deque(maxlen=self._hot_threshold)
+        recent.append(now)
+        self._recent.set(budget_id, recent)
+        return len(recent) == self._hot_threshold and recent[0] > now - self._window
+
+    async def _refill(self, budget_id: uuid.UUID) -> bool:
+        async with self._factory() as session:
+            reserved = await reserve_seq_range(session, budget_id, self._block_size)
+            await session.commit()
+        if reserved is None:
+            return False
+        self._blocks[budget_id] = deque(reserved)
+        return True
+
+
+async def reserve_seq_range(
+    session: AsyncSession, budget_id: uuid.UUID, count: int
+) -> range | None:
+    counters = BudgetCounter.__table__
+    result = await session.execute(
+        update(counters)
+        .where(counters.c.budget_id == budget_id)
+        .values(next_seq_no=counters.c.next_seq_no + count, updated_at=func.now())
+        .returning(counters.c.next_seq_no)
+    )
+    end = result.scalar_one_or_none()
+    if end is None:
+        return None
+    return range(end - count, end)
+
+
+seq_allocator = SeqBlockAllocator(
+    db_settings.db_seq_block_size,
+    db_settings.db_seq_block_hot_threshold,
+)
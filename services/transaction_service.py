@@ -0,0 +1,274 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import Insert, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from db.models.budget_counter import BudgetCounter
+from db.models.category import Category
+from db.models.transaction import Transaction
+from services.active_budget_service import get_active_budget_context
+from services.category_stats import category_stats
+from services.dto.transaction import CreateTransactionDTO, CreatedTransactionDTO
+from services.seq_allocator import seq_allocator
+
+CATEGORY_CACHE_MAX_SIZE = 10_000
+CATEGORY_CACHE_TTL_SECONDS = 3600
+CATEGORY_NAMES_TTL_SECONDS = 300
+RECENT_OPERATIONS_MAX_SIZE = 10_000
+RECENT_OPERATIONS_TTL_SECONDS = 3600
+
+_category_cache: TTLCache[tuple[uuid.UUID, str, str], uuid.UUID] = TTLCache(
+    CATEGORY_CACHE_MAX_SIZE, CATEGORY_CACHE_TTL_SECONDS
+)
+_category_names_cache: TTLCache[tuple[uuid.UUID, str], list[str]] = TTLCache(
+    CATEGORY_CACHE_MAX_SIZE, CATEGORY_NAMES_TTL_SECONDS
+)
+# Fast path for repeated confirms; uq_transactions_idempotency_key is the authority.
+_recent_operations: TTLCache[uuid.UUID, CreatedTransactionDTO] = TTLCache(
+    RECENT_OPERATIONS_MAX_SIZE, RECENT_OPERATIONS_TTL_SECONDS
+)
+
+
+class TransactionServiceError(Exception):
+    pass
+
+
+async def create_transaction(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    payload: CreateTransactionDTO,
+) -> CreatedTransactionDTO:
+    key = payload.idempotency_key
+    if key is not None:
+        recent = _recent_operations.get(key)
+        if recent is not None:
+            return recent.model_copy(update={"created": False})
+        if seq_allocator.enabled:
+            # A block seq_no taken for a duplicate would be skipped for good,
+            # so look the key up before taking one.
+            existing = await _find_by_idempotency_key(session, key)
+            if existing is not None:
+                _recent_operations.set(key, existing)
+                return existing.model_copy(update={"created": False})
+
+    context = await get_active_budget_context(session, user_id)
+    if context is None:
+        raise TransactionServiceError("Нет активного бюджета.")
+    if payload.currency not in context.currencies:
+        raise TransactionServiceError("Эта валюта не подключена к бюджету.")
+
+    category_id = None
+    category_created = False
+    if payload.category_name:
+        category_id, category_created = await resolve_category_id(
+            session,
+            context.budget_id,
+            payload.type,
+            payload.category_name,
+            create=payload.create_category,
+        )
+        if category_id is None:
+            raise TransactionServiceError("Категория не найдена.")
+
+    occurred_at = datetime.now(timezone.utc)
+    local_date = to_local_date(occurred_at, context.timezone)
+    # No rate source yet: a foreign-currency amount keeps amount_base and
+    # fx_rate empty until a rate is known, instead of a wrong 1:1 value.
+    in_base = payload.currency == context.base_currency
+
+    seq_no = await seq_allocator.take(context.budget_id)
+    statement = build_insert_transaction(
+        {
+            "id": uuid.uuid4(),
+            "budget_id": context.budget_id,
+            "type": payload.type,
+            "amount": payload.amount,
+            "currency": payload.currency,
+            "amount_base": payload.amount if in_base else None,
+            "fx_rate": Decimal(1) if in_base else None,
+            "fx_date": local_date,
+            "occurred_at": occurred_at,
+            "local_date": local_date,
+            "category_id": category_id,
+            "comment": payload.comment,
+            "created_by_user_id": user_id,
+            "input_type": payload.input_type,
+            "raw_text": payload.raw_text,
+            "idempotency_key": key,
+        },
+        seq_no,
+    )
+    result = await session.execute(statement)
+    row = result.one_or_none()
+    if row is None:
+        await session.rollback()
+        existing = await _find_by_idempotency_key(session, key) if key is not None else None
+        if existing is None:
+            raise TransactionServiceError("Счётчик операций бюджета не найден.")
+        _recent_operations.set(key, existing)
+        return existing.model_copy(update={"created": False})
+    await session.commit()
+    if category_created:
+        _category_cache.set((context.budget_id, payload.type, payload.category_name.strip()), category_id)
+        _category_names_cache.pop((context.budget_id, payload.type))
+    if category_id is not None:
+        category_stats.record(user_id, category_id, occurred_at)
+    created = CreatedTransactionDTO(
+        transaction_id=row.id,
+        budget_id=context.budget_id,
+        seq_no=row.seq_no,
+    )
+    if key is not None:
+        _recent_operations.set(key, created)
+    return created
+
+
+def build_insert_transaction(values: dict[str, Any], seq_no: int | None = None) -> Insert:
+    """INSERT ... SELECT fed by UPDATE budget_counters ... RETURNING.
+
+    The counter bump and the insert run as one statement, so the counter row
+    lock is held for a single round trip plus COMMIT. A seq_no already taken
+    from a reserved block is inserted as is.
+
+    With an idempotency_key, a key that is already stored allocates nothing
+    and the statement returns no row.
+    """
+    counters = BudgetCounter.__table__
+    transactions = Transaction.__table__
+    key = values.get("idempotency_key")
+    if seq_no is not None:
+        statement = pg_insert(transactions).values(seq_no=seq_no, **values)
+        if key is not None:
+            statement = statement.on_conflict_do_nothing(constraint="uq_transactions_idempotency_key")
+        return statement.returning(transactions.c.id, transactions.c.seq_no)
+    conditions = [counters.c.budget_id == values["budget_id"]]
+    if key is not None:
+        conditions.append(~exists().where(transactions.c.idempotency_key == key))
+    allocated = (
+        update(counters)
+        .where(*conditions)
+        .values(next_seq_no=counters.c.next_seq_no + 1, updated_at=func.now())
+        .returning((counters.c.next_seq_no - 1).label("seq_no"))
+        .cte("allocated_seq_no")
+    )
+    names = list(values)
+    statement = pg_insert(transactions).from_select(
+        [*names, "seq_no"],
+        select(
+            *(literal(values[name], transactions.c[name].type) for name in names),
+            allocated.c.seq_no,
+        ),
+    )
+    if key is not None:
+        statement = statement.on_conflict_do_nothing(constraint="uq_transactions_idempotency_key")
+    return statement.returning(transactions.c.id, transactions.c.seq_no)
+
+
+async def resolve_category_id(
+    session: AsyncSession,
+    budget_id: uuid.UUID,
+    kind: str,
+    name: str,
+    *,
+    create: bool = False,
+) -> tuple[uuid.UUID | None, bool]:
+    """Return (category_id, created) for a category name.
+
+    Only an existing category is returned unless create is set. A created
+    category is inserted in the caller's transaction and is not cached here:
+    the caller caches it after its commit, so a rollback leaves nothing behind.
+    """
+    name = name.strip()
+    key = (budget_id, kind, name)
+    cached = _category_cache.get(key)
+    if cached is not None:
+        return cached, False
+
+    category_id = await _find_category_id(session, budget_id, kind, name)
+    if category_id is not None:
+        _category_cache.set(key, category_id)
+        return category_id, False
+    if not create:
+        return None, False
+
+    insert_stmt = (
+        pg_insert(Category)
+        .values(id=uuid.uuid4(), budget_id=budget_id, kind=kind, name=name)
+        .on_conflict_do_nothing(constraint="uq_categories_budget_name_kind")
+        .returning(Category.id)
+    )
+    category_id = (await session.execute(insert_stmt)).scalar_one_or_none()
+    if category_id is not None:
+        return category_id, True
+    # Inserted by a concurrent transaction that has committed meanwhile.
+    category_id = await _find_category_id(session, budget_id, kind, name)
+    _category_cache.set(key, category_id)
+    return category_id, False
+
+
+async def list_category_names(
+    session: AsyncSession, budget_id: uuid.UUID, kind: str
+) -> list[str]:
+    key = (budget_id, kind)
+    cached = _category_names_cache.get(key)
+    if cached is not None:
+        return cached
+    result = await session.execute(
+        select(Category.name)
+        .where(
+            Category.budget_id == budget_id,
+            Category.kind == kind,
+            Category.is_active.is_(True),
+        )
+        .order_by(Category.name.asc())
+    )
+    names = list(result.scalars().all())
+    _category_names_cache.set(key, names)
+    return names
+
+
+def invalidate_category_names(budget_id: uuid.UUID) -> None:
+    for kind in ("expense", "income"):
+        _category_names_cache.pop((budget_id, kind))
+
+
+async def _find_category_id(
+    session: AsyncSession, budget_id: uuid.UUID, kind: str, name: str
+) -> uuid.UUID | None:
+    result = await session.execute(
+        select(Category.id).where(
+            Category.budget_id == budget_id,
+            Category.kind == kind,
+            Category.name == name,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def _find_by_idempotency_key(
+    session: AsyncSession, key: uuid.UUID
+) -> CreatedTransactionDTO | None:
+    transactions = Transaction.__table__
+    result = await session.execute(
+        select(transactions.c.id, transactions.c.budget_id, transactions.c.seq_no).where(
+            transactions.c.idempotency_key == key
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return CreatedTransactionDTO(transaction_id=row.id, budget_id=row.budget_id, seq_no=row.seq_no)
+
+
+def to_local_date(moment: datetime, tz_name: str) -> date:
+    try:
+        return moment.astimezone(ZoneInfo(tz_name)).date()
+    except (ZoneInfoNotFoundError, ValueError):
+        return moment.date()
+
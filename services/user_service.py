@@ -1,8 +1,51 @@
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+import uuid
+
+from sqlalchemy import exists, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import TTLCache
+from core.invalidation import invalidation_bus
 from db.models.user import User
+from services.dto.user import CurrentUserDTO
+
+USER_CACHE_MAX_SIZE = 10_000
+USER_CACHE_TTL_SECONDS = 600
+
+_PROFILE_FIELDS = ("telegram_username", "first_name", "last_name")
+
+
+class _IdentityCache:
+    """Users by telegram_user_id, with a user_id index that follows every
+    eviction, so invalidate_user() always finds the entry it has to drop."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self._by_telegram_id: TTLCache[int, CurrentUserDTO] = TTLCache(
+            max_size, ttl_seconds, on_evict=self._forget
+        )
+        self._telegram_ids: dict[uuid.UUID, int] = {}
+
+    def get(self, telegram_user_id: int) -> CurrentUserDTO | None:
+        return self._by_telegram_id.get(telegram_user_id)
+
+    def set(self, telegram_user_id: int, user: CurrentUserDTO) -> None:
+        previous = self._by_telegram_id.pop(telegram_user_id)
+        if previous is not None:
+            self._telegram_ids.pop(previous.id, None)
+        self._by_telegram_id.set(telegram_user_id, user)
+        self._telegram_ids[user.id] = telegram_user_id
+
+    def pop_user(self, user_id: uuid.UUID) -> None:
+        telegram_user_id = self._telegram_ids.pop(user_id, None)
+        if telegram_user_id is not None:
+            self._by_telegram_id.pop(telegram_user_id)
+
+    def _forget(self, telegram_user_id: int, user: CurrentUserDTO) -> None:
+        if self._telegram_ids.get(user.id) == telegram_user_id:
+            del self._telegram_ids[user.id]
+
+
+_identity_cache = _IdentityCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
 
 
 async def ensure_user(
@@ -11,41 +54,75 @@ async def ensure_user(
     telegram_username: str | None,
     first_name: str | None,
     last_name: str | None,
-) -> User:
-    result = await session.execute(
-        select(User).where(User.telegram_user_id == telegram_user_id)
-    )
-    user = result.scalar_one_or_none()
+) -> CurrentUserDTO:
+    """Return the sender as a read-only snapshot; write through User rows."""
+    profile = (telegram_username, first_name, last_name)
+    cached = _identity_cache.get(telegram_user_id)
+    if cached is not None and tuple(getattr(cached, field) for field in _PROFILE_FIELDS) == profile:
+        return cached
+
+    user = await _upsert_user(session, telegram_user_id, telegram_username, first_name, last_name)
     if user is None:
-        user = User(
-            telegram_user_id=telegram_user_id,
-            telegram_username=telegram_username,
-            first_name=first_name,
-            last_name=last_name,
+        # Lost a first-contact race: the row was inserted after our snapshot.
+        await session.rollback()
+        result = await session.execute(
+            select(User).where(User.telegram_user_id == telegram_user_id)
+        )
+        user = result.scalar_one()
+    await session.commit()
+    current = CurrentUserDTO(
+        id=user.id,
+        telegram_user_id=user.telegram_user_id,
+        telegram_username=user.telegram_username,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        active_budget_id=user.active_budget_id,
+    )
+    _identity_cache.set(telegram_user_id, current)
+    return current
+
+
+def invalidate_user(user_id: uuid.UUID) -> None:
+    # The user's updates may be served by another shard worker.
+    invalidation_bus.invalidate("user", user_id)
+
+
+async def _upsert_user(
+    session: AsyncSession,
+    telegram_user_id: int,
+    telegram_username: str | None,
+    first_name: str | None,
+    last_name: str | None,
+) -> User | None:
+    users = User.__table__
+    insert_stmt = pg_insert(users).values(
+        id=uuid.uuid4(),
+        telegram_user_id=telegram_user_id,
+        telegram_username=telegram_username,
+        first_name=first_name,
+        last_name=last_name,
+    )
+    upsert = (
+        insert_stmt.on_conflict_do_update(
+            index_elements=[users.c.telegram_user_id],
+            set_={field: insert_stmt.excluded[field] for field in _PROFILE_FIELDS},
+            where=or_(
+                *(users.c[field].is_distinct_from(insert_stmt.excluded[field]) for field in _PROFILE_FIELDS)
+            ),
         )
-        session.add(user)
-        try:
-            await session.commit()
-        except IntegrityError:
-            await session.rollback()
-            result = await session.execute(
-                select(User).where(User.telegram_user_id == telegram_user_id)
-            )
-            return result.scalar_one()
-        return user
-
-    changed = False
-    if user.telegram_username != telegram_username:
-        user.telegram_username = telegram_username
-        changed = True
-    if user.first_name != first_name:
-        user.first_name = first_name
-        changed = True
-    if user.last_name != last_name:
-        user.last_name = last_name
-        changed = True
-
-    if changed:
-        await session.commit()
-
-    return user
+        .returning(*users.c)
+        .cte("upsert")
+    )
+    unchanged = select(*users.c).where(
+        users.c.telegram_user_id == telegram_user_id,
+        ~exists(select(upsert.c.id)),
+    )
+    result = await session.execute(
+        select(User)
+        .from_statement(union_all(select(*upsert.c), unchanged))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+invalidation_bus.subscribe("user", _identity_cache.pop_user)
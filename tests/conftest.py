@@ -0,0 +1,11 @@
+import os
+
+# Settings are read at import time; the tests never reach Telegram or the DB.
+for name, value in {
+    "BOT_TOKEN": "42:TEST",
+    "DB_HOST": "localhost",
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,116 @@
+from decimal import Decimal
+
+import pytest
+from hypothesis import example, given
+from hypothesis import strategies as st
+
+from services.amount_parser import (
+    AMOUNT_LIMIT,
+    AMOUNT_QUANTUM,
+    CURRENCY_ALIASES,
+    KNOWN_CURRENCIES,
+    AmountParseError,
+    ParsedAmount,
+    parse_amount,
+)
+
+amounts = st.decimals(
+    min_value=AMOUNT_QUANTUM,
+    max_value=AMOUNT_LIMIT - AMOUNT_QUANTUM,
+    places=2,
+    allow_nan=False,
+    allow_infinity=False,
+)
+# Thousands separator and decimal point as used in different locales.
+locales = st.sampled_from(
+    [
+        ("", "."),
+        ("", ","),
+        (" ", ","),
+        (" ", ","),
+        (" ", ","),
+        (".", ","),
+        (",", "."),
+        ("'", "."),
+    ]
+)
+
+
+def format_amount(value: Decimal, group: str, point: str) -> str:
+    whole, fraction = f"{value:.2f}".split(".")
+    if group:
+        whole = f"{int(whole):,}".replace(",", group)
+    if fraction == "00":
+        return whole
+    return f"{whole}{point}{fraction.rstrip('0')}"
+
+
+@given(amounts, locales)
+@example(Decimal("1200.50"), (" ", ","))
+@example(Decimal("1200.50"), (".", ","))
+@example(Decimal("1200.50"), (",", "."))
+@example(Decimal("1200"), (".", ","))
+def test_formatted_amount_round_trips(value, locale):
+    text = format_amount(value, *locale)
+    assert parse_amount(text) == ParsedAmount(value)
+
+
+@given(amounts, locales, st.sampled_from(["+", "-", "−"]), st.sampled_from(["", " "]))
+def test_leading_sign_is_returned_separately(value, locale, sign, space):
+    parsed = parse_amount(f"{sign}{space}{format_amount(value, *locale)}")
+    assert parsed.amount == value
+    assert parsed.sign == ("-" if sign == "−" else sign)
+
+
+@given(
+    amounts,
+    locales,
+    st.sampled_from(sorted(CURRENCY_ALIASES) + sorted(KNOWN_CURRENCIES)),
+    st.sampled_from(["", " "]),
+    st.booleans(),
+)
+def test_currency_suffix(value, locale, word, space, upper):
+    word = word.upper() if upper and word.isascii() else word
+    parsed = parse_amount(f"{format_amount(value, *locale)}{space}{word}")
+    assert parsed.amount == value
+    assert parsed.currency == CURRENCY_ALIASES.get(word.lower(), word.upper())
+
+
+@given(amounts, st.sampled_from(["€", "$", "₽", "EUR", "rsd"]))
+def test_currency_prefix(value, word):
+    parsed = parse_amount(f"{word} {value}")
+    assert parsed.amount == value
+    assert parsed.currency == CURRENCY_ALIASES.get(word.lower(), word.upper())
+
+
+@given(amounts, amounts)
+def test_sum_of_terms(left, right):
+    total = left + right
+    if total >= AMOUNT_LIMIT:
+        with pytest.raises(AmountParseError):
+            parse_amount(f"{left}+{right}")
+    else:
+        assert parse_amount(f"{left} + {right}").amount == total
+
+
+@given(st.integers(min_value=1, max_value=999_999), st.sampled_from(["k", "к", "тыс"]))
+def test_thousands_multiplier(value, suffix):
+    assert parse_amount(f"{value}{suffix}").amount == Decimal(value) * 1000
+
+
+@pytest.mark.parametrize("text", ["0", "0,00", "", "abc", "12 5", "1e5", "-", "100 кофе"])
+def test_rejected_input(text):
+    with pytest.raises(AmountParseError):
+        parse_amount(text)
+
+
+@given(st.text(max_size=80))
+@example("9" * 200)
+@example("1" + ",1" * 40)
+def test_any_text_parses_or_raises_parse_error(text):
+    try:
+        parsed = parse_amount(text)
+    except AmountParseError:
+        return
+    assert AMOUNT_QUANTUM <= parsed.amount < AMOUNT_LIMIT
+    assert parsed.amount == parsed.amount.quantize(AMOUNT_QUANTUM)
@@ -0,0 +1,55 @@
+import asyncio
+import uuid
+
+from aiogram.types import CallbackQuery, User
+
+from bot.features.budgets.keyboards import BUDGET_OPEN, BUDGET_PARTICIPANTS_PAGE
+from bot.utils.callback_data import decode_callback
+from bot.utils.callback_dispatch import IndexedRouter
+
+
+def make_callback(data: str) -> CallbackQuery:
+    return CallbackQuery(
+        id="1",
+        from_user=User(id=1, is_bot=False, first_name="Test"),
+        chat_instance="1",
+        data=data,
+    )
+
+
+def test_pack_round_trips():
+    budget_id, after = uuid.uuid4(), uuid.uuid4()
+    data = BUDGET_PARTICIPANTS_PAGE.pack(budget_id, after)
+    assert len(data) <= 64
+    assert BUDGET_PARTICIPANTS_PAGE.unpack(data) == (budget_id, after)
+    assert decode_callback(data) == (BUDGET_PARTICIPANTS_PAGE, (budget_id, after))
+
+
+def test_filter_passes_payload_and_rejects_malformed_data():
+    budget_id = uuid.uuid4()
+    check = BUDGET_OPEN.filter()
+    data = BUDGET_OPEN.pack(budget_id)
+    assert asyncio.run(check(make_callback(data))) == {"payload": (budget_id,)}
+    assert asyncio.run(check(make_callback(data[:-3]))) is False
+    assert asyncio.run(check(make_callback(BUDGET_OPEN.prefix + "!!"))) is False
+
+
+def dispatch(data: str) -> str:
+    router = IndexedRouter()
+
+    @router.callback_query(BUDGET_OPEN.filter())
+    async def opened(callback: CallbackQuery, payload: tuple) -> str:
+        return f"open {payload[0]}"
+
+    @router.callback_query()
+    async def stale(callback: CallbackQuery) -> str:
+        return "stale"
+
+    return asyncio.run(router.propagate_event("callback_query", make_callback(data)))
+
+
+def test_old_and_malformed_payloads_reach_the_fallback():
+    budget_id = uuid.uuid4()
+    assert dispatch(BUDGET_OPEN.pack(budget_id)) == f"open {budget_id}"
+    assert dispatch(f"budget:open:{budget_id}") == "stale"
+    assert dispatch(BUDGET_OPEN.pack(budget_id)[:-2]) == "stale"
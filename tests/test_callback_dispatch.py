@@ -0,0 +1,93 @@
+import asyncio
+import uuid
+
+import pytest
+from aiogram import F, Router
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.types import CallbackQuery, User
+
+from bot.features.budgets.keyboards import BUDGET_OPEN
+from bot.utils.callback_dispatch import IndexedRouter, _callback_data_keys
+
+BUDGET_ID = uuid.uuid4()
+SAMPLES = [
+    "menu:root",
+    "menu:settings",
+    "menu:skip",
+    "pick:1",
+    "pick:2",
+    "page:7",
+    "page:last",
+    "pagex",
+    "zzz",
+    "",
+    BUDGET_OPEN.pack(BUDGET_ID),
+    BUDGET_OPEN.pack(BUDGET_ID)[:-2],
+    None,
+]
+
+
+def make_callback(data: str | None) -> CallbackQuery:
+    return CallbackQuery(
+        id="1",
+        from_user=User(id=1, is_bot=False, first_name="Test"),
+        chat_instance="1",
+        data=data,
+        game_short_name=None if data is not None else "game",
+    )
+
+
+def build(router: Router) -> Router:
+    def handler(name: str):
+        async def handle(callback: CallbackQuery, **kwargs) -> str:
+            payload = kwargs.get("payload")
+            return f"{name} {payload}" if payload else f"{name} via {kwargs['tagged']}"
+
+        return handle
+
+    async def skip(callback: CallbackQuery) -> str:
+        raise SkipHandler
+
+    async def tag(handler, event, data):
+        data["tagged"] = "middleware"
+        return await handler(event, data)
+
+    router.callback_query.middleware(tag)
+    # Unindexed, registered before the exact handler it overlaps with.
+    router.callback_query.register(handler("endswith"), F.data.endswith("settings"))
+    router.callback_query.register(handler("root"), F.data == "menu:root")
+    router.callback_query.register(handler("settings"), F.data == "menu:settings")
+    router.callback_query.register(skip, F.data == "menu:skip")
+    router.callback_query.register(handler("pick"), F.data.in_({"pick:1", "pick:2"}))
+    router.callback_query.register(handler("page-last"), F.data.startswith("page:l"))
+    router.callback_query.register(handler("page"), F.data.startswith("page:"))
+    router.callback_query.register(handler("budget"), BUDGET_OPEN.filter())
+    router.callback_query.register(handler("fallback"))
+    return router
+
+
+def dispatch(router: Router, data: str | None) -> str:
+    return asyncio.run(router.propagate_event("callback_query", make_callback(data)))
+
+
+@pytest.mark.parametrize("data", SAMPLES)
+def test_indexed_dispatch_matches_stock_router(data):
+    assert dispatch(build(IndexedRouter()), data) == dispatch(build(Router()), data)
+
+
+def test_filters_are_actually_indexed():
+    # Guards the magic_filter internals the index reads: if they change, the
+    # handlers silently fall back to unindexed and this fails instead.
+    assert _callback_data_keys(F.data == "a") == ("exact", ("a",))
+    assert _callback_data_keys(F.data.in_(["a", "b"])) == ("exact", ("a", "b"))
+    assert _callback_data_keys(F.data.startswith("p:")) == ("prefix", ("p:",))
+    assert _callback_data_keys(BUDGET_OPEN.filter()) == ("prefix", (BUDGET_OPEN.prefix,))
+    assert _callback_data_keys(F.data.endswith("x")) is None
+    assert _callback_data_keys(F.text == "a") is None
+
+
+def test_candidates_skip_handlers_that_cannot_match():
+    router = build(IndexedRouter())
+    # The unindexed endswith handler and the fallback are always candidates.
+    assert len(router.callback_query.candidates("pick:1")) == 3
+    assert len(router.callback_query.candidates("zzz")) == 2
@@ -0,0 +1,62 @@
+import asyncio
+import uuid
+
+import pytest
+
+from services.category_stats import CategoryStatsBuffer
+
+USER = uuid.uuid4()
+GOOD = uuid.uuid4()
+BAD = uuid.uuid4()
+
+
+class FlakyBuffer(CategoryStatsBuffer):
+    """Fails every write that contains a poison key."""
+
+    def __init__(self, poison: set[uuid.UUID], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.poison = poison
+        self.written: list[tuple[uuid.UUID, uuid.UUID]] = []
+
+    async def _write(self, batch) -> None:
+        if any(category_id in self.poison for _, category_id in batch):
+            raise RuntimeError("write failed")
+        self.written.extend(batch)
+
+
+def test_failed_flush_keeps_tallies_for_retry():
+    stats = FlakyBuffer({BAD}, max_flush_failures=3)
+    stats.record(USER, BAD)
+    with pytest.raises(RuntimeError):
+        asyncio.run(stats.flush())
+    stats.record(USER, BAD)
+    assert stats.pending == 1
+    assert stats._pending[(USER, BAD)][0] == 2
+
+
+def test_key_that_keeps_failing_is_dropped_and_the_rest_written():
+    stats = FlakyBuffer({BAD}, max_flush_failures=3)
+    stats.record(USER, GOOD)
+    stats.record(USER, BAD)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(stats.flush())
+
+    assert asyncio.run(stats.flush()) == 1
+    assert stats.written == [(USER, GOOD)]
+    assert stats.pending == 0
+
+
+def test_success_resets_failure_count():
+    stats = FlakyBuffer({BAD}, max_flush_failures=2)
+    stats.record(USER, BAD)
+    with pytest.raises(RuntimeError):
+        asyncio.run(stats.flush())
+    stats.poison.clear()
+    assert asyncio.run(stats.flush()) == 1
+
+    stats.poison.add(BAD)
+    stats.record(USER, BAD)
+    with pytest.raises(RuntimeError):
+        asyncio.run(stats.flush())
+    assert stats.pending == 1
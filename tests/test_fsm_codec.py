@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from bot.storage.codec import COMPRESS_THRESHOLD, decode_data, encode_data
+
+
+def data_of_size(size: int, char: str = "x") -> dict:
+    # {"k":""} is 8 bytes; the filler char is 1 or 2 bytes in UTF-8.
+    width = len(char.encode("utf-8"))
+    data = {"k": char * ((size - 8) // width)}
+    assert len(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")) == size
+    return data
+
+
+@pytest.mark.parametrize(
+    ("size", "marker"),
+    [
+        (COMPRESS_THRESHOLD - 1, b"j"),
+        (COMPRESS_THRESHOLD, b"z"),
+        (COMPRESS_THRESHOLD + 1, b"z"),
+    ],
+)
+def test_round_trip_around_compression_threshold(size, marker):
+    data = data_of_size(size)
+    payload = encode_data(data)
+    assert payload[:1] == marker
+    assert decode_data(payload) == data
+
+
+def test_threshold_counts_utf8_bytes():
+    data = data_of_size(COMPRESS_THRESHOLD, char="ж")
+    assert len(json.dumps(data, ensure_ascii=False)) < COMPRESS_THRESHOLD
+    payload = encode_data(data)
+    assert payload[:1] == b"z"
+    assert decode_data(payload) == data
+
+
+def test_empty_data_is_stored_as_null():
+    assert encode_data({}) is None
+    assert decode_data(None) == {}
+
+
+def test_unknown_marker_is_rejected():
+    with pytest.raises(ValueError):
+        decode_data(b"x{}")
@@ -0,0 +1,22 @@
+import asyncio
+
+from aiogram.fsm.storage.base import StorageKey
+
+from bot.storage.sqlite import SqliteStorage
+
+
+def test_expired_states_are_purged_in_the_background(tmp_path):
+    async def run() -> tuple[int, int]:
+        storage = SqliteStorage(tmp_path / "fsm.sqlite3", ttl_seconds=-1)
+        await storage.set_data(StorageKey(bot_id=1, chat_id=1, user_id=1), {"step": 1})
+        await storage.set_state(StorageKey(bot_id=1, chat_id=2, user_id=2), "form:name")
+        # Writes no longer purge inline.
+        before = storage._connection.execute("SELECT count(*) FROM fsm_states").fetchone()[0]
+        await storage.start_purging()
+        await asyncio.sleep(0.05)
+        await storage.stop_purging()
+        after = storage._connection.execute("SELECT count(*) FROM fsm_states").fetchone()[0]
+        await storage.close()
+        return before, after
+
+    assert asyncio.run(run()) == (2, 0)
@@ -0,0 +1,52 @@
+import pytest
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import EditMessageText, SendMessage
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.features.main_menu.keyboards import (
+    build_back_keyboard,
+    build_currency_keyboard,
+    build_main_menu_keyboard,
+)
+from bot.session import PreserializedMarkupSession
+from bot.utils.keyboards import KeyboardRegistry, keyboard_registry
+
+
+def form_fields(session: AiohttpSession, method) -> list[tuple[str, str]]:
+    bot = Bot(token="42:TEST", session=session)
+    form = session.build_form_data(bot, method)
+    return [(options["name"], value) for options, _, value in form._fields]
+
+
+@pytest.mark.parametrize(
+    "markup",
+    [
+        build_main_menu_keyboard(),
+        build_back_keyboard("main:root"),
+        build_currency_keyboard(["RSD", "EUR"], "expense:currency", "main:root"),
+    ],
+)
+def test_registry_keyboard_is_sent_byte_for_byte_like_aiogram(markup):
+    for method in (
+        SendMessage(chat_id=1, text="Привет", reply_markup=markup),
+        EditMessageText(chat_id=1, message_id=2, text="Привет", reply_markup=markup),
+    ):
+        expected = form_fields(AiohttpSession(), method)
+        assert form_fields(PreserializedMarkupSession(), method) == expected
+        # Second send is served from the cached JSON.
+        assert form_fields(PreserializedMarkupSession(), method) == expected
+    assert keyboard_registry.serialized(markup, lambda _: "unused") is not None
+
+
+def test_equal_markup_that_is_not_registered_is_not_served_from_cache():
+    registry = KeyboardRegistry()
+    build = registry.static(
+        lambda: InlineKeyboardMarkup(
+            inline_keyboard=[[InlineKeyboardButton(text="Назад", callback_data="back")]]
+        )
+    )
+    copy = build().model_copy(deep=True)
+    assert copy == build()
+    assert registry.serialized(build(), lambda _: "json") == "json"
+    assert registry.serialized(copy, lambda _: "other") is None
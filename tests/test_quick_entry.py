@@ -0,0 +1,61 @@
+import asyncio
+import uuid
+
+import pytest
+
+from services import quick_entry_service
+from services.amount_parser import AmountParseError
+from services.dto.budget import ActiveBudgetContextDTO
+from services.quick_entry_service import parse_quick_entry
+
+CONTEXT = ActiveBudgetContextDTO(
+    budget_id=uuid.uuid4(),
+    name="Дом",
+    base_currency="RSD",
+    aux_currency_1="EUR",
+    aux_currency_2=None,
+    timezone="Europe/Belgrade",
+    role="owner",
+)
+DEFAULTS = {"expense": ["Еда", "Транспорт"], "income": ["Зарплата"]}
+
+
+@pytest.fixture(autouse=True)
+def category_names(monkeypatch):
+    async def list_category_names(session, budget_id, kind):
+        return ["Gym"] if kind == "expense" else []
+
+    monkeypatch.setattr(quick_entry_service, "list_category_names", list_category_names)
+
+
+def parse(text):
+    return asyncio.run(parse_quick_entry(None, CONTEXT, text, DEFAULTS))
+
+
+@pytest.mark.parametrize("text", ["350 bus", "350 tip", "350 tax", "350 car wash"])
+def test_three_letter_words_stay_comments(text):
+    entry = parse(text)
+    assert entry.currency == "RSD"
+    assert entry.category_name is None
+    assert entry.comment == text.split(" ", 1)[1]
+
+
+def test_category_wins_over_words():
+    entry = parse("350 gym утро")
+    assert (entry.category_name, entry.comment) == ("Gym", "утро")
+
+
+@pytest.mark.parametrize("text", ["100 gbp", "100 GBP кофе", "100gbp", "100$", "100 долл"])
+def test_currency_outside_budget_is_rejected(text):
+    with pytest.raises(AmountParseError, match="не подключена"):
+        parse(text)
+
+
+def test_budget_currency_is_taken():
+    entry = parse("+50000 eur зарплата премия")
+    assert (entry.type, entry.currency, entry.category_name, entry.comment) == (
+        "income",
+        "EUR",
+        "Зарплата",
+        "премия",
+    )
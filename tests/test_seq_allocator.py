@@ -0,0 +1,93 @@
+import asyncio
+import uuid
+
+import pytest
+
+from services import seq_allocator
+from services.seq_allocator import SeqBlockAllocator
+
+BUDGET = uuid.uuid4()
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+class FakeCounters:
+    """Stands in for budget_counters and counts the reservations taken."""
+
+    def __init__(self) -> None:
+        self.next_seq_no: dict[uuid.UUID, int] = {}
+        self.calls = 0
+
+    async def reserve_seq_range(self, session, budget_id: uuid.UUID, count: int) -> range | None:
+        self.calls += 1
+        # Yield so concurrent takers pile up behind the same reservation.
+        await asyncio.sleep(0.01)
+        if budget_id not in self.next_seq_no:
+            return None
+        start = self.next_seq_no[budget_id]
+        self.next_seq_no[budget_id] = start + count
+        return range(start, start + count)
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    fake = FakeCounters()
+    fake.next_seq_no[BUDGET] = 1
+    monkeypatch.setattr(seq_allocator, "reserve_seq_range", fake.reserve_seq_range)
+    return fake
+
+
+def make_allocator(block_size: int = 4, hot_threshold: int = 0) -> SeqBlockAllocator:
+    return SeqBlockAllocator(block_size, hot_threshold, 10.0, session_factory=FakeSession)
+
+
+def test_block_is_reused_until_empty(counters):
+    allocator = make_allocator(block_size=4)
+
+    async def take(times: int) -> list[int | None]:
+        return [await allocator.take(BUDGET) for _ in range(times)]
+
+    assert asyncio.run(take(6)) == [1, 2, 3, 4, 5, 6]
+    assert counters.calls == 2
+
+
+def test_concurrent_takers_share_one_reservation(counters):
+    allocator = make_allocator(block_size=10)
+
+    async def take_all() -> list[int | None]:
+        return await asyncio.gather(*(allocator.take(BUDGET) for _ in range(10)))
+
+    taken = asyncio.run(take_all())
+    assert sorted(taken) == list(range(1, 11))
+    assert counters.calls == 1
+    assert not allocator._reserving
+
+
+def test_cold_budget_gets_none_until_hot(counters):
+    allocator = make_allocator(block_size=4, hot_threshold=3)
+
+    async def take(times: int) -> list[int | None]:
+        return [await allocator.take(BUDGET) for _ in range(times)]
+
+    assert asyncio.run(take(4)) == [None, None, 1, 2]
+    assert counters.calls == 1
+
+
+def test_missing_counter_row_falls_back(counters):
+    allocator = make_allocator()
+    assert asyncio.run(allocator.take(uuid.uuid4())) is None
+
+
+def test_disabled_allocator_never_reserves(counters):
+    allocator = make_allocator(block_size=1)
+    assert asyncio.run(allocator.take(BUDGET)) is None
+    assert counters.calls == 0
@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+
+import pydantic
+import pytest
+
+from services import user_service
+from services.dto.user import CurrentUserDTO
+
+
+def make_user(**changes) -> CurrentUserDTO:
+    values = {
+        "id": uuid.uuid4(),
+        "telegram_user_id": 42,
+        "telegram_username": "anna",
+        "first_name": "Анна",
+        "last_name": None,
+        "active_budget_id": uuid.uuid4(),
+    }
+    values.update(changes)
+    return CurrentUserDTO(**values)
+
+
+@pytest.fixture(autouse=True)
+def identity_cache(monkeypatch):
+    cache = user_service._IdentityCache(10, 60)
+    monkeypatch.setattr(user_service, "_identity_cache", cache)
+    return cache
+
+
+def test_cache_hit_returns_read_only_snapshot(identity_cache):
+    cached = make_user()
+    identity_cache.set(cached.telegram_user_id, cached)
+
+    user = asyncio.run(user_service.ensure_user(None, 42, "anna", "Анна", None))
+
+    assert user is cached
+    with pytest.raises(pydantic.ValidationError):
+        user.active_budget_id = None
+
+
+def test_changed_profile_skips_cache(identity_cache, monkeypatch):
+    identity_cache.set(42, make_user())
+
+    async def upsert(*args):
+        raise LookupError("upsert")
+
+    monkeypatch.setattr(user_service, "_upsert_user", upsert)
+    with pytest.raises(LookupError):
+        asyncio.run(user_service.ensure_user(None, 42, "anna_new", "Анна", None))
+
+
+def test_invalidation_drops_cached_user(identity_cache):
+    cached = make_user()
+    identity_cache.set(42, cached)
+    identity_cache.pop_user(cached.id)
+    assert identity_cache.get(42) is None